@@ -0,0 +1,207 @@
+"""JSON API for the Flask viewer.
+
+Every payload is serialized and gzip-compressed once per (endpoint, query) and
+source modification time, then served from memory with ETag and Last-Modified
+so browsers can revalidate with a conditional GET.
+"""
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+from flask import Blueprint, Response, abort, current_app, request
+
+from keyword_index import KeywordIndex
+from thumbnails import tile_url
+
+api = Blueprint("api", __name__, url_prefix="/api")
+
+MAX_PAYLOADS = 512
+_payloads = OrderedDict()
+_payloads_lock = threading.Lock()  # Flask bedient Requests in mehreren Threads
+
+
+def _encode(data, last_modified):
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return {
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=6),
+        "etag": hashlib.sha1(body).hexdigest(),
+        "last_modified": last_modified,
+    }
+
+
+def cached_payload(key, last_modified, build):
+    """payload entry for key, rebuilt only when last_modified changed"""
+    with _payloads_lock:
+        entry = _payloads.get(key)
+        if entry is not None and entry["last_modified"] == last_modified:
+            _payloads.move_to_end(key)
+            return entry
+    # außerhalb des Locks bauen, ein langsamer Payload hält die anderen Requests nicht auf
+    entry = _encode(build(), last_modified)
+    with _payloads_lock:
+        _payloads[key] = entry
+        _payloads.move_to_end(key)
+        while len(_payloads) > MAX_PAYLOADS:
+            _payloads.popitem(last=False)
+    return entry
+
+
+def payload_response(entry):
+    """200 with the (gzipped) body or 304 if the client copy is still current"""
+    last_modified = datetime.fromtimestamp(int(entry["last_modified"]), tz=timezone.utc)
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(entry["etag"])
+    else:
+        since = request.if_modified_since
+        not_modified = since is not None and since >= last_modified
+
+    if not_modified:
+        response = Response(status=304)
+    elif "gzip" in request.accept_encodings:
+        response = Response(entry["gzip"], mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(entry["body"], mimetype="application/json")
+    response.set_etag(entry["etag"])
+    response.last_modified = last_modified
+    response.headers["Cache-Control"] = "no-cache"  # immer revalidieren, 304 ist billig
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def query_key():
+    return (request.endpoint, tuple(sorted((request.view_args or {}).items())),
+            tuple(sorted(request.args.items(multi=True))))
+
+
+class ProjectStore:
+    """projects json (all_results shape) plus a keyword index, reloaded when the file changes"""
+
+    def __init__(self, filename, tiles):
+        self.filename = Path(filename)
+        self.tiles = tiles
+        self.mtime = None
+        self.projects = []
+        self.index = None
+        self.project_rows = []
+
+    def refresh(self):
+        mtime = self.filename.stat().st_mtime if self.filename.exists() else 0
+        if mtime != self.mtime:
+            projects = []
+            if self.filename.exists():
+                with open(self.filename, "r", encoding="utf-8") as f:
+                    projects = json.load(f)
+            keyword_categories = {name: tile["category"] for name, tile in self.tiles.items()}
+            index = KeywordIndex(keyword_categories, capacity=max(64, len(projects)))
+            self.project_rows = [index.add_project(p) for p in projects]
+            self.projects, self.index, self.mtime = projects, index, mtime
+        return self
+
+    def find(self, ref):
+        """project index for a number or a project name"""
+        if ref.isdigit() and int(ref) < len(self.projects):
+            return int(ref)
+        for i, project in enumerate(self.projects):
+            if project.get("project") == ref:
+                return i
+        return None
+
+    def highlight(self, i, deliverable=None):
+        entry = self.projects[i]
+        if deliverable is not None:
+            entry = entry.get("deliverables", [])[deliverable]
+        keywords = entry.get("keywords", [])
+        return {
+            "project": self.projects[i].get("project"),
+            "deliverable": entry.get("name") if deliverable is not None else None,
+            "keywords": [kw for kw in keywords if kw in self.tiles],
+            "other_keywords": [kw for kw in keywords if kw not in self.tiles],
+        }
+
+
+def store():
+    return current_app.extensions["project_store"].refresh()
+
+
+def assets_mtime():
+    return current_app.config.get("ASSETS_MTIME", 0)
+
+
+def filtered_tiles(tiles, args, projects):
+    categories = set(args.getlist("category"))
+    keywords = set(args.getlist("keyword"))
+    for ref in args.getlist("project"):
+        i = projects.find(ref)
+        if i is None:
+            abort(404, f"unknown project {ref}")
+        keywords.update(projects.highlight(i)["keywords"])
+    return [dict(name=name, thumbnail=tile_url(tile), **tile) for name, tile in tiles.items()
+            if (not categories or tile["category"] in categories) and (not keywords or name in keywords)]
+
+
+@api.route("/assets")
+def assets():
+    """asset catalog, filter with ?category=, ?keyword= and ?project= (repeatable)"""
+    tiles = current_app.config["TILES"]
+    projects = store()
+    entry = cached_payload(query_key(), max(assets_mtime(), projects.mtime),
+                           lambda: {"tiles": filtered_tiles(tiles, request.args, projects),
+                                    "colors": current_app.config["CATEGORY_COLORS"]})
+    return payload_response(entry)
+
+
+@api.route("/projects")
+def projects_list():
+    """project list, filter with ?keyword= (all must be present) and ?category= (any keyword of it)"""
+    projects = store()
+
+    def build():
+        index = projects.index
+        rows = set(projects.project_rows)
+        keywords = request.args.getlist("keyword")
+        if keywords:
+            rows &= set(index.rows_covering_all(keywords).tolist())
+        categories = request.args.getlist("category")
+        if categories:
+            in_category = [name for name, tile in projects.tiles.items() if tile["category"] in categories]
+            rows &= set(index.rows_covering_any(in_category).tolist())
+        return {"projects": [{"id": i, "project": p.get("project"),
+                              "n_keywords": len(p.get("keywords", [])),
+                              "n_deliverables": len(p.get("deliverables", []))}
+                             for i, (p, row) in enumerate(zip(projects.projects, projects.project_rows)) if row in rows]}
+
+    return payload_response(cached_payload(query_key(), max(assets_mtime(), projects.mtime), build))
+
+
+@api.route("/projects/<ref>")
+def project_highlight(ref):
+    """highlight set of a project (id or name), or of one of its deliverables with ?deliverable=n"""
+    projects = store()
+    i = projects.find(ref)
+    if i is None:
+        abort(404, f"unknown project {ref}")
+    deliverable = request.args.get("deliverable", type=int)
+    if deliverable is not None and not 0 <= deliverable < len(projects.projects[i].get("deliverables", [])):
+        abort(404, f"project {ref} has no deliverable {deliverable}")
+
+    def build():
+        data = projects.highlight(i, deliverable)
+        data["deliverables"] = [d.get("name") for d in projects.projects[i].get("deliverables", [])]
+        return data
+
+    return payload_response(cached_payload(query_key(), max(assets_mtime(), projects.mtime), build))
+
+
+def init_app(app, tiles, category_colors, projects_file):
+    """registers the api; tiles is {name: {"path": ..., "category": ...}}"""
+    app.config["TILES"] = tiles
+    app.config["CATEGORY_COLORS"] = category_colors
+    app.config.setdefault("ASSETS_MTIME", max((Path(t["path"]).stat().st_mtime for t in tiles.values()), default=0))
+    app.extensions["project_store"] = ProjectStore(projects_file, tiles)
+    app.register_blueprint(api)
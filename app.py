@@ -1,17 +1,44 @@
+import os
+
 from flask import Flask, render_template, request
 
-from pg_vis import keyword_names, background_colors, colors, get_landscape_assets, flatten
+from palette import BACKGROUND_COLORS
+from catalog import get_catalog
+import api
+import svg_export
+import thumbnails
 
 app = Flask(__name__)
 
+PROJECTS_FILE = "all_results_may_fixedkeywords.json"
+
+# Kacheln aus dem Katalog-Manifest statt bei jedem Start die Ordner zu durchsuchen
+catalog = get_catalog("assets/img")
+tiles = catalog.flat()
+app.config["ASSETS_MTIME"] = catalog.mtime()
+api.init_app(app, tiles, BACKGROUND_COLORS, PROJECTS_FILE)
+thumbnails.init_app(app, "assets/img")
+# statische Landschaftsseiten: flask --app app export-landscape, dann /static/landscape/index.html
+svg_export.init_app(app, PROJECTS_FILE)
+
+
+def assets_changed(catalog, changed, removed):
+    # neue mtime macht die gecachten /api/assets Antworten ungültig
+    tiles = catalog.flat()
+    app.config["TILES"] = tiles
+    app.config["ASSETS_MTIME"] = catalog.mtime()
+    app.extensions["project_store"].tiles = tiles
+    app.extensions["project_store"].mtime = None
+    print(f"Assets changed: {len(changed)} new or modified, {len(removed)} removed")
 
 
-# Sample tile data
-tiles = flatten(get_landscape_assets())
+if os.environ.get("PED_WATCH_ASSETS"):
+    catalog.watch(assets_changed)
 
 @app.route("/")
 def index():
-    return render_template("index.html", tiles=tiles, keywords=keyword_names, colors=background_colors)
+    # Kacheln, Projekte und Filter holt script.js über /api
+    return render_template("index.html")
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,182 @@
+"""Packs the keyword tiles under assets/img into pre-scaled atlas sheets.
+
+Build step (re-run whenever tiles change):
+
+    python atlas.py [--levels 128 64 32] [--sheet-size 1024]
+
+writes assets/atlas/atlas_<level>_<n>.png plus atlas.json, a manifest with the
+pixel rect and UV rectangle of every tile on every level of the pyramid.
+Landscape loads a sheet on first use and hands out subsurfaces instead of
+decoding 61 full-size PNGs.
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from catalog import get_catalog
+
+ATLAS_DIR = Path("assets") / "atlas"
+ATLAS_MANIFEST = ATLAS_DIR / "atlas.json"
+ATLAS_VERSION = 2
+# bei zoom 1 ist eine Kachel ca. 105 px breit, etwas Reserve für Zoom > 1
+TILE_WIDTH = 128
+LEVELS = (TILE_WIDTH, 64, 32)
+SHEET_SIZE = 1024
+PADDING = 2
+
+
+def tile_key(category, name):
+    # Namen sind nicht eindeutig (Infrastructure gibt es in Spatial und Technological)
+    return f"{category}/{name}"
+
+
+def scaled_size(size, width):
+    w, h = size
+    return width, max(1, round(h * width / w))
+
+
+def pack_shelves(sizes, sheet_size, padding=PADDING):
+    """simple shelf packing; returns (sheet, x, y) per size"""
+    placements = []
+    sheet, x, y, shelf_height = 0, 0, 0, 0
+    for w, h in sizes:
+        if w + padding > sheet_size or h + padding > sheet_size:
+            raise ValueError(f"tile of {w}x{h} px does not fit on a {sheet_size} px sheet")
+        if x + w + padding > sheet_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + h + padding > sheet_size:
+            sheet, x, y, shelf_height = sheet + 1, 0, 0, 0
+        placements.append((sheet, x, y))
+        x += w + padding
+        shelf_height = max(shelf_height, h + padding)
+    return placements
+
+
+def downscale_pyramid(image, levels=LEVELS):
+    """one smoothscaled copy of image per level width, each scaled from the previous one"""
+    pyramid = []
+    for width in levels:
+        image = pygame.transform.smoothscale(image, scaled_size(image.get_size(), width))
+        pyramid.append(image)
+    return pyramid
+
+
+def build_atlas(categorized_assets, out_dir=ATLAS_DIR, levels=LEVELS, sheet_size=SHEET_SIZE):
+    """packs all tiles of categorized_assets ({category: {name: path}}) and writes sheets + manifest
+
+    levels are the tile widths of the pyramid, largest first
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    for category, tiles in categorized_assets.items():
+        for name, path in tiles.items():
+            image = pygame.image.load(path)
+            entries.append((category, name, path, image.get_size(), downscale_pyramid(image, levels)))
+
+    # hohe Kacheln zuerst, dann füllen sich die Regale gleichmäßiger
+    entries.sort(key=lambda e: -e[4][0].get_height())
+
+    manifest = {"version": ATLAS_VERSION, "sheet_size": sheet_size, "levels": [], "tiles": {}}
+    for category, name, path, source_size, _ in entries:
+        manifest["tiles"][tile_key(category, name)] = {
+            "name": name,
+            "category": category,
+            "source": Path(path).as_posix(),
+            "source_size": list(source_size),
+            "source_mtime": Path(path).stat().st_mtime,
+            "levels": [],
+        }
+
+    for level, width in enumerate(levels):
+        placements = pack_shelves([e[4][level].get_size() for e in entries], sheet_size)
+        n_sheets = max((p[0] for p in placements), default=-1) + 1
+        sheets = [pygame.Surface((sheet_size, sheet_size), pygame.SRCALPHA) for _ in range(n_sheets)]
+        filenames = [f"atlas_{width}_{i}.png" for i in range(n_sheets)]
+        for (category, name, _, _, pyramid), (sheet, x, y) in zip(entries, placements):
+            sheets[sheet].blit(pyramid[level], (x, y))
+            w, h = pyramid[level].get_size()
+            manifest["tiles"][tile_key(category, name)]["levels"].append({
+                "sheet": sheet,
+                "rect": [x, y, w, h],
+                "uv": [x / sheet_size, y / sheet_size, (x + w) / sheet_size, (y + h) / sheet_size],
+            })
+        for surface, filename in zip(sheets, filenames):
+            pygame.image.save(surface, str(out_dir / filename))
+        manifest["levels"].append({"tile_width": width, "sheets": filenames})
+
+    with open(out_dir / ATLAS_MANIFEST.name, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+class Atlas:
+    def __init__(self, manifest_path=ATLAS_MANIFEST):
+        self.manifest_path = Path(manifest_path)
+        with open(self.manifest_path, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.tiles = self.manifest["tiles"]
+        self.levels = [level["tile_width"] for level in self.manifest["levels"]]
+        self.sheets = {}  # (level, sheet) -> Surface, erst beim ersten Zugriff geladen
+
+    def is_current(self, categorized_assets):
+        """True if the atlas holds exactly the tiles of categorized_assets and none of the sources changed"""
+        keys = {tile_key(category, name) for category, tiles in categorized_assets.items() for name in tiles}
+        if self.manifest.get("version") != ATLAS_VERSION or keys != set(self.tiles):
+            return False
+        for entry in self.tiles.values():
+            source = Path(entry["source"])
+            if not source.exists() or source.stat().st_mtime != entry["source_mtime"]:
+                return False
+        return True
+
+    def sheet(self, level, index):
+        key = (level, index)
+        if key not in self.sheets:
+            filename = self.manifest["levels"][level]["sheets"][index]
+            self.sheets[key] = pygame.image.load(str(self.manifest_path.parent / filename))
+        return self.sheets[key]
+
+    def surface(self, category, name, level=0):
+        """subsurface of the tile on its sheet, shares pixels with the sheet"""
+        entry = self.tiles[tile_key(category, name)]["levels"][level]
+        return self.sheet(level, entry["sheet"]).subsurface(pygame.Rect(entry["rect"]))
+
+    def uv(self, category, name, level=0):
+        return tuple(self.tiles[tile_key(category, name)]["levels"][level]["uv"])
+
+
+def load_atlas(categorized_assets, manifest_path=ATLAS_MANIFEST):
+    """returns the Atlas if a current one exists, otherwise None"""
+    if not Path(manifest_path).exists():
+        return None
+    atlas = Atlas(manifest_path)
+    return atlas if atlas.is_current(categorized_assets) else None
+
+
+def set_tile_image(tile, surface):
+    """swaps the image of a deengi Tile for an atlas subsurface"""
+    tile.image = surface
+
+
+def _categorized_assets(path):
+    # wie ped_landscape.get_categorized_assets, aber ohne deengi zu importieren
+    return get_catalog(path).categorized()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack the keyword tiles into atlas sheets")
+    parser.add_argument("--images", default=str(Path("assets") / "img"))
+    parser.add_argument("--out", default=str(ATLAS_DIR))
+    parser.add_argument("--levels", type=int, nargs="+", default=list(LEVELS))
+    parser.add_argument("--sheet-size", type=int, default=SHEET_SIZE)
+    args = parser.parse_args()
+
+    manifest = build_atlas(_categorized_assets(args.images), args.out, sorted(args.levels, reverse=True), args.sheet_size)
+    for level in manifest["levels"]:
+        print(f"packed {len(manifest['tiles'])} tiles at {level['tile_width']} px into {len(level['sheets'])} sheet(s) in {args.out}")
@@ -0,0 +1,276 @@
+"""Keyword suggestions from the free-text descriptions of projects and deliverables.
+
+    python autotag.py all_results_may.json --out suggestions.json [--apply all_results_tagged.json]
+
+TermIndex tokenizes every text once (lower case, light suffix stripping,
+unigrams and bigrams) into a documents × terms BM25 weight matrix. Every
+keyword of pg_vis.keyword_names is a query of its own words plus the
+synonyms in SYNONYMS, so scoring all texts against all keywords is a single
+matrix product. Confidence is 1 - exp(-score / SCORE_SCALE). Runs offline, no
+model download; --apply writes a copy of the projects file with every
+suggestion above --threshold added.
+"""
+import argparse
+import json
+import re
+
+import numpy as np
+
+TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or that the their this to was we were will with "
+    "which who how our they them these those such also can not all any other more most new based through".split())
+PHRASE_WEIGHT = 2.0   # Treffer der ganzen Wortgruppe zählen mehr als einzelne Wörter
+SYNONYM_WEIGHT = 0.8
+SCORE_SCALE = 4.0
+THRESHOLD = 0.5
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SYNONYMS = {
+    "Affordability": ["affordable", "energy poverty", "cost of living"],
+    "Business Models": ["business case", "business model", "revenue model", "contracting model"],
+    "Circular Economy": ["circular", "waste management", "reuse", "recycling"],
+    "Cost Analysis": ["cost", "economic evaluation", "cost benefit", "life cycle cost"],
+    "Financial Strategies": ["financing", "funding", "investment", "investor"],
+    "Incentives": ["incentive", "subsidy", "tariff"],
+    "Marketplace": ["market place", "trading platform", "peer to peer"],
+    "Ownership Structures": ["ownership", "owner", "cooperative"],
+    "Support and Information": ["guideline", "guidance", "toolkit", "handbook", "information"],
+    "Circularity": ["circular", "waste", "resources"],
+    "Climate Adaptation": ["climate neutral", "climate neutrality", "climate change", "adaptation"],
+    "Embodied Energy": ["embodied", "grey energy", "life cycle assessment"],
+    "Energy Efficiency": ["efficiency", "efficient", "renovation", "retrofit"],
+    "GHG Emissions": ["greenhouse gas", "emission", "co2", "carbon", "decarbonisation", "decarbonization"],
+    "Landscape": ["green space", "nature based", "urban agriculture"],
+    "PE Balance": ["positive energy balance", "energy balance", "net positive"],
+    "Resilience": ["resilient", "robust", "off grid"],
+    "Resource Efficiency": ["resource", "resources", "material efficiency"],
+    "District Regulation": ["regulatory", "regulation", "legal framework"],
+    "Energy Communities": ["energy community", "community energy", "prosumer"],
+    "Energy Market": ["electricity market", "market", "flexibility market", "trading"],
+    "Innovative Institutional Change": ["institutional", "organisational structure", "organizational"],
+    "Multi-level Legislation": ["legislation", "law", "directive", "eu level"],
+    "Participative Instruments": ["participation", "participatory", "serious game", "workshop"],
+    "Urban Landuse": ["land use", "landuse", "zoning"],
+    "City Missions": ["climate neutral cities", "smart cities", "cities mission", "mission"],
+    "Decision Support Tools": ["decision making", "decision maker", "decision support", "dashboard"],
+    "Distributive Implications": ["distributive", "equity", "fair", "inclusive"],
+    "Governance Structure": ["governance", "stakeholder cooperation"],
+    "Political Engagement": ["political", "policy maker", "municipality", "municipalities"],
+    "Power Analysis": ["power relation", "actor analysis", "stakeholder mapping"],
+    "Regulation and Subsidies": ["subsidies", "subsidy", "regulation", "funding scheme"],
+    "Co-Creation": ["co creation", "co design", "co designed", "co production", "co learning", "living lab"],
+    "Modeling Tools": ["model", "modelling", "modeling", "digital twin", "machine learning"],
+    "Monitoring": ["monitor", "indicator", "kpi", "evaluation", "assess"],
+    "Scalability": ["replication", "replicate", "replicating", "upscaling", "scale up", "replicability"],
+    "Simulation": ["simulate", "simulation", "scenario"],
+    "Behavioural Change": ["behaviour", "behavior", "demand side", "user behaviour", "usage pattern"],
+    "Community Engagement": ["stakeholder", "citizen", "resident", "community", "engagement"],
+    "Cultural Context": ["cultural", "culture", "local context", "context"],
+    "Everyday Practices": ["everyday", "daily life", "practice", "usage"],
+    "Heritage": ["historic", "listed building", "cultural heritage"],
+    "Narrative": ["storytelling", "vision", "communication"],
+    "Policy": ["policy", "policies", "policy suggestion", "action plan"],
+    "Social Innovation": ["societal innovation", "social innovation", "innovation"],
+    "Social Justice": ["just transition", "justice", "inclusion", "fairness"],
+    "Wellbeing": ["well being", "liveable", "liveability", "health", "quality of life"],
+    "District typologies": ["typology", "district type", "characterization", "characterisation"],
+    "Governance Framework": ["governance approach", "governance framework", "framework"],
+    "Infstrastructure": ["infrastructure", "grid", "network"],
+    "Infrastructure": ["infrastructure", "grid", "network"],
+    "Mobility": ["e mobility", "electric vehicle", "transport", "charging"],
+    "PED boundaries": ["boundary", "boundaries", "system boundary", "focus district"],
+    "scalability": ["replication", "upscaling"],
+    "Strategic planning": ["strategy", "strategies", "planning", "roadmap"],
+    "Urban planning tools": ["urban planning", "planning tool", "spatial planning", "geospatial", "map"],
+    "Demand-Supply Balance": ["demand supply", "load balancing", "flexibility", "demand response", "flexible energy"],
+    "Energy Savings": ["energy saving", "savings", "reduce consumption"],
+    "Local Renewable Production": ["renewable", "photovoltaic", "pv", "solar", "wind", "heat pump", "der"],
+    "Multi-Commodity ES": ["multi commodity", "sector coupling", "energy system", "district heating"],
+    "Storage": ["storage", "battery", "batteries", "thermal storage"],
+}
+
+
+def default_keywords():
+    try:
+        from pg_vis import keyword_names
+    except ImportError:
+        # ohne deengi: die Namen der Kacheln, das sind dieselben Keywords
+        from catalog import get_catalog
+        keyword_names = list(dict.fromkeys(entry["name"] for entry in get_catalog("assets/img").entries))
+    return list(dict.fromkeys(keyword_names))
+
+
+def stem(word):
+    """very light English suffix stripping, enough to match plurals and -ing/-ed forms"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            word = word[:-len(suffix)]
+            # modelling -> modell -> model
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "aeiousz":
+                word = word[:-1]
+            return word
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def tokens(text):
+    return [stem(t) for t in TOKEN.findall(str(text).lower()) if t not in STOPWORDS]
+
+
+def terms(text):
+    """unigrams and bigrams of a text"""
+    words = tokens(text)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def query_terms(phrase):
+    """terms of a keyword or synonym: the words, plus the bigrams if it is a phrase"""
+    words = tokens(phrase.replace("-", " "))
+    return words, [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class TermIndex:
+    """BM25 weighted documents × terms matrix, only for the terms in vocabulary"""
+
+    def __init__(self, texts, vocabulary):
+        self.vocabulary = {term: i for i, term in enumerate(vocabulary)}
+        doc_ids, term_ids, lengths = [], [], []
+        for d, text in enumerate(texts):
+            doc_terms = terms(text)
+            lengths.append(max(1, len(doc_terms)))
+            hits = [self.vocabulary[t] for t in doc_terms if t in self.vocabulary]
+            doc_ids += [d] * len(hits)
+            term_ids += hits
+        self.n_docs = len(lengths)
+        lengths = np.asarray(lengths, dtype=float)
+        # (Dokument, Term) Paare zählen, dann BM25 auf allen Einträgen auf einmal
+        pairs = np.asarray(doc_ids, dtype=np.int64) * len(self.vocabulary) + np.asarray(term_ids, dtype=np.int64)
+        pairs, tf = np.unique(pairs, return_counts=True)
+        docs, cols = np.divmod(pairs, max(1, len(self.vocabulary)))
+        df = np.bincount(cols, minlength=len(self.vocabulary))
+        self.idf = np.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[docs] / lengths.mean()) if len(lengths) else 1.0
+        weights = tf * (BM25_K1 + 1) / (tf + norm) * self.idf[cols]
+        self.weights = np.zeros((self.n_docs, len(self.vocabulary)), dtype=np.float32)
+        self.weights[docs, cols] = weights
+
+
+class KeywordTagger:
+    def __init__(self, keywords=None, synonyms=SYNONYMS):
+        self.keywords = list(keywords) if keywords is not None else default_keywords()
+        queries = []
+        for keyword in self.keywords:
+            query = {}
+            for phrase, weight in [(keyword, 1.0)] + [(s, SYNONYM_WEIGHT) for s in synonyms.get(keyword, [])]:
+                words, bigrams = query_terms(phrase)
+                # einzelne Wörter einer Wortgruppe tragen nur anteilig bei
+                for word in words:
+                    query[word] = max(query.get(word, 0), weight / len(words))
+                for bigram in bigrams:
+                    query[bigram] = max(query.get(bigram, 0), weight * PHRASE_WEIGHT)
+            queries.append(query)
+        self.vocabulary = sorted({term for query in queries for term in query})
+        column = {term: i for i, term in enumerate(self.vocabulary)}
+        self.queries = np.zeros((len(self.vocabulary), len(self.keywords)), dtype=np.float32)
+        for k, query in enumerate(queries):
+            for term, weight in query.items():
+                self.queries[column[term], k] = weight
+
+    def index(self, texts):
+        return TermIndex(texts, self.vocabulary)
+
+    def confidence(self, texts):
+        """(texts × keywords) confidence 0..1"""
+        scores = self.index(texts).weights @ self.queries
+        return 1 - np.exp(-scores / SCORE_SCALE)
+
+    def matched_terms(self, text, keyword):
+        found = set(terms(text))
+        k = self.keywords.index(keyword)
+        return [term for term, weight in zip(self.vocabulary, self.queries[:, k]) if weight and term in found]
+
+    def suggest(self, texts, threshold=THRESHOLD, exclude=None, top=None):
+        """per text: [(keyword, confidence), ...] above threshold, best first; exclude[i] are already set keywords"""
+        conf = self.confidence(texts)
+        suggestions = []
+        for i, row in enumerate(conf):
+            order = np.argsort(-row, kind="stable")
+            # "Scalability" und "scalability" sind zwei Kacheln, aber dasselbe Keyword
+            skip = {kw.casefold() for kw in exclude[i]} if exclude is not None else set()
+            picked = [(self.keywords[k], float(row[k])) for k in order
+                      if row[k] >= threshold and self.keywords[k].casefold() not in skip]
+            suggestions.append(picked[:top] if top else picked)
+        return suggestions
+
+
+def text_of(entry):
+    """name and description of an all_results project or deliverable"""
+    parts = [entry.get("name"), entry.get("description")]
+    return " ".join(p for p in parts if isinstance(p, str) and p.strip() and p != "null")
+
+
+def documents(projects, deliverables=True):
+    """[(project index, deliverable index or None, text)] of an all_results list"""
+    docs = []
+    for p, project in enumerate(projects):
+        docs.append((p, None, text_of(project)))
+        if deliverables:
+            docs += [(p, d, text_of(deliverable)) for d, deliverable in enumerate(project.get("deliverables", []))]
+    return docs
+
+
+def tag_projects(projects, tagger=None, threshold=THRESHOLD, deliverables=True):
+    """suggestions for every project (and deliverable) that has a text, without the keywords it already has"""
+    tagger = tagger or KeywordTagger()
+    docs = [doc for doc in documents(projects, deliverables) if doc[2]]
+    entries = [projects[p] if d is None else projects[p]["deliverables"][d] for p, d, _ in docs]
+    found = tagger.suggest([text for _, _, text in docs], threshold, exclude=[e.get("keywords", []) for e in entries])
+    # Indizes zum Anwenden, Namen nur zum Lesen: Namen können doppelt vorkommen oder fehlen
+    return [{"project": projects[p].get("project"), "deliverable": None if d is None else entry.get("name"),
+             "project_index": p, "deliverable_index": d,
+             "suggestions": [{"keyword": kw, "confidence": round(c, 3), "matched": tagger.matched_terms(text, kw)}
+                             for kw, c in suggestions]}
+            for (p, d, text), entry, suggestions in zip(docs, entries, found) if suggestions]
+
+
+def apply_suggestions(projects, tagged):
+    """copy of projects with the suggested keywords added, by the project and deliverable index of every item"""
+    projects = json.loads(json.dumps(projects))
+    for item in tagged:
+        entry = projects[item["project_index"]]
+        if item["deliverable_index"] is not None:
+            entry = entry["deliverables"][item["deliverable_index"]]
+        entry.setdefault("keywords", []).extend(s["keyword"] for s in item["suggestions"])
+    return projects
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suggest keywords from project and deliverable descriptions")
+    parser.add_argument("projects", help="all_results json")
+    parser.add_argument("--out", default="suggestions.json")
+    parser.add_argument("--apply", help="also write the projects with the suggestions added to this file")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--synonyms", help="json {keyword: [synonym, ...]} replacing the built-in synonyms")
+    parser.add_argument("--no-deliverables", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.projects, "r", encoding="utf-8") as f:
+        projects = json.load(f)
+    synonyms = SYNONYMS
+    if args.synonyms:
+        with open(args.synonyms, "r", encoding="utf-8") as f:
+            synonyms = json.load(f)
+    tagged = tag_projects(projects, KeywordTagger(synonyms=synonyms), args.threshold, not args.no_deliverables)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(tagged, f, indent=4)
+    n = sum(len(item["suggestions"]) for item in tagged)
+    print(f"{n} suggestions for {len(tagged)} entries written to {args.out}")
+    if args.apply:
+        with open(args.apply, "w", encoding="utf-8") as f:
+            json.dump(apply_suggestions(projects, tagged), f, indent=4)
+        print(f"tagged projects written to {args.apply}")
@@ -0,0 +1,152 @@
+"""Headless batch rendering of every project and deliverable.
+
+    python batch_render.py all_results_may_fixedkeywords.json --out Screenshots/batch --workers 4
+
+Renders one PNG per project and per deliverable in each layout through the SDL
+dummy video driver, so it runs on a machine without a display. Jobs are split
+into chunks, each worker process builds one Landscape and renders its chunk
+inside a single engine run.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import pygame
+
+from model import title_of
+from screenshots import safe_filename
+
+LAYOUTS = ("pestel", "line")
+
+
+def headless():
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def create_jobs(projects, layouts=LAYOUTS, deliverables=True):
+    """one job per (layout, project) and (layout, project, deliverable)"""
+    jobs = []
+    for layout in layouts:
+        for p, project in enumerate(projects):
+            # Projekte ohne Titel (NaN in der Excel-Tabelle) nicht als <layout>_nan.png
+            name = safe_filename(title_of(project.get("project"), f"Unbekanntes Projekt {p + 1}"))
+            jobs.append({"layout": layout, "project": p, "deliverable": None,
+                         "filename": f"{layout}_{name}.png"})
+            if not deliverables:
+                continue
+            for d, _ in enumerate(project.get("deliverables", [])):
+                jobs.append({"layout": layout, "project": p, "deliverable": d,
+                             "filename": f"{layout}_{name}_D{d+1:02d}.png"})
+    return jobs
+
+
+class FrameSequence:
+    """per frame engine callback that applies one job per frame and saves it on the next frame"""
+
+    def __init__(self, landscape, steps, on_done=None):
+        self.landscape = landscape
+        self.steps = iter(steps)   # (apply callable, finish callable(surface))
+        self.pending = None
+        self.on_done = on_done or landscape.engine.quit
+        self.finished = False
+
+    def __call__(self, *args):
+        if self.finished:
+            return
+        if self.pending is not None:
+            self.pending(pygame.display.get_surface())
+            self.pending = None
+        step = next(self.steps, None)
+        if step is None:
+            self.finished = True
+            self.on_done()
+            return
+        apply, self.pending = step
+        apply()
+        # Bilder sofort laden, sonst fehlen sie im Frame, der gespeichert wird
+        if self.landscape.lazy_tiles:
+            self.landscape.update_tile_levels()
+
+
+def run_sequence(landscape, steps):
+    """runs the engine until every step has been applied and finished"""
+    landscape.engine.add_callback(FrameSequence(landscape, steps))
+    try:
+        landscape.engine.run()
+    except SystemExit:
+        pass
+
+
+def apply_job(landscape, projects, job):
+    if landscape.layout_name != job["layout"] or landscape.camera != landscape.camera_conf[job["layout"]]:
+        landscape.apply_layout(job["layout"], move_camera=True)
+    project = projects[job["project"]]
+    if job["deliverable"] is None:
+        landscape.set_project(project)
+    else:
+        landscape.set_deliverables(project["deliverables"][job["deliverable"]])
+
+
+def render_chunk(projects, jobs, out_dir):
+    """worker entry point: one engine for all jobs of the chunk"""
+    headless()
+    from functools import partial
+
+    from ped_landscape import Landscape
+
+    landscape = Landscape(layout=jobs[0]["layout"], debug=False)
+    landscape.random_keywords = False   # leere Einträge ohne Highlight, nicht mit Zufallskeywords
+    out_dir = Path(out_dir)
+    written = []
+
+    def save(filename, surface):
+        pygame.image.save(surface, str(out_dir / filename))
+        written.append(filename)
+
+    steps = [(partial(apply_job, landscape, projects, job), partial(save, job["filename"])) for job in jobs]
+    run_sequence(landscape, steps)
+    return written
+
+
+def chunked(items, n):
+    size = -(-len(items) // max(1, n))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def render_all(projects, out_dir, layouts=LAYOUTS, workers=None, deliverables=True):
+    """renders all projects (all_results json shape) into out_dir, returns the written filenames"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = create_jobs(projects, layouts, deliverables)
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    if workers == 1:
+        return render_chunk(projects, jobs, out_dir)
+    written = []
+    # spawn: jeder Worker startet pygame/SDL frisch
+    with ProcessPoolExecutor(workers, mp_context=get_context("spawn")) as pool:
+        for files in pool.map(render_chunk, [projects] * workers, chunked(jobs, workers), [out_dir] * workers):
+            written.extend(files)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every project and deliverable headless into PNGs")
+    parser.add_argument("projects", help="projects json as read by Landscape.set_project_keywords_from_file")
+    parser.add_argument("--out", default=str(Path("Screenshots") / "batch"))
+    parser.add_argument("--layouts", nargs="+", default=list(LAYOUTS), choices=LAYOUTS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-deliverables", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.projects, "r", encoding="utf-8") as f:
+        projects = json.load(f)
+    out_dir = Path(args.out).resolve()
+    os.chdir(Path(__file__).parent.resolve())
+    headless()
+    written = render_all(projects, out_dir, args.layouts, args.workers, not args.no_deliverables)
+    print(f"rendered {len(written)} images into {args.out}")
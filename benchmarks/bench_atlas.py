@@ -0,0 +1,78 @@
+"""Startzeit, Speicher und Zeichenzeit: einzelne PNGs vs. Atlas
+
+run from the repo root after `python atlas.py`:  python -m benchmarks.bench_atlas
+Measured at the pygame level (decode + scale, resident memory, blitting all
+tiles onto a 1300x1000 frame), which is what Landscape does per tile. Both
+paths draw the same way: every frame each tile is scaled to its drawn width
+(DRAWN_TILE_PX at zoom 1) and blitted, only the source surfaces differ
+(full size PNGs vs. 128 px atlas tiles).
+"""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from atlas import ATLAS_MANIFEST, Atlas, _categorized_assets, scaled_size
+from camera import DRAWN_TILE_PX
+
+SCREEN = (1300, 1000)
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def load_single(assets):
+    surfaces = {}
+    for category, tiles in assets.items():
+        for name, path in tiles.items():
+            surfaces[(category, name)] = pygame.image.load(path).convert_alpha()
+    return surfaces
+
+
+def load_from_atlas(assets):
+    atlas = Atlas(ATLAS_MANIFEST)
+    for level, sheets in enumerate(atlas.manifest["levels"][:1]):
+        for i in range(len(sheets["sheets"])):
+            atlas.sheets[(level, i)] = atlas.sheet(level, i).convert_alpha()
+    return {(category, name): atlas.surface(category, name) for category, tiles in assets.items() for name in tiles}
+
+
+def frame_time(surfaces, frames=60):
+    screen = pygame.display.get_surface()
+    positions = [((i % 9) * 130, (i // 9) * 120) for i in range(len(surfaces))]
+    start = time.perf_counter()
+    for _ in range(frames):
+        screen.fill((230, 221, 204))
+        for surface, pos in zip(surfaces.values(), positions):
+            surface = pygame.transform.scale(surface, scaled_size(surface.get_size(), DRAWN_TILE_PX))
+            screen.blit(surface, pos)
+    return (time.perf_counter() - start) / frames
+
+
+def run(label, loader):
+    assets = _categorized_assets("assets/img")
+    before = rss_mb()
+    start = time.perf_counter()
+    surfaces = loader(assets)
+    startup = time.perf_counter() - start
+    print(f"{label:14s} startup {startup*1000:8.1f} ms  +rss {rss_mb()-before:7.1f} MB  "
+          f"frame {frame_time(surfaces)*1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    import sys
+    pygame.init()
+    pygame.display.set_mode(SCREEN)
+    if sys.argv[1:] == ["atlas"]:
+        run("atlas", load_from_atlas)
+    elif sys.argv[1:] == ["single"]:
+        run("single images", load_single)
+    else:
+        # getrennte Prozesse, damit RSS nicht vom anderen Lauf verfälscht wird
+        import subprocess
+        for mode in ("single", "atlas"):
+            subprocess.run([sys.executable, "-m", "benchmarks.bench_atlas", mode], check=True)
@@ -0,0 +1,42 @@
+"""Vergleich extract_projects_for_visualization vs. extract_projects_vectorized
+
+run from the repo root:  python -m benchmarks.bench_parse [workbook.xlsx ...]
+"""
+import math
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+from parse import extract_projects_for_visualization, extract_projects_vectorized
+
+WORKBOOKS = ["results1.xlsx", "all_results_may.xlsx", "all_results_may_fixedkeywords.xlsx"]
+
+
+def same(a, b):
+    """structural equality that treats NaN == NaN"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return list(a) == list(b) and all(same(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+def bench(filename, repeat=5):
+    df = pd.read_excel(filename)
+    load = min(timeit.repeat(lambda: pd.read_excel(filename), number=1, repeat=2))
+    old = min(timeit.repeat(lambda: extract_projects_for_visualization(df), number=1, repeat=repeat))
+    new = min(timeit.repeat(lambda: extract_projects_vectorized(df), number=1, repeat=repeat))
+    equal = same(extract_projects_for_visualization(df), extract_projects_vectorized(df))
+    print(f"{filename:40s} {df.shape[1]-1:4d} projects  read_excel {load*1000:8.1f} ms  "
+          f"old {old*1000:8.1f} ms  new {new*1000:7.1f} ms  x{old/new:5.1f}  equal={equal}")
+    return equal
+
+
+if __name__ == "__main__":
+    files = sys.argv[1:] or [f for f in WORKBOOKS if Path(f).exists()]
+    ok = all([bench(f) for f in files])
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,59 @@
+"""Peak-Speicher und Durchsatz: json.load vs. iter_projects_from_responses
+
+run from the repo root:  python -m benchmarks.bench_stream [copies ...]
+The real responses.json is replicated into a temporary export of the given size.
+"""
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from parse import iter_projects_from_responses, response_to_project
+
+
+def write_export(path, responses, copies):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"responses": [')
+        for i in range(copies):
+            for j, r in enumerate(responses):
+                if i or j:
+                    f.write(",")
+                json.dump(r, f)
+        f.write("]}")
+
+
+def load_all(path):
+    with open(path, "r", encoding="utf-8") as f:
+        responses = json.load(f)["responses"]
+    return sum(1 for r in responses if response_to_project(list(r.items())))
+
+
+def stream_all(path):
+    return sum(1 for p in iter_projects_from_responses(path) if p)
+
+
+def measure(func, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    n = func(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return n, elapsed, peak
+
+
+if __name__ == "__main__":
+    with open("responses.json", "r", encoding="utf-8") as f:
+        responses = json.load(f)["responses"]
+    sizes = [int(a) for a in sys.argv[1:]] or [10, 100, 500]
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in sizes:
+            path = Path(tmp) / f"responses_{copies}.json"
+            write_export(path, responses, copies)
+            mb = path.stat().st_size / 1e6
+            for label, func in (("json.load", load_all), ("stream", stream_all)):
+                n, elapsed, peak = measure(func, path)
+                print(f"{n:6d} responses {mb:7.1f} MB  {label:9s}  {elapsed*1000:8.1f} ms  "
+                      f"{n/elapsed:8.0f} resp/s  peak {peak/1e6:7.2f} MB")
@@ -0,0 +1,303 @@
+"""Benchmark-Suite auf synthetischen Daten, Ergebnisse als JSON
+
+run from the repo root:
+
+    python -m benchmarks.suite --scale medium --out benchmarks/results/medium.json
+    python -m benchmarks.suite --scale medium --compare benchmarks/results/medium.json
+
+Times parsing, the workbook cache, asset loading, the keyword index, layouts and layout transitions, highlighting,
+headless frame rendering and keyword auto-tagging. Benchmarks that need deengi are recorded as skipped
+when it is not installed. --compare prints the median ratio against an older
+result file and exits with 1 if anything got slower than --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from benchmarks import synthetic
+
+BENCHMARKS = []
+
+
+def benchmark(func):
+    BENCHMARKS.append(func)
+    return func
+
+
+def stats(seconds):
+    ms = [s * 1000 for s in seconds]
+    return {"n": len(ms), "min_ms": min(ms), "median_ms": statistics.median(ms),
+            "mean_ms": statistics.fmean(ms), "max_ms": max(ms)}
+
+
+def measure(func, repeat=3, setup=None):
+    """timings of repeat calls of func(); setup() runs untimed before each call"""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        t = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t)
+    return stats(times)
+
+
+class Skip(Exception):
+    pass
+
+
+def landscape_class():
+    try:
+        from batch_render import headless
+        headless()
+        from ped_landscape import Landscape
+    except ImportError as e:
+        raise Skip(f"needs {e.name}")
+    except SyntaxError as e:  # ped_landscape braucht Python >= 3.12
+        raise Skip(f"ped_landscape does not compile on Python {platform.python_version()}: {e.msg}")
+    return Landscape
+
+
+@benchmark
+def parse(data, repeat):
+    from parse import extract_projects_for_visualization, extract_projects_vectorized
+
+    df = data["survey"]
+    return {
+        "parse.extract_projects_for_visualization": measure(lambda: extract_projects_for_visualization(df), min(repeat, 2)),
+        "parse.extract_projects_vectorized": measure(lambda: extract_projects_vectorized(df), repeat),
+    }
+
+
+@benchmark
+def parse_cache(data, repeat):
+    import pandas as pd
+
+    from parse_cache import clear_cache, load_workbook
+
+    # openpyxl schreibt langsam: ein Arbeitsblatt mit höchstens 20 Projekten reicht für den Vergleich
+    tmp = data["assets"].parent
+    workbook = synthetic.write_workbook(data["survey"].iloc[:, :21], tmp / "survey.xlsx")
+    cache_dir = tmp / "workbooks"
+    return {
+        "parse_cache.read_excel": measure(lambda: pd.read_excel(workbook), repeat),
+        "parse_cache.cold": measure(lambda: load_workbook(workbook, cache_dir=cache_dir), repeat,
+                                    setup=lambda: clear_cache(cache_dir)),
+        "parse_cache.warm": measure(lambda: load_workbook(workbook, cache_dir=cache_dir), repeat),
+    }
+
+
+@benchmark
+def assets(data, repeat):
+    import pygame
+
+    from catalog import AssetCatalog
+
+    root = data["assets"]
+    # neben dem Asset-Ordner statt in cache/, der temporäre Ordner wird am Ende gelöscht
+    manifest = root.parent / "catalog.json"
+    cold = measure(lambda: AssetCatalog(root, manifest), repeat, setup=lambda: manifest.unlink(missing_ok=True))
+    warm = measure(lambda: AssetCatalog(root, manifest), repeat)
+    paths = [entry["path"] for entry in AssetCatalog(root, manifest).entries]
+    decode = measure(lambda: [pygame.image.load(p) for p in paths], repeat)
+    return {"assets.catalog_scan": cold, "assets.catalog_manifest": warm, "assets.decode_all_tiles": decode}
+
+
+@benchmark
+def keyword_index(data, repeat):
+    from keyword_index import KeywordIndex
+
+    categories = {kw: cat for cat, kws in data["keywords"].items() for kw in kws}
+    projects = data["projects"]
+    build = lambda: KeywordIndex.from_projects(projects, categories)
+    index = build()
+    query = data["projects"][0]["keywords"][:3]
+    return {
+        "index.build": measure(build, repeat),
+        "index.covering_all": measure(lambda: index.rows_covering_all(query), repeat * 10),
+        "index.top_k": measure(lambda: index.top_k(query, k=10), repeat * 10),
+    }
+
+
+@benchmark
+def layout(data, repeat):
+    import layouts
+
+    anchors = {"Political": (-4, 2.5), "Spatial": (-1, 1), "Economic": (-1, 4), "Social": (2, 2.5),
+               "Legal": (-4, -0.5), "Environmental": (2, -0.5), "Technological": (-1, -2), "Process+Methods": (2.5, -4)}
+    items = data["keywords"]
+    results = {
+        "layout.compute_layout": measure(lambda: layouts.compute_layout(items, "pestel", anchors), repeat,
+                                         setup=layouts._cache.clear),
+        "layout.compute_layout_cached": measure(lambda: layouts.compute_layout(items, "pestel", anchors), repeat * 10),
+    }
+    import cooccurrence
+
+    layouts.register_layout("cooccurrence", cooccurrence.cooccurrence_layout(data["projects"]), per_category=False)
+
+    def clear():
+        layouts._cache.clear()
+        cooccurrence._cache.clear()
+
+    results["layout.cooccurrence"] = measure(lambda: layouts.compute_layout(items, "cooccurrence", {}), repeat, setup=clear)
+
+    from types import SimpleNamespace
+    from transitions import PositionTransition
+
+    # ein Frame einer Layout-Transition mit Kacheln, Labels und ein paar Tausend Renderables
+    n = max(5000, 2 * sum(len(names) for names in items.values()))
+    rng = np.random.default_rng(0)
+    renderables = [SimpleNamespace(pos=(0.0, 0.0)) for _ in range(n)]
+    transition = PositionTransition(renderables, rng.uniform(-20, 20, (n, 2)), rng.uniform(-20, 20, (n, 2)), duration=1.0)
+    results["layout.transition_frame"] = measure(lambda: transition.apply(transition.started + 0.5), repeat * 10)
+    try:
+        landscape_class()
+        from ped_landscape import create_layout, get_positions_around
+    except Skip as e:
+        results["layout.create_layout"] = {"skipped": str(e)}
+    else:
+        results["layout.create_layout"] = measure(lambda: create_layout(items, anchors, get_positions_around), repeat)
+    return results
+
+
+@benchmark
+def landscape(data, repeat):
+    Landscape = landscape_class()
+    results = {}
+    t = time.perf_counter()
+    scape = Landscape(image_folder_path=data["assets"], debug=False, use_atlas=False)
+    results["landscape.init"] = stats([time.perf_counter() - t])
+
+    projects = data["projects"][:max(repeat * 10, 10)]
+    cycle = iter(projects * 2)
+    results["landscape.highlight_project"] = measure(lambda: scape.set_project(next(cycle)), len(projects))
+
+    frames = []
+
+    def frame(*args):
+        frames.append(time.perf_counter())
+        if len(frames) > 10 * repeat:
+            scape.engine.quit()
+
+    scape.engine.add_callback(frame)
+    try:
+        scape.engine.run()
+    except SystemExit:
+        pass
+    results["landscape.frame"] = stats(np.diff(frames[1:]).tolist())
+    return results
+
+
+@benchmark
+def autotag(data, repeat):
+    from autotag import KeywordTagger
+
+    rng = np.random.default_rng(0)
+    words = np.array(" ".join(kw for kws in data["keywords"].values() for kw in kws).split()
+                     + "the district energy project city with and of to for".split())
+    texts = [" ".join(rng.choice(words, 150)) for _ in range(len(data["projects"]))]
+    tagger = KeywordTagger([kw for kws in data["keywords"].values() for kw in kws], synonyms={})
+    return {"autotag.confidence": measure(lambda: tagger.confidence(texts), repeat)}
+
+
+def generate_data(scale, seed=0):
+    tmp = Path(tempfile.mkdtemp(prefix="ped_bench_"))
+    keywords = synthetic.make_keywords(scale["keywords"])
+    return {
+        "survey": synthetic.survey_frame(scale["projects"], scale["deliverables"], seed=seed),
+        "keywords": keywords,
+        "projects": synthetic.projects_json(scale["projects"], scale["deliverables"], keywords, seed=seed),
+        "assets": synthetic.write_assets(tmp / "assets", keywords),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def run(scale, repeat=3, only=None, seed=0):
+    data = generate_data(scale, seed)
+    results = {}
+    try:
+        for bench in BENCHMARKS:
+            if only and not re.search(only, bench.__name__):
+                continue
+            print(f"{bench.__name__} ...", flush=True)
+            try:
+                results.update(bench(data, repeat))
+            except Skip as e:
+                results[bench.__name__] = {"skipped": str(e)}
+    finally:
+        shutil.rmtree(data["assets"].parent, ignore_errors=True)
+    return {
+        "meta": {"date": datetime.now().isoformat(timespec="seconds"), "revision": git_revision(),
+                 "python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform()},
+        "params": dict(scale, repeat=repeat, seed=seed),
+        "results": results,
+    }
+
+
+def compare(old, new, threshold=1.2):
+    """prints new/old median per benchmark, returns the names slower than threshold"""
+    slower = []
+    for name, result in new["results"].items():
+        before = old["results"].get(name, {})
+        if "median_ms" not in result or "median_ms" not in before:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        # unter 0.05 ms ist das Verhältnis nur Rauschen
+        if before["median_ms"] < 0.05:
+            ratio = min(ratio, threshold)
+        flag = "  SLOWER" if ratio > threshold else ""
+        print(f"{name:45s} {before['median_ms']:10.2f} ms -> {result['median_ms']:10.2f} ms  x{ratio:5.2f}{flag}")
+        if ratio > threshold:
+            slower.append(name)
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmark suite on synthetic data")
+    parser.add_argument("--scale", choices=synthetic.SCALES, default="small")
+    parser.add_argument("--projects", type=int)
+    parser.add_argument("--deliverables", type=int)
+    parser.add_argument("--keywords", type=int)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="regex on the benchmark group (parse, parse_cache, assets, keyword_index, layout, landscape, autotag)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="result json, default benchmarks/results/<scale>_<date>.json")
+    parser.add_argument("--compare", help="older result json to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    scale = dict(synthetic.SCALES[args.scale])
+    scale.update({k: v for k, v in vars(args).items() if k in scale and v is not None})
+    result = run(scale, args.repeat, args.only, args.seed)
+
+    out = Path(args.out or Path("benchmarks") / "results" / f"{args.scale}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    for name, r in result["results"].items():
+        print(f"{name:45s} " + (f"skipped ({r['skipped']})" if "skipped" in r else f"median {r['median_ms']:10.2f} ms"))
+    print(f"results written to {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            slower = compare(json.load(f), result, args.threshold)
+        sys.exit(1 if slower else 0)
@@ -0,0 +1,159 @@
+"""Synthetische Testdaten: Umfrage-Workbooks, Projekt-JSON und Kachel-Assets
+
+    python -m benchmarks.synthetic --projects 1000 --deliverables 20 --keywords 300 --out /tmp/ped_synth
+
+The survey layout (parse.meta_rows, project_kw_rows, ...) fixes the number of
+keyword rows of a workbook, so workbooks always carry the survey's 59 project /
+58 deliverable keyword rows; the keyword count only scales the project JSON,
+the keyword index and the tile assets.
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from parse import (deliverable_kw_rows, deliverable_meta_rows, first_deliverable_start, meta_rows,
+                   project_kw_rows)
+
+# Reihenfolge und Schreibweise wie im Fragebogen
+SURVEY_CATEGORIES = ["ECONOMIC", "LEGAL", "SOCIAL", "SPATIAL", "PROCESSES & METHODS",
+                     "ENVIRONMENTAL", "POLITICAL", "TECHNOLOGICAL"]
+# Ordnernamen unter assets/img, die Landscape einfärben kann
+TILE_CATEGORIES = ["Economic", "Legal", "Social", "Spatial", "Process+Methods",
+                   "Environmental", "Political", "Technological"]
+OTHER_ROWS = 3
+SYSTEM_ROWS = ["Date submitted", "Last page", "Start language", "Seed", "Date started", "Date last action"]
+META_QUESTIONS = ["[Project Name]", "[Project Acronym]", "[URL to Project ressources]", "[Project started in]",
+                  "[Project duration]", "[Contact (optional email)]", "Project description (Optional)"]
+DELIVERABLE_QUESTIONS = ["Please provide general information about your project deliverable.  [Title of Deliverable]",
+                         "Please provide general information about your project deliverable.  [URL of Deliverable]",
+                         "Please provide general information about your project deliverable.  [(optional) Content]"]
+OTHER_QUESTION = "OTHER  If none of the keywords above apply, you can specify up to three additional keywords below:  [Keyword {}]"
+
+SCALES = {
+    "small": {"projects": 100, "deliverables": 10, "keywords": 100},
+    "medium": {"projects": 1000, "deliverables": 20, "keywords": 300},
+    "large": {"projects": 10000, "deliverables": 50, "keywords": 1000},
+}
+
+
+def make_keywords(n, categories=TILE_CATEGORIES):
+    """{category: [keyword, ...]} with n keywords spread round robin over categories"""
+    keywords = {category: [] for category in categories}
+    for i in range(n):
+        keywords[categories[i % len(categories)]].append(f"Keyword {i:04d}")
+    return keywords
+
+
+def keyword_weights(n, rng, skew=1.1):
+    # Zipf-artig: wenige Keywords sind sehr häufig, wie in den echten Daten
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def _keyword_questions(n):
+    per_category = -(-n // len(SURVEY_CATEGORIES))
+    questions = [f"{SURVEY_CATEGORIES[i // per_category]} Keywords    [Survey Keyword {i:02d}]" for i in range(n)]
+    return questions + [OTHER_QUESTION.format(i + 1) for i in range(OTHER_ROWS)]
+
+
+def survey_frame(n_projects, n_deliverables, density=0.15, seed=0):
+    """DataFrame in the layout pd.read_excel returns for a survey export (questions in column 0)"""
+    rng = np.random.default_rng(seed)
+    project_kw = len(project_kw_rows) - OTHER_ROWS
+    deliverable_kw = deliverable_kw_rows - OTHER_ROWS
+    questions = (SYSTEM_ROWS + META_QUESTIONS + _keyword_questions(project_kw)
+                 + (DELIVERABLE_QUESTIONS + _keyword_questions(deliverable_kw)) * n_deliverables)
+    assert len(SYSTEM_ROWS) == meta_rows.start and len(DELIVERABLE_QUESTIONS) == deliverable_meta_rows
+    assert len(SYSTEM_ROWS) + len(META_QUESTIONS) + project_kw + OTHER_ROWS == first_deliverable_start
+
+    values = np.empty((len(questions), n_projects), dtype=object)
+    # Objekt-Array mit nur zwei String-Objekten, sonst wird "large" mehrere GB groß
+    values[:] = np.array(["No", "Yes"], dtype=object)[(rng.random((len(questions), n_projects)) < density).view(np.uint8)]
+    values[:len(SYSTEM_ROWS)] = "2025-03-12 09:00:30"
+    ids = np.arange(n_projects)
+    values[meta_rows.start] = [f"Synthetic project {i}" for i in ids]
+    values[meta_rows.start + 1] = [f"SYN-{i:05d}" for i in ids]
+    values[meta_rows.start + 2:meta_rows.stop] = np.nan
+    for q, question in enumerate(questions):
+        if question.startswith("OTHER"):
+            values[q] = np.nan
+            values[q, rng.random(n_projects) < 0.1] = "free text keyword"
+    for d in range(n_deliverables):
+        start = first_deliverable_start + d * (deliverable_meta_rows + deliverable_kw_rows)
+        values[start] = [f"Deliverable {d + 1} of SYN-{i:05d}" for i in ids]
+        values[start + 1:start + deliverable_meta_rows] = np.nan
+
+    df = pd.DataFrame(values, columns=range(1, n_projects + 1))
+    df.insert(0, "Response ID", questions)
+    return df
+
+
+def write_workbook(df, filename):
+    df.to_excel(filename, index=False)
+    return filename
+
+
+def projects_json(n_projects, n_deliverables, keywords, per_project=(3, 15), seed=0):
+    """projects in the all_results json shape, keywords drawn from {category: [keyword, ...]}"""
+    rng = np.random.default_rng(seed)
+    names = np.array([kw for kws in keywords.values() for kw in kws])
+    weights = keyword_weights(len(names), rng)
+    low, high = per_project
+
+    def sample():
+        k = min(len(names), int(rng.integers(low, high + 1)))
+        return names[rng.choice(len(names), k, replace=False, p=weights)].tolist()
+
+    projects = []
+    for i in range(n_projects):
+        deliverables = [{"name": f"Deliverable {d + 1} of SYN-{i:05d}", "description": "", "keywords": sample()}
+                        for d in range(int(rng.integers(0, n_deliverables + 1)))]
+        projects.append({"project": f"SYN-{i:05d}", "description": f"Synthetic project {i}",
+                         "keywords": sample(), "deliverables": deliverables})
+    return projects
+
+
+def write_assets(root, keywords, size=128):
+    """one solid-colour PNG per keyword in root/<category>/<keyword>.png"""
+    from PIL import Image
+
+    root = Path(root)
+    for c, (category, kws) in enumerate(keywords.items()):
+        (root / category).mkdir(parents=True, exist_ok=True)
+        for i, kw in enumerate(kws):
+            path = root / category / f"{kw}.png"
+            if not path.exists():
+                Image.new("RGBA", (size, size), (40 + 25 * c, (7 * i) % 256, 120, 255)).save(path)
+    return root
+
+
+def generate(out_dir, projects, deliverables, keywords, xlsx=False, seed=0):
+    """writes assets/, projects.json and (optionally) survey.xlsx into out_dir"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    categorized = make_keywords(keywords)
+    write_assets(out_dir / "assets", categorized)
+    with open(out_dir / "projects.json", "w", encoding="utf-8") as f:
+        json.dump(projects_json(projects, deliverables, categorized, seed=seed), f)
+    if xlsx:
+        write_workbook(survey_frame(projects, deliverables, seed=seed), out_dir / "survey.xlsx")
+    return out_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic assets, projects json and survey workbook")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--projects", type=int)
+    parser.add_argument("--deliverables", type=int)
+    parser.add_argument("--keywords", type=int)
+    parser.add_argument("--xlsx", action="store_true", help="also write survey.xlsx (slow for large scales)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="synthetic")
+    args = parser.parse_args()
+    scale = dict(SCALES[args.scale])
+    scale.update({k: v for k, v in vars(args).items() if k in scale and v is not None})
+    print(f"writing {scale} to {generate(args.out, xlsx=args.xlsx, seed=args.seed, **scale)}")
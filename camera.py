@@ -0,0 +1,47 @@
+"""Isometric camera transform as configured in Landscape.setup_engine.
+
+World x/y are rotated by `rotation` degrees (world y points up), then the
+screen y axis is squashed by `isometry`. One world unit is UNIT_PX pixels at
+zoom 1 (fitted against the screenshots in Screenshots/).
+"""
+import numpy as np
+
+ROTATION = 45
+ISOMETRY = 0.57
+UNIT_PX = 100
+SCREEN_SIZE = (1300, 1000)
+# gemessene Breite einer Kachel in px bei zoom 1
+DRAWN_TILE_PX = 105
+
+# Kamera pro Layout
+CAMERA_CONF = {
+    "pestel": {"pos": (0.5, 0.5), "zoom": 1},
+    "line": {"pos": (10, -5), "zoom": 0.8},
+    "cooccurrence": {"pos": (0.5, 0.5), "zoom": 0.6},
+}
+
+
+def world_to_screen(points, pos, zoom, screen_size=SCREEN_SIZE, rotation=ROTATION, isometry=ISOMETRY, unit_px=UNIT_PX):
+    """(n, 2) array of world positions -> (n, 2) array of screen pixels"""
+    p = np.asarray(points, dtype=float).reshape(-1, 2) - np.asarray(pos, dtype=float)
+    a = np.radians(rotation)
+    c, s = np.cos(a), np.sin(a)
+    x, y = p[:, 0], -p[:, 1]
+    scale = zoom * unit_px
+    screen = np.empty_like(p)
+    screen[:, 0] = (c * x - s * y) * scale + screen_size[0] / 2
+    screen[:, 1] = (s * x + c * y) * scale * isometry + screen_size[1] / 2
+    return screen
+
+
+def tile_screen_width(zoom, unit_px=UNIT_PX):
+    """width in px of a 1x1 tile (the diagonal of the rotated square)"""
+    return np.sqrt(2) * zoom * unit_px
+
+
+def on_screen(points, pos, zoom, screen_size=SCREEN_SIZE, margin=1.0, **kwargs):
+    """bool mask of world positions whose tile lies (at least partly) on screen"""
+    screen = world_to_screen(points, pos, zoom, screen_size, **kwargs)
+    m = margin * tile_screen_width(zoom, kwargs.get("unit_px", UNIT_PX))
+    return ((screen[:, 0] > -m) & (screen[:, 0] < screen_size[0] + m)
+            & (screen[:, 1] > -m) & (screen[:, 1] < screen_size[1] + m))
@@ -0,0 +1,197 @@
+"""Asset catalog backed by a persisted manifest.
+
+The manifest (cache/catalogs/<folder>-<path hash>.json by default, outside
+the asset tree so nothing walking the tiles trips over it) records category, name,
+path, mtime, size, pixel dimensions and a content hash for every tile. Loading
+it only costs a few stat calls to check that it is still valid; only tiles
+whose mtime or size changed are hashed again. AssetCatalog.watch starts an
+optional polling thread that picks up added or changed tiles at runtime.
+"""
+import hashlib
+import json
+import struct
+import threading
+from pathlib import Path
+
+MANIFEST_NAME = "catalog.json"   # früherer Ort im Asset-Ordner, wird beim Scannen übersprungen
+CACHE_DIR = Path("cache") / "catalogs"
+MANIFEST_VERSION = 1
+IMAGE_SUFFIXES = (".png", ".jpg")
+
+_catalogs = {}
+
+
+def image_size(path):
+    """(width, height) from the file header, without decoding the image"""
+    with open(path, "rb") as f:
+        head = f.read(24)
+    if head[:8] == b"\x89PNG\r\n\x1a\n":
+        return struct.unpack(">II", head[16:24])
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    with Image.open(path) as image:
+        return image.size
+
+
+def default_manifest_path(root, cache_dir=CACHE_DIR):
+    """manifest of an asset folder in cache_dir, one per resolved folder path"""
+    root = Path(root).resolve()
+    return Path(cache_dir) / f"{root.name}-{hashlib.sha1(root.as_posix().encode()).hexdigest()[:12]}.json"
+
+
+def content_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class AssetCatalog:
+    def __init__(self, root="assets/img", manifest_path=None):
+        self.root = Path(root)
+        self.manifest_path = Path(manifest_path) if manifest_path else default_manifest_path(self.root)
+        self.entries = []     # dicts with category, name, path, mtime, size, width, height, hash
+        self.dir_mtimes = {}  # Verzeichnis -> mtime, ändert sich beim Hinzufügen/Löschen von Dateien
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        if not self._load_manifest() or not self.is_valid():
+            self.rescan()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if manifest.get("version") != MANIFEST_VERSION:
+            return False
+        self.entries = manifest["tiles"]
+        self.dir_mtimes = manifest["directories"]
+        return True
+
+    def _save_manifest(self):
+        manifest = {"version": MANIFEST_VERSION, "directories": self.dir_mtimes, "tiles": self.entries}
+        tmp = self.manifest_path.with_suffix(".tmp")
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=1)
+            tmp.replace(self.manifest_path)
+        except OSError as e:
+            # schreibgeschützter Ordner: Katalog funktioniert trotzdem, nur ohne Persistenz
+            print(f"Could not write asset manifest {self.manifest_path}: {e}")
+
+    def _current_dir_mtimes(self):
+        """mtimes of the category folders; the root itself is left out, a manifest_path inside it would change its mtime"""
+        dirs = {}
+        for category in self.root.iterdir():
+            if category.is_dir():
+                dirs[category.as_posix()] = category.stat().st_mtime
+        return dirs
+
+    def is_valid(self, check_files=True):
+        """stat-only check whether the manifest still matches the asset tree"""
+        try:
+            if self._current_dir_mtimes() != self.dir_mtimes:
+                return False
+            if check_files:
+                for entry in self.entries:
+                    stat = Path(entry["path"]).stat()
+                    if stat.st_mtime != entry["mtime"] or stat.st_size != entry["size"]:
+                        return False
+        except OSError:
+            return False
+        return True
+
+    def rescan(self):
+        """walks the asset tree; files with unchanged mtime and size keep their hash and dimensions"""
+        known = {entry["path"]: entry for entry in self.entries}
+        entries = []
+        for category in sorted(self.root.iterdir()):
+            if not category.is_dir():
+                if category.name not in (MANIFEST_NAME, self.manifest_path.name):
+                    print(f"Non categorized file {category} in path={self.root}")
+                continue
+            for tile in sorted(category.iterdir()):
+                if not tile.is_file() or tile.suffix.lower() not in IMAGE_SUFFIXES:
+                    print(f"Non-image file {tile} in {category=}")
+                    continue
+                path = tile.as_posix()
+                stat = tile.stat()
+                old = known.get(path)
+                if old and old["mtime"] == stat.st_mtime and old["size"] == stat.st_size:
+                    entries.append(old)
+                    continue
+                size = image_size(tile) or (None, None)
+                entries.append({
+                    "category": category.name,
+                    "name": tile.name[:-4],
+                    "path": path,
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                    "width": size[0],
+                    "height": size[1],
+                    "hash": content_hash(tile),
+                })
+        with self._lock:
+            changed = [e for e in entries if known.get(e["path"]) is not e]
+            removed = set(known) - {e["path"] for e in entries}
+            self.entries = entries
+            self.dir_mtimes = self._current_dir_mtimes()
+        self._save_manifest()
+        return changed, removed
+
+    def refresh(self):
+        """rescans if the stat check fails; returns (changed entries, removed paths)"""
+        if self.is_valid():
+            return [], set()
+        return self.rescan()
+
+    def categorized(self) -> dict:
+        """{category: {name: path}}, the shape of get_categorized_assets"""
+        landscape = {}
+        for entry in self.entries:
+            landscape.setdefault(entry["category"], {})[entry["name"]] = entry["path"]
+        return landscape
+
+    def flat(self) -> dict:
+        """{name: {"path": ..., "category": ...}}, the shape of get_all_assets"""
+        return {entry["name"]: {"path": entry["path"], "category": entry["category"]} for entry in self.entries}
+
+    def mtime(self):
+        return max([e["mtime"] for e in self.entries] + list(self.dir_mtimes.values()), default=0)
+
+    def watch(self, callback, interval=2.0):
+        """polls the asset tree in a daemon thread and calls callback(catalog, changed, removed) on changes"""
+        if self._watcher is not None:
+            return self._watcher
+
+        def poll():
+            while not self._stop.wait(interval):
+                changed, removed = self.refresh()
+                if changed or removed:
+                    callback(self, changed, removed)
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=poll, name="asset-catalog-watcher", daemon=True)
+        self._watcher.start()
+        return self._watcher
+
+    def stop_watching(self):
+        self._stop.set()
+        self._watcher = None
+
+
+def get_catalog(root="assets/img") -> AssetCatalog:
+    """one catalog per asset folder and process; repeated calls only do the stat check"""
+    key = Path(root).resolve()
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = _catalogs[key] = AssetCatalog(root)
+    else:
+        catalog.refresh()
+    return catalog
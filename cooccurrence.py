@@ -0,0 +1,138 @@
+"""Layout from keyword co-occurrence: keywords that appear together in projects sit together.
+
+    register_layout("cooccurrence", cooccurrence_layout(projects), per_category=False)
+
+cooccurrence_matrix counts for every keyword pair how many projects and
+deliverables contain both (from the bitsets of a KeywordIndex, chunk by
+chunk). The cosine-normalized counts plus an extra weight between keywords
+of the same category (so categories stay clustered) form a graph that is
+embedded spectrally and then relaxed with a vectorized Fruchterman-Reingold
+force simulation. The result is scaled to one tile per grid cell and
+rounded; compute_layout resolves the remaining collisions. Results are
+cached per dataset.
+"""
+import hashlib
+import json
+
+import numpy as np
+
+from keyword_index import KeywordIndex
+
+CATEGORY_WEIGHT = 0.6
+BASE_WEIGHT = 0.01     # hält unverbundene Teile zusammen
+ITERATIONS = 150
+SPACING = 1.15         # Abstand zweier Kacheln im Kräftegleichgewicht, in Gitterzellen
+CHUNK_ROWS = 1 << 14
+
+_cache = {}
+
+
+def dataset_key(projects):
+    """hash of the keyword sets of projects and deliverables"""
+    h = hashlib.sha1()
+    for project in projects:
+        h.update(json.dumps([project.get("keywords", []), [d.get("keywords", []) for d in project.get("deliverables", [])]]).encode())
+    return h.hexdigest()
+
+
+def cooccurrence_matrix(projects, names):
+    """(K, K) float32: number of projects and deliverables containing both keywords, diagonal = frequency"""
+    index = KeywordIndex.from_projects(projects, dict.fromkeys(names, ""))
+    counts = np.zeros((len(index.keyword_names), len(index.keyword_names)), dtype=np.float32)
+    for start in range(0, len(index), CHUNK_ROWS):
+        dense = index.unpack(np.arange(start, min(len(index), start + CHUNK_ROWS))).astype(np.float32)
+        counts += dense.T @ dense
+    return index.keyword_names, counts
+
+
+def affinity(counts, categories):
+    """symmetric weights: cosine of the co-occurrence counts plus CATEGORY_WEIGHT inside a category"""
+    freq = np.sqrt(np.diag(counts))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = np.where(np.outer(freq, freq) > 0, counts / np.outer(freq, freq), 0.0)
+    categories = np.asarray(categories, dtype=object)
+    weights = cosine + CATEGORY_WEIGHT * (categories[:, None] == categories[None, :]) + BASE_WEIGHT
+    np.fill_diagonal(weights, 0.0)
+    return weights
+
+
+def spectral_embedding(weights):
+    """2d start positions from the two smallest non-trivial eigenvectors of the normalized Laplacian"""
+    n = len(weights)
+    if n < 3:
+        return np.column_stack([np.arange(n, dtype=float), np.zeros(n)])
+    degree = weights.sum(axis=1)
+    inv_sqrt = 1 / np.sqrt(degree)
+    laplacian = np.eye(n) - inv_sqrt[:, None] * weights * inv_sqrt[None, :]
+    _, vectors = np.linalg.eigh(laplacian)
+    pos = vectors[:, 1:3] * inv_sqrt[:, None]
+    # Vorzeichen der Eigenvektoren festlegen, damit das Layout reproduzierbar ist
+    signs = np.sign(pos[np.abs(pos).argmax(axis=0), [0, 1]])
+    return pos * np.where(signs == 0, 1, signs)
+
+
+def force_layout(weights, pos, iterations=ITERATIONS, spacing=SPACING):
+    """Fruchterman-Reingold on all pairs at once; weights scale the attraction"""
+    n = len(pos)
+    if n < 2:
+        return pos
+    pos = pos - pos.mean(axis=0)
+    extent = np.abs(pos).max() or 1.0
+    pos = pos / extent * spacing * np.sqrt(n) / 2
+    weights = weights / weights.max()
+    temperature = spacing * np.sqrt(n) / 4
+    for i in range(iterations):
+        sq = (pos ** 2).sum(axis=1)
+        dist2 = np.maximum(sq[:, None] + sq[None, :] - 2 * pos @ pos.T, 1e-9)
+        # Abstoßung k²/d, Anziehung w·d²/k, jeweils entlang delta/d;
+        # sum_j f_ij (p_i - p_j) ohne das (n, n, 2) Array der Differenzen
+        f = spacing ** 2 / dist2 - weights * np.sqrt(dist2) / spacing
+        np.fill_diagonal(f, 0.0)
+        disp = f.sum(axis=1)[:, None] * pos - f @ pos
+        length = np.linalg.norm(disp, axis=1, keepdims=True) + 1e-9
+        step = temperature * (1 - i / iterations)
+        pos = pos + disp / length * np.minimum(length, step)
+    return pos
+
+
+def to_grid(pos, spacing=SPACING):
+    """scales positions so neighbours are about one cell apart and rounds them"""
+    if len(pos) < 2:
+        return np.round(pos)
+    delta = pos[:, None, :] - pos[None, :, :]
+    dist = np.sqrt((delta ** 2).sum(axis=-1))
+    np.fill_diagonal(dist, np.inf)
+    nearest = np.median(dist.min(axis=1)) or 1.0
+    pos = (pos - pos.mean(axis=0)) / nearest * spacing
+    return np.round(pos)
+
+
+def cooccurrence_positions(projects, categorized_items):
+    """(n, 2) grid positions in the order of the items of {category: {name: ...}}, and anchors per category"""
+    items = [(category, name) for category, names in categorized_items.items() for name in names]
+    key = (dataset_key(projects), tuple(items))
+    if key in _cache:
+        positions, anchors = _cache[key]
+        return positions.copy(), dict(anchors)
+    names, counts = cooccurrence_matrix(projects, [name for _, name in items])
+    # Namen können in zwei Kategorien vorkommen (Infrastructure), beide bekommen dieselben Zählungen
+    column = {name: i for i, name in enumerate(names)}
+    cols = np.array([column[name] for _, name in items], dtype=np.intp)
+    weights = affinity(counts[np.ix_(cols, cols)], [category for category, _ in items])
+    positions = to_grid(force_layout(weights, spectral_embedding(weights)))
+    anchors = {}
+    categories = np.array([category for category, _ in items], dtype=object)
+    for category in categorized_items:
+        block = positions[categories == category]
+        if len(block):
+            # Überschrift über der Mitte der Gruppe (layout_headers zieht 1 ab), Median wegen Ausreißern
+            anchors[category] = tuple((np.round(np.median(block, axis=0)) + 1).tolist())
+    _cache[key] = (positions, anchors)
+    return positions.copy(), dict(anchors)
+
+
+def cooccurrence_layout(projects):
+    """layout function for register_layout(..., per_category=False) on the given all_results projects"""
+    def layout(categorized_items, anchors):
+        return cooccurrence_positions(projects, categorized_items)
+    return layout
@@ -0,0 +1,172 @@
+"""Headless video / animated image of all projects, one after the other.
+
+    python export_video.py all_results_may_fixedkeywords.json --out Screenshots/projects.mp4 --hold 2
+    python export_video.py all_results_may_fixedkeywords.json --out Screenshots/projects.gif --layouts pestel cooccurrence --transition 0.6 --only "PED|Energy"
+
+Steps through the projects (and their deliverables) like the number keys bound
+in set_project_keywords_from_file, renders through the SDL dummy driver with
+batch_render.FrameSequence and pipes the raw RGB frames into ffmpeg; no frame
+is kept in memory or written to disk. Time is video time, not wall clock: a
+project held for 2 s is rendered once and written hold * fps times, and layout
+transitions (transitions.Animator) are rendered at exactly fps frames per
+second, so the export runs much faster than real time. The container follows
+the suffix of --out (.mp4, .mkv, .mov, .webm, .gif, .webp).
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+from functools import partial
+from pathlib import Path
+
+import pygame
+
+from batch_render import headless, run_sequence
+
+FPS = 30
+HOLD = 2.0          # Sekunden pro Projekt
+TRANSITION = 0.6    # Sekunden pro Layoutwechsel
+
+CODECS = {
+    ".mp4": ["-c:v", "libx264", "-preset", "veryfast", "-crf", "20", "-pix_fmt", "yuv420p", "-movflags", "+faststart"],
+    ".mkv": ["-c:v", "libx264", "-preset", "veryfast", "-crf", "20", "-pix_fmt", "yuv420p"],
+    ".mov": ["-c:v", "libx264", "-preset", "veryfast", "-crf", "20", "-pix_fmt", "yuv420p"],
+    ".webm": ["-c:v", "libvpx-vp9", "-crf", "32", "-b:v", "0", "-row-mt", "1"],
+    # eine Palette pro Frame, sonst puffert palettegen das ganze Video
+    ".gif": ["-filter_complex", "split[a][b];[a]palettegen=stats_mode=single[p];[b][p]paletteuse=new=1", "-loop", "0"],
+    ".webp": ["-c:v", "libwebp_anim", "-quality", "80", "-loop", "0"],
+}
+
+
+class FFmpegSink:
+    """raw RGB frames into an ffmpeg process; opened with the size of the first frame"""
+
+    def __init__(self, path, fps=FPS, ffmpeg="ffmpeg"):
+        self.path = Path(path)
+        if self.path.suffix.lower() not in CODECS:
+            raise ValueError(f"Invalid output format: {self.path.suffix}, expected one of {', '.join(CODECS)}")
+        self.fps = fps
+        self.ffmpeg = shutil.which(ffmpeg)
+        if self.ffmpeg is None:
+            raise RuntimeError(f"{ffmpeg} not found, it is needed to encode {self.path.name}")
+        self.process = None
+        self.size = None
+        self.frames = 0
+
+    def time(self):
+        """video time of the next frame, used as Animator clock"""
+        return self.frames / self.fps
+
+    def open(self, size):
+        self.size = size
+        width, height = size
+        cmd = [self.ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+               "-s", f"{width}x{height}", "-r", str(self.fps), "-i", "-"]
+        if self.path.suffix.lower() in (".mp4", ".mkv", ".mov") and (width % 2 or height % 2):
+            cmd += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]  # yuv420p braucht gerade Maße
+        cmd += CODECS[self.path.suffix.lower()] + [str(self.path)]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.process = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, surface, repeat=1):
+        if self.process is None:
+            self.open(surface.get_size())
+        data = pygame.image.tobytes(surface, "RGB")
+        for _ in range(repeat):
+            self.process.stdin.write(data)
+        self.frames += repeat
+
+    def close(self):
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed with exit code {self.process.returncode} for {self.path}")
+        self.process = None
+
+
+def select_items(projects, deliverables=True, only=None):
+    """(project index, deliverable index or None) in key order; only is a regex on project and deliverable names"""
+    pattern = re.compile(only, re.IGNORECASE) if only else None
+    items = []
+    for p, project in enumerate(projects):
+        project_match = pattern is None or pattern.search(str(project.get("project", "")))
+        if project_match:
+            items.append((p, None))
+        if not deliverables:
+            continue
+        for d, deliverable in enumerate(project.get("deliverables", [])):
+            if project_match or pattern.search(str(deliverable.get("name", ""))):
+                items.append((p, d))
+    return items
+
+
+def show_item(landscape, projects, item, layout, transition):
+    project = projects[item[0]]
+    if item[1] is None:
+        landscape.set_project(project)
+    else:
+        landscape.set_deliverables(project["deliverables"][item[1]])
+    if layout != landscape.layout_name:
+        landscape.apply_layout(layout, move_camera=True, animate=transition > 0)
+
+
+def create_steps(landscape, projects, items, sink, layouts, hold=HOLD, transition=TRANSITION):
+    """FrameSequence steps: per item one step that switches to it, the transition frames and one held frame"""
+    hold_frames = max(1, round(hold * sink.fps))
+    transition_frames = round(transition * sink.fps)
+    steps = []
+    for n, item in enumerate(items):
+        layout = layouts[n % len(layouts)]
+        changes_layout = n > 0 and layout != layouts[(n - 1) % len(layouts)]
+        steps.append((partial(show_item, landscape, projects, item, layout, transition), sink.write))
+        if changes_layout:
+            steps += [(landscape.animate, sink.write)] * transition_frames
+        # animate() auch hier, damit die Transition sicher am Ziel ist
+        steps.append((landscape.animate, partial(sink.write, repeat=hold_frames)))
+    return steps
+
+
+def export(projects, out, layouts=("pestel",), fps=FPS, hold=HOLD, transition=TRANSITION, deliverables=True, only=None):
+    """renders the selected projects into out, returns the number of frames written"""
+    headless()
+    from ped_landscape import Landscape
+
+    items = select_items(projects, deliverables, only)
+    if not items:
+        raise ValueError("no project matches")
+    sink = FFmpegSink(out, fps)
+    landscape = Landscape(layout=layouts[0], debug=False)
+    landscape.random_keywords = False   # leere Einträge ohne Highlight, nicht mit Zufallskeywords
+    landscape.projects = projects
+    landscape.set_cooccurrence_data(projects)
+    # Transitionen laufen in Videozeit
+    landscape.animator.clock = sink.time
+    landscape.transition_duration = transition
+    try:
+        run_sequence(landscape, create_steps(landscape, projects, items, sink, list(layouts), hold, transition))
+    finally:
+        sink.close()
+    return sink.frames
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export all projects and deliverables as video or animated image")
+    parser.add_argument("projects", help="projects json as read by Landscape.set_project_keywords_from_file")
+    parser.add_argument("--out", default=str(Path("Screenshots") / "projects.mp4"), help=f"one of {', '.join(CODECS)}")
+    parser.add_argument("--layouts", nargs="+", default=["pestel"], help="cycled per project, e.g. pestel line cooccurrence")
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--hold", type=float, default=HOLD, help="seconds per project")
+    parser.add_argument("--transition", type=float, default=TRANSITION, help="seconds per layout change, 0 cuts")
+    parser.add_argument("--only", help="regex on project and deliverable names")
+    parser.add_argument("--no-deliverables", action="store_true")
+    args = parser.parse_args()
+
+    with open(args.projects, "r", encoding="utf-8") as f:
+        projects = json.load(f)
+    out = Path(args.out).resolve()
+    os.chdir(Path(__file__).parent.resolve())
+    frames = export(projects, out, args.layouts, args.fps, args.hold, args.transition, not args.no_deliverables, args.only)
+    print(f"wrote {frames} frames ({frames / args.fps:.1f} s) into {args.out}")
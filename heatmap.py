@@ -0,0 +1,129 @@
+"""Keyword frequencies across all projects and deliverables of a results file.
+
+KeywordMatrix unpacks a KeywordIndex once into a projects × keywords count
+matrix (own keywords and the summed keywords of the deliverables per project).
+Counting for any subset of projects is then a single masked sum, fast enough
+to re-filter interactively. tinted() colours a tile surface by frequency.
+"""
+import numpy as np
+
+import pygame
+
+from keyword_index import KeywordIndex
+
+HEAT_COLOR = (214, 72, 24)
+TINT_STRENGTH = 0.65
+BUCKETS = 16
+CHUNK_ROWS = 1 << 15
+
+
+class KeywordMatrix:
+    def __init__(self, index: KeywordIndex):
+        self.keyword_names = index.keyword_names
+        self.categories = index.categories
+        self.category_of = np.array([index.categories.index(c) for c in index.keyword_categories.values()], dtype=np.intp)
+        n = len(index)
+        is_project = index.is_project[:n]
+        parents = np.asarray(index.parents, dtype=np.intp)
+        self.project_rows = np.flatnonzero(is_project)
+        # Zeile im Index -> Projektnummer, Deliverables zählen für ihr Projekt
+        project_of_row = np.full(n, -1, dtype=np.intp)
+        project_of_row[self.project_rows] = np.arange(len(self.project_rows))
+        project_of_row[~is_project] = project_of_row[parents[~is_project]]
+
+        shape = (len(self.project_rows), len(self.keyword_names))
+        self.own = np.zeros(shape, dtype=np.uint16)
+        self.deliverables = np.zeros(shape, dtype=np.uint16)
+        for start in range(0, n, CHUNK_ROWS):
+            rows = np.arange(start, min(n, start + CHUNK_ROWS))
+            dense = index.unpack(rows)
+            projects = is_project[rows]
+            self.own[project_of_row[rows[projects]]] += dense[projects]
+            owners = project_of_row[rows[~projects]]
+            if len(owners):
+                # Deliverables eines Projekts liegen meist direkt hintereinander: erst blockweise summieren
+                starts = np.flatnonzero(np.r_[True, owners[1:] != owners[:-1]])
+                blocks = np.add.reduceat(dense[~projects], starts, axis=0, dtype=np.uint16)
+                if len(np.unique(owners[starts])) == len(starts):
+                    self.deliverables[owners[starts]] += blocks
+                else:
+                    np.add.at(self.deliverables, owners[starts], blocks)
+
+    @classmethod
+    def from_projects(cls, projects, keyword_categories: dict):
+        return cls(KeywordIndex.from_projects(projects, keyword_categories))
+
+    def counts(self, selected=None, deliverables=True):
+        """per keyword: number of selected projects (and their deliverables) tagged with it
+
+        selected is a bool mask or index array over the projects, None for all
+        """
+        own = self.own if selected is None else self.own[selected]
+        counts = own.sum(axis=0, dtype=np.int64)
+        if deliverables:
+            dels = self.deliverables if selected is None else self.deliverables[selected]
+            counts += dels.sum(axis=0, dtype=np.int64)
+        return counts
+
+    def category_totals(self, counts):
+        """summed keyword counts per category"""
+        totals = np.bincount(self.category_of, weights=counts, minlength=len(self.categories))
+        return dict(zip(self.categories, totals.astype(np.int64).tolist()))
+
+
+def matches(project, where):
+    """where is None, a callable(project) or {field: value or list of values} on the project or its metadata"""
+    if where is None:
+        return True
+    if callable(where):
+        return bool(where(project))
+    for field, wanted in where.items():
+        value = project.get(field, project.get("metadata", {}).get(field))
+        if isinstance(wanted, (list, tuple, set)):
+            if value not in wanted:
+                return False
+        elif value != wanted:
+            return False
+    return True
+
+
+def heat(counts):
+    """counts scaled to 0..1 by the maximum"""
+    top = counts.max() if len(counts) else 0
+    return counts / top if top else np.zeros(len(counts))
+
+
+class Heatmap:
+    """keyword matrix of one projects list plus tinted tile surfaces"""
+
+    def __init__(self, keyword_categories: dict):
+        self.keyword_categories = keyword_categories
+        self.projects = None
+        self.matrix = None
+        self.selected = 0
+        self._tinted = {}
+
+    def compute(self, projects, where=None, deliverables=True):
+        """({keyword: count}, {keyword: heat 0..1}, {category: total}) for the projects matching where"""
+        if projects is not self.projects:
+            self.projects = projects
+            self.matrix = KeywordMatrix.from_projects(projects, self.keyword_categories)
+        selected = None if where is None else np.array([matches(p, where) for p in projects], dtype=bool)
+        self.selected = len(projects) if selected is None else int(selected.sum())
+        counts = self.matrix.counts(selected, deliverables)
+        names = self.matrix.keyword_names
+        return (dict(zip(names, counts.tolist())), dict(zip(names, heat(counts).tolist())),
+                self.matrix.category_totals(counts))
+
+    def tinted(self, surface, key, t, color=HEAT_COLOR, strength=TINT_STRENGTH):
+        """copy of surface blended towards color by t (quantized into BUCKETS steps), cached per key"""
+        bucket = round(t * (BUCKETS - 1))
+        cache_key = (key, bucket, color)
+        if cache_key not in self._tinted:
+            tinted = surface.copy()
+            a = strength * bucket / (BUCKETS - 1)
+            rgb = pygame.surfarray.pixels3d(tinted)
+            rgb[:] = (rgb * (1 - a) + np.asarray(color) * a).astype(np.uint8)
+            del rgb  # Surface wieder freigeben
+            self._tinted[cache_key] = tinted
+        return self._tinted[cache_key]
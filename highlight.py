@@ -0,0 +1,16 @@
+"""Change sets of highlight updates, shared by Landscape.apply_highlight and its listeners (static_render)."""
+
+
+def highlight_change(names, previous, all_names):
+    """(changed, change) for highlighting exactly names
+
+    previous is the set highlighted before, or None if the state of the tiles
+    is unknown (at start, after show_labels). Then every tile is set again and
+    change reports all tiles that are not highlighted as removed, so listeners
+    redraw them too. changed are the names whose tile and label must be set,
+    change is {"added": ..., "removed": ...}.
+    """
+    if previous is None:
+        changed = set(all_names)
+        return changed, {"added": set(names), "removed": changed - names}
+    return names ^ previous, {"added": names - previous, "removed": previous - names}
@@ -0,0 +1,141 @@
+"""Merges several survey rounds into one projects json.
+
+    python ingest.py results1.xlsx results-survey_secondround.xlsx responses.json --out all_results_merged.json
+
+Every source is parsed in its own worker process: survey workbooks (either
+layout, through parse_cache), LimeSurvey responses.json exports and existing
+all_results_*.json files. Projects are merged by acronym (case and
+whitespace insensitive, the project name if there is no acronym). Precedence:
+a later source on the command line replaces the whole entry of an earlier
+one, within a source the later response wins. The output is the shape read
+by Landscape.set_project_keywords_from_file.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ACRONYM_MARKER = "[Project Acronym]"
+NAME_MARKER = "[Project Name]"
+DESCRIPTION_MARKER = "Project description"
+DELIVERABLE_TITLE_MARKER = "[Title of Deliverable"
+DELIVERABLE_CONTENT_MARKER = "Content of deliverable]"
+
+
+def is_missing(value):
+    return value is None or value != value or (isinstance(value, str) and not value.strip())
+
+
+def text(value):
+    return None if is_missing(value) else str(value).strip()
+
+
+def field(metadata, marker):
+    """first non-empty metadata value whose question contains marker"""
+    for question, value in metadata.items():
+        if isinstance(question, str) and marker in question and not is_missing(value):
+            return text(value)
+    return None
+
+
+def present_keywords(entry):
+    """ticked keywords followed by the free text OTHER answers, like in the all_results files"""
+    labels = [label for label, kw in entry["keywords"].items() if kw["present"]]
+    return labels + [other for other in dict.fromkeys(entry.get("other", [])) if other not in labels]
+
+
+def to_result(project):
+    """parsed survey project (parse.extract_projects) -> all_results entry, None for empty responses"""
+    metadata = project["metadata"]
+    # die Zeilen 7/8 der Arbeitsblätter sind nicht in jeder Runde Name/Akronym, daher über die Frage suchen
+    acronym = field(metadata, ACRONYM_MARKER) or field(metadata, NAME_MARKER)
+    if acronym is None:
+        return None
+    deliverables = []
+    for deliverable in project["deliverables"]:
+        name = field(deliverable["metadata"], DELIVERABLE_TITLE_MARKER)
+        keywords = present_keywords(deliverable)
+        if name is None and not keywords:
+            continue
+        # all_results schreibt fehlende Inhalte als "null"
+        deliverables.append({"name": name, "description": field(deliverable["metadata"], DELIVERABLE_CONTENT_MARKER) or "null",
+                             "keywords": keywords})
+    return {
+        "project": acronym,
+        "description": field(metadata, DESCRIPTION_MARKER) or "null",
+        "keywords": present_keywords(project),
+        "deliverables": deliverables,
+    }
+
+
+def read_source(path):
+    """all_results entries of one workbook or json file, in source order"""
+    path = Path(path)
+    if path.suffix.lower() in (".xlsx", ".xls"):
+        from parse_cache import load_projects
+        parsed = load_projects(path)
+    elif path.suffix.lower() == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(1 << 12).lstrip()
+        if head.startswith("["):
+            # schon im all_results Format
+            with open(path, "r", encoding="utf-8") as f:
+                return [p for p in json.load(f) if not is_missing(p.get("project"))]
+        from parse import iter_projects_from_responses
+        parsed = iter_projects_from_responses(path)
+    else:
+        raise ValueError(f"unsupported source {path}")
+    return [result for result in map(to_result, parsed) if result is not None]
+
+
+def merge_key(acronym):
+    return " ".join(str(acronym).split()).casefold()
+
+
+def merge(sources):
+    """[(source, entries), ...] in precedence order -> (merged entries, {key: [sources]} of keys in several sources)"""
+    merged, seen = {}, {}
+    for source, entries in sources:
+        for entry in entries:
+            key = merge_key(entry["project"])
+            sources_of_key = seen.setdefault(key, [])
+            if str(source) not in sources_of_key:
+                sources_of_key.append(str(source))
+            # dict behält die Position des ersten Auftretens, der Inhalt kommt von der letzten Quelle
+            merged[key] = entry
+    duplicates = {key: names for key, names in seen.items() if len(names) > 1}
+    return list(merged.values()), duplicates
+
+
+def ingest(paths, workers=None):
+    """parses paths in parallel and merges them, later paths take precedence"""
+    paths = [Path(p) for p in paths]
+    workers = min(workers or os.cpu_count() or 1, len(paths)) or 1
+    if workers == 1:
+        results = [read_source(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(read_source, paths))
+    return merge(zip(paths, results))
+
+
+def write_results(entries, filename):
+    tmp = Path(filename).with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=4)
+    tmp.replace(filename)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse survey rounds in parallel and merge them by project acronym")
+    parser.add_argument("sources", nargs="+", help="workbooks and json files, later ones take precedence")
+    parser.add_argument("--out", default="all_results_merged.json")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    entries, duplicates = ingest(args.sources, args.workers)
+    for key, sources in duplicates.items():
+        print(f"{key}: in {', '.join(sources)}, using {sources[-1]}")
+    write_results(entries, args.out)
+    print(f"wrote {len(entries)} projects from {len(args.sources)} sources to {args.out}")
@@ -0,0 +1,131 @@
+"""Frame times and hot path timings for the engine, without an external profiler.
+
+FrameProfiler.attach(engine) records the time between frames (rolling window),
+how many renderables of each layer are visible, and spans of methods decorated
+with @timed. The overlay label shows fps, p50/p95/p99 and the slowest recent
+callbacks; export_trace writes Chrome trace event json (open in
+chrome://tracing or https://ui.perfetto.dev).
+"""
+import json
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+
+TRACE_DIR = Path("traces")
+
+
+def _us(seconds):
+    return round(seconds * 1e6, 1)
+
+
+class FrameProfiler:
+    def __init__(self, window=600, max_events=50000, refresh=0.5, min_span=5e-5):
+        self.frame_times = deque(maxlen=window)   # Sekunden zwischen zwei Frames
+        self.events = deque(maxlen=max_events)    # Chrome trace events
+        self.span_stats = defaultdict(lambda: deque(maxlen=window))
+        self.layers = {}                          # layer -> registrierte Renderables
+        self.refresh = refresh
+        self.min_span = min_span                  # kürzere Spans (z.B. Callbacks ohne Arbeit) verwerfen
+        self.overlay = None
+        self.origin = time.perf_counter()
+        self._last_frame = None
+        self._last_refresh = 0.0
+
+    def attach(self, engine):
+        """counts renderables per layer and records a frame on every engine callback"""
+        add_to_layer = engine.add_to_layer
+
+        def counting_add_to_layer(layer, *renderables):
+            self.layers.setdefault(layer, []).extend(renderables)
+            return add_to_layer(layer, *renderables)
+
+        engine.add_to_layer = counting_add_to_layer
+        engine.add_callback(self.tick)
+        return self
+
+    def tick(self, *args):
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            duration = now - self._last_frame
+            self.frame_times.append(duration)
+            self.events.append({"name": "frame", "ph": "X", "pid": 0, "tid": 0,
+                                "ts": _us(self._last_frame - self.origin), "dur": _us(duration)})
+        self._last_frame = now
+        # Zählen und Text setzen nur ein paar Mal pro Sekunde, nicht in jedem Frame
+        if now - self._last_refresh >= self.refresh:
+            self._last_refresh = now
+            self.events.append({"name": "renderables", "ph": "C", "pid": 0, "tid": 0,
+                                "ts": _us(now - self.origin), "args": self.visible_per_layer()})
+            if self.overlay is not None and self.overlay.visible:
+                self.overlay.text = self.summary_text()
+
+    def span(self, name, start, duration):
+        if duration < self.min_span:
+            return
+        self.span_stats[name].append(duration)
+        self.events.append({"name": name, "ph": "X", "pid": 0, "tid": 1, "cat": "callback",
+                            "ts": _us(start - self.origin), "dur": _us(duration)})
+
+    def visible_per_layer(self):
+        return {layer: sum(1 for r in renderables if getattr(r, "visible", True))
+                for layer, renderables in self.layers.items()}
+
+    def percentiles(self, q=(50, 95, 99)):
+        """frame time percentiles in ms"""
+        if not self.frame_times:
+            return dict.fromkeys(q, 0.0)
+        values = np.percentile(np.fromiter(self.frame_times, float), q) * 1000
+        return dict(zip(q, values.tolist()))
+
+    def stats(self):
+        frames = np.fromiter(self.frame_times, float)
+        return {
+            "fps": float(len(frames) / frames.sum()) if len(frames) else 0.0,
+            "frame_ms": {f"p{q}": v for q, v in self.percentiles().items()},
+            "renderables": {layer: {"visible": n, "total": len(self.layers[layer])}
+                            for layer, n in self.visible_per_layer().items()},
+            "callbacks_ms": {name: {"last": d[-1] * 1000, "max": max(d) * 1000, "n": len(d)}
+                             for name, d in self.span_stats.items() if d},
+        }
+
+    def summary_text(self):
+        s = self.stats()
+        p = s["frame_ms"]
+        lines = [f"{s['fps']:5.1f} fps   p50 {p['p50']:5.1f}  p95 {p['p95']:5.1f}  p99 {p['p99']:5.1f} ms",
+                 "   ".join(f"{layer} {r['visible']}/{r['total']}" for layer, r in s["renderables"].items())]
+        slowest = sorted(s["callbacks_ms"].items(), key=lambda item: -item[1]["max"])[:5]
+        lines += [f"{name} {c['last']:.1f} ms (max {c['max']:.1f}, n={c['n']})" for name, c in slowest]
+        return "\n".join(lines)
+
+    def export_trace(self, filename=None):
+        """writes the recorded events as Chrome trace json, returns the path"""
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        path = Path(filename) if filename else TRACE_DIR / f"trace_{datetime.now():%Y%m%d_%H%M%S}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms",
+                       "otherData": {"stats": self.stats()}}, f)
+        print(f"Trace saved at {path}")
+        return path
+
+
+def timed(name=None):
+    """method decorator: records a span on self.profiler if there is one"""
+    def decorator(method):
+        span_name = name or method.__name__
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            profiler = getattr(self, "profiler", None)
+            if profiler is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                profiler.span(span_name, start, time.perf_counter() - start)
+        return wrapper
+    return decorator
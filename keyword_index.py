@@ -0,0 +1,164 @@
+"""Bitset index over the keyword sets of projects and deliverables.
+
+Each entry (project or deliverable) is stored as a row of uint64 words, one bit
+per keyword, so set queries over thousands of entries are a handful of NumPy
+operations instead of Python loops over keyword lists.
+"""
+import numpy as np
+
+if hasattr(np, "bitwise_count"):
+    def popcount(words):
+        """number of set bits per row"""
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        """number of set bits per row"""
+        as_bytes = np.ascontiguousarray(words).view(np.uint8)
+        return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+class KeywordIndex:
+    def __init__(self, keyword_categories: dict, capacity=64):
+        """keyword_categories maps every keyword name to its category, in bit order"""
+        self.keyword_names = list(keyword_categories)
+        self.keyword_categories = dict(keyword_categories)
+        self.bit = {name: i for i, name in enumerate(self.keyword_names)}
+        self.categories = list(dict.fromkeys(keyword_categories.values()))
+        self.n_words = max(1, -(-len(self.keyword_names) // 64))
+
+        # eine Maske pro Kategorie für die Abdeckungszählung
+        self.category_masks = np.zeros((len(self.categories), self.n_words), dtype=np.uint64)
+        for name, category in keyword_categories.items():
+            self.category_masks[self.categories.index(category)] |= self._mask_row([name])
+
+        self.bits = np.zeros((capacity, self.n_words), dtype=np.uint64)
+        self.is_project = np.zeros(capacity, dtype=bool)
+        self.names = []      # project name or deliverable name per row
+        self.kinds = []      # "project" or "deliverable"
+        self.parents = []    # row of the owning project, -1 for projects
+        self.rows = {}       # (kind, name) -> row
+
+    def __len__(self):
+        return len(self.names)
+
+    def _mask_row(self, keywords):
+        value = 0
+        for kw in keywords:
+            i = self.bit.get(kw)
+            if i is not None:
+                value |= 1 << i
+        return np.array([(value >> (64 * w)) & 0xFFFFFFFFFFFFFFFF for w in range(self.n_words)], dtype=np.uint64)
+
+    def mask(self, keywords):
+        """bitset row for a keyword list; unknown keywords are ignored"""
+        return self._mask_row(keywords)
+
+    def add(self, name, keywords, kind="project", parent=-1):
+        """adds one entry and returns its row"""
+        row = len(self.names)
+        if row == self.bits.shape[0]:
+            self.bits = np.concatenate([self.bits, np.zeros_like(self.bits)])
+            self.is_project = np.concatenate([self.is_project, np.zeros_like(self.is_project)])
+        self.bits[row] = self._mask_row(keywords)
+        self.is_project[row] = kind == "project"
+        self.names.append(name)
+        self.kinds.append(kind)
+        self.parents.append(parent)
+        self.rows[(kind, name)] = row
+        return row
+
+    def add_project(self, project_dict):
+        """adds a project in the all_results json shape together with its deliverables"""
+        row = self.add(project_dict["project"], project_dict.get("keywords", []))
+        for deliverable in project_dict.get("deliverables", []):
+            self.add(deliverable.get("name"), deliverable.get("keywords", []), kind="deliverable", parent=row)
+        return row
+
+    @classmethod
+    def from_projects(cls, projects, keyword_categories: dict):
+        index = cls(keyword_categories, capacity=max(64, len(projects)))
+        for project in projects:
+            index.add_project(project)
+        return index
+
+    def unpack(self, rows):
+        """(len(rows), n_keywords) uint8 0/1 matrix of the given rows"""
+        as_bytes = self.bits[rows].astype("<u8").view(np.uint8)
+        return np.unpackbits(as_bytes, axis=1, bitorder="little")[:, :len(self.keyword_names)]
+
+    def keywords(self, row):
+        """keyword names set in row"""
+        words = self.bits[row]
+        return [name for name, i in self.bit.items() if int(words[i // 64]) >> (i % 64) & 1]
+
+    def _selection(self, kind):
+        bits = self.bits[:len(self.names)]
+        if kind is None:
+            return np.arange(len(self.names)), bits
+        selected = self.is_project[:len(self.names)]
+        rows = np.flatnonzero(selected if kind == "project" else ~selected)
+        return rows, bits[rows]
+
+    def covering(self, keyword, kind="project"):
+        """names of all entries that contain keyword"""
+        return self.covering_all([keyword], kind)
+
+    def covering_all(self, keywords, kind="project"):
+        """names of all entries that contain every keyword in keywords"""
+        return [self.names[r] for r in self.rows_covering_all(keywords, kind)]
+
+    def covering_any(self, keywords, kind="project"):
+        return [self.names[r] for r in self.rows_covering_any(keywords, kind)]
+
+    def rows_covering_all(self, keywords, kind="project"):
+        """rows containing every keyword; none for an empty query or one with a keyword not in the index"""
+        rows, bits = self._selection(kind)
+        keywords = list(keywords)
+        # eine leere Maske würde sonst auf jede Zeile passen
+        if not keywords or any(kw not in self.bit for kw in keywords):
+            return rows[:0]
+        query = self.mask(keywords)
+        return rows[np.all((bits & query) == query, axis=1)]
+
+    def rows_covering_any(self, keywords, kind="project"):
+        """rows containing at least one keyword; unknown keywords match nothing"""
+        query = self.mask(keywords)
+        rows, bits = self._selection(kind)
+        return rows[np.any((bits & query) != 0, axis=1)]
+
+    def jaccard(self, query_bits, kind="project"):
+        """(rows, similarity) of the query bitset against all entries of kind"""
+        rows, bits = self._selection(kind)
+        inter = popcount(bits & query_bits)
+        union = popcount(bits | query_bits)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sim = np.where(union > 0, inter / union, 0.0)
+        return rows, sim
+
+    def top_k(self, keywords=None, k=5, kind="project", row=None):
+        """k nearest entries by Jaccard similarity as (name, similarity) tuples
+
+        query either by a keyword list or by the row of an existing entry, which is excluded from the result
+        """
+        query = self.bits[row] if row is not None else self.mask(keywords or [])
+        rows, sim = self.jaccard(query, kind)
+        if row is not None:
+            keep = rows != row
+            rows, sim = rows[keep], sim[keep]
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        best = np.argpartition(-sim, k - 1)[:k]
+        best = best[np.argsort(-sim[best], kind="stable")]
+        return [(self.names[rows[i]], float(sim[i])) for i in best]
+
+    def category_coverage(self, kind="project"):
+        """(entries × categories) array with the number of keywords each entry covers per category"""
+        _, bits = self._selection(kind)
+        return popcount(bits[:, None, :] & self.category_masks[None, :, :])
+
+    def category_totals(self, kind="project"):
+        """number of entries covering at least one keyword, per category"""
+        return dict(zip(self.categories, (self.category_coverage(kind) > 0).sum(axis=0).tolist()))
@@ -0,0 +1,165 @@
+"""Tile layouts as cached NumPy position tables.
+
+A layout is a function (anchor, n) -> (n, 2) array of tile positions for one
+category, registered under a name. compute_layout places all categories of an
+asset set, resolves collisions between categories and caches the result per
+asset set, layout name and anchors, so switching layouts is a dict lookup.
+Layouts registered with per_category=False place all tiles at once (see
+cooccurrence.py).
+"""
+import numpy as np
+
+LAYOUTS = {}
+_whole_layouts = set()
+_cache = {}
+
+PESTEL_ANCHORS = {
+    "Political": (-4, 2.5),
+    "Spatial": (-1, 1),
+    "Economic": (-1, 4),
+    "Social": (2, 2.5),
+    "Legal": (-4, -0.5),
+    "Environmental": (2, -0.5),
+    "Technological": (-1, -2),
+    "Process+Methods": (2.5, -4),
+}
+
+LINE_ANCHORS = {
+    "Economic": (0, 0),
+    "Legal": (2, -2),
+    "Social": (4, -4),
+    "Spatial": (6, -6),
+    "Process+Methods": (8, -8),
+    "Environmental": (10, -10),
+    "Political": (12, -12),
+    "Technological": (14, -14),
+}
+
+LAYOUT_ANCHORS = {
+    "pestel": PESTEL_ANCHORS,
+    "line": LINE_ANCHORS,
+    "cooccurrence": {},  # Anker ergeben sich aus dem Layout
+}
+
+# Lage von Kachel, Label und Überschriften in Weltkoordinaten
+TILE_CENTER = (0.5, 0.5)     # Tile.pos ist die Ecke, gezeichnet wird um die Mitte
+LABEL_OFFSET = (0.75, 0)     # Label rechts neben seiner Kachel
+HEADER_OFFSET = (-1, -1)     # Kategorieüberschrift relativ zum Anker
+HEADING_POS = (-9, 3)        # Projekttitel, oben links im pestel-Layout
+
+# die ursprünglichen 14 Plätze von get_positions_around, relativ zum Anker
+_AROUND = np.array([(x, y) for x in (-1, 0, 1) for y in (-1, 0, 1)]
+                   + [(0, 2), (1, 2), (2, 2), (2, 1), (2, 0)], dtype=float)
+
+
+def register_layout(name, pos_func, per_category=True):
+    """pos_func(anchor, n) -> (n, 2) array; the same name replaces an earlier layout
+
+    with per_category=False pos_func(categorized_items, anchors) -> ((n, 2) array, anchors)
+    places all items at once and returns the anchors of the categories
+    """
+    LAYOUTS[name] = pos_func
+    if per_category:
+        _whole_layouts.discard(name)
+    else:
+        _whole_layouts.add(name)
+    for key in [k for k in _cache if k[1] == name]:
+        del _cache[key]
+
+
+def _square_offsets(n):
+    """offsets for n tiles: the 14 original places, then growing squares around them"""
+    if n <= len(_AROUND):
+        return _AROUND[:n]
+    offsets = [_AROUND]
+    taken = {tuple(p) for p in _AROUND}
+    side = 4
+    total = len(_AROUND)
+    while total < n:
+        side += 1
+        coords = np.arange(-1 - (side - 4) // 2, side - 1 - (side - 4) // 2)
+        xx, yy = np.meshgrid(coords, coords, indexing="ij")
+        ring = np.column_stack([xx.ravel(), yy.ravel()]).astype(float)
+        ring = ring[[tuple(p) not in taken for p in ring]]
+        # nächstgelegene zuerst, damit die Gruppe kompakt bleibt
+        ring = ring[np.lexsort((ring[:, 1], ring[:, 0], np.abs(ring - 0.5).max(axis=1)))]
+        taken.update(tuple(p) for p in ring)
+        offsets.append(ring)
+        total += len(ring)
+    return np.concatenate(offsets)[:n]
+
+
+def positions_around(anchor, n):
+    return np.asarray(anchor, dtype=float) + _square_offsets(n)
+
+
+def line_positions(anchor, n, offset=(1, 1)):
+    i = np.arange(n)
+    ox, oy = offset
+    x = anchor[0] + (ox * i) % 5 + i // 5
+    y = anchor[1] + (oy * i) % 5
+    return np.column_stack([x, y]).astype(float)
+
+
+register_layout("pestel", positions_around)
+register_layout("line", line_positions)
+
+
+def resolve_collisions(positions):
+    """moves tiles that share a cell with an earlier tile to the nearest free cell"""
+    _, first, counts = np.unique(positions, axis=0, return_index=True, return_counts=True)
+    if (counts == 1).all():
+        return positions
+    positions = positions.copy()
+    keep = np.zeros(len(positions), dtype=bool)
+    keep[first] = True
+    taken = {tuple(p) for p in positions[keep]}
+    search = _square_offsets(64).tolist()
+    for i in np.flatnonzero(~keep):
+        x, y = positions[i]
+        while True:
+            free = next(((x + dx, y + dy) for dx, dy in search if (x + dx, y + dy) not in taken), None)
+            if free is not None:
+                break
+            search = _square_offsets(4 * len(search)).tolist()
+        positions[i] = free
+        taken.add(free)
+    return positions
+
+
+def _missing_anchor(anchors):
+    # Kategorie ohne Anker: rechts neben alle anderen
+    xs = [a[0] for a in anchors.values()] or [0]
+    return (max(xs) + 4, 0)
+
+
+def compute_layout(categorized_items, name, anchors):
+    """returns (names, positions, anchors) for all items of {category: {name: ...}}; cached
+
+    positions is an (n, 2) array in the order of names. Within a category the
+    first item gets the last position (as create_layout always did). anchors
+    includes the ones made up for categories without an anchor.
+    """
+    key = (tuple((cat, tuple(items)) for cat, items in categorized_items.items()),
+           name, tuple(sorted((cat, tuple(a)) for cat, a in anchors.items())))
+    if key in _cache:
+        return _cache[key]
+    if name not in LAYOUTS:
+        raise ValueError(f"Invalid layout: {name}")
+    pos_func = LAYOUTS[name]
+    anchors = dict(anchors)
+    names, blocks = [], []
+    if name in _whole_layouts:
+        names = [item for items in categorized_items.values() for item in items]
+        positions, anchors = pos_func(categorized_items, anchors)
+        blocks = [np.asarray(positions, dtype=float).reshape(-1, 2)] if names else []
+    else:
+        for catname, items in categorized_items.items():
+            if catname not in anchors:
+                anchors[catname] = _missing_anchor(anchors)
+            blocks.append(pos_func(anchors[catname], len(items))[::-1])
+            names.extend(items)
+    positions = resolve_collisions(np.concatenate(blocks)) if blocks else np.zeros((0, 2))
+    positions.setflags(write=False)
+    _cache[key] = (names, positions, anchors)
+    return _cache[key]
@@ -0,0 +1,226 @@
+"""Compact Project/Deliverable objects instead of nested dicts.
+
+Keyword presence is one int bitmask per entry, the bits are assigned by a
+KeywordSchema that is shared by all entries (interned category strings, one
+bit per (category, label)). The ordered set of keywords a survey entry was
+asked about is a tuple of bits that is shared as well, so a deliverable no
+longer carries its own 61 {"category", "present"} dicts.
+
+Both dict shapes round-trip losslessly through from_dict/to_dict:
+
+    parsed survey entries (parse.extract_projects)
+        {"name", "acronym", "metadata", "keywords": {label: {"category", "present"}}, "other", "deliverables"}
+    all_results json (Landscape.set_project_keywords_from_file)
+        {"project", "description", "keywords": [label, ...], "deliverables": [{"name", "description", "keywords"}]}
+"""
+import json
+import sys
+
+
+def title_of(value, fallback):
+    """titles from the survey can be NaN (empty Excel cell) or missing, then fallback is used"""
+    return value if isinstance(value, str) and value.strip() else fallback
+
+
+class KeywordSchema:
+    """bit numbers of keywords, grows when unknown keywords show up"""
+
+    def __init__(self, keywords=()):
+        self.labels = []
+        self.categories = []
+        self.bits = {}          # (category, label) -> bit
+        self.by_label = {}      # label -> erstes Bit mit diesem Label
+        self._templates = {}
+        for label, category in keywords:
+            self.bit(label, category)
+
+    @classmethod
+    def from_assets(cls, categorized):
+        """schema in tile order from {category: {name: path}} (get_categorized_assets)"""
+        return cls((name, category) for category, names in categorized.items() for name in names)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def bit(self, label, category=None):
+        key = (category, label)
+        if key not in self.bits:
+            if category is None and label in self.by_label:
+                return self.by_label[label]
+            i = len(self.labels)
+            self.bits[key] = i
+            self.labels.append(sys.intern(label) if isinstance(label, str) else label)
+            self.categories.append(sys.intern(category) if isinstance(category, str) else category)
+            self.by_label.setdefault(label, i)
+        return self.bits[key]
+
+    def template(self, bits):
+        """one shared tuple per distinct keyword layout"""
+        bits = tuple(bits)
+        return self._templates.setdefault(bits, bits)
+
+    def mask(self, labels):
+        value = 0
+        for label in labels:
+            value |= 1 << self.bit(label)
+        return value
+
+    def labels_of(self, mask):
+        """labels of the set bits in bit order"""
+        labels = []
+        while mask:
+            low = mask & -mask
+            labels.append(self.labels[low.bit_length() - 1])
+            mask ^= low
+        return labels
+
+
+default_schema = KeywordSchema()
+_key_orders = {}
+
+
+class Entry:
+    __slots__ = ("schema", "mask", "template", "keyword_order", "description", "metadata", "extra", "_keys")
+    default_keys = ()
+
+    def __init__(self, schema=None):
+        self.schema = schema if schema is not None else default_schema  # ein leeres Schema ist falsy (__len__)
+        self.mask = 0
+        self.template = None       # Bits der abgefragten Keywords (parsed), None für all_results
+        self.keyword_order = None  # Labels nur, wenn sie nicht in Bit-Reihenfolge waren
+        self.description = None
+        self.metadata = None
+        self.extra = None          # sonstige Schlüssel des dicts
+        self._keys = self.default_keys
+
+    @property
+    def keywords(self):
+        """labels of the present keywords"""
+        if isinstance(self.keyword_order, dict):
+            return [label for label, kw in self.keyword_order.items() if kw["present"]]
+        if self.keyword_order is not None:
+            return list(self.keyword_order)
+        if self.template is not None:
+            return [self.schema.labels[b] for b in self.template if self.mask >> b & 1]
+        return self.schema.labels_of(self.mask)
+
+    def has(self, label):
+        bit = self.schema.by_label.get(label)
+        return bit is not None and bool(self.mask >> bit & 1)
+
+    def _read_keywords(self, keywords):
+        schema = self.schema
+        if isinstance(keywords, dict):
+            bits = [schema.bit(label, kw["category"]) for label, kw in keywords.items()]
+            self.template = schema.template(bits)
+            self.mask = sum(1 << b for b, kw in zip(bits, keywords.values()) if kw["present"] is True)
+            if any(tuple(kw) != ("category", "present") or not isinstance(kw["present"], bool) for kw in keywords.values()):
+                self.keyword_order = keywords  # exotische Werte: dict unverändert behalten
+        else:
+            self.mask = schema.mask(keywords)
+            if schema.labels_of(self.mask) != list(keywords):
+                self.keyword_order = tuple(keywords)
+
+    def _write_keywords(self):
+        if self.template is None:
+            return self.keywords
+        if isinstance(self.keyword_order, dict):
+            return self.keyword_order
+        labels, categories = self.schema.labels, self.schema.categories
+        return {labels[b]: {"category": categories[b], "present": bool(self.mask >> b & 1)} for b in self.template}
+
+    def _known_keys(self):
+        return ()
+
+    def _read(self, d):
+        self._read_keywords(d.get("keywords", []))
+        self.description = d.get("description")
+        self.metadata = d.get("metadata")
+        extra = {k: v for k, v in d.items() if k not in self._known_keys()}
+        self.extra = extra or None
+        # Schlüssel und ihre Reihenfolge, ein Tupel pro Variante
+        keys = tuple(d)
+        self._keys = _key_orders.setdefault(keys, keys)
+
+    def _write(self, values):
+        return {k: values[k] if k in values else self.extra[k] for k in self._keys}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.title!r}, {len(self.keywords)} keywords)"
+
+
+class Deliverable(Entry):
+    __slots__ = ("name",)
+    default_keys = ("name", "description", "keywords")
+
+    def __init__(self, name=None, keywords=(), schema=None):
+        super().__init__(schema)
+        self.name = name
+        self._read_keywords(list(keywords))
+
+    @property
+    def title(self):
+        return self.name
+
+    def _known_keys(self):
+        return ("name", "description", "metadata", "keywords")
+
+    @classmethod
+    def from_dict(cls, d, schema=None):
+        deliverable = cls(schema=schema)
+        deliverable.name = d.get("name")
+        deliverable._read(d)
+        return deliverable
+
+    def to_dict(self):
+        return self._write({"name": self.name, "description": self.description, "metadata": self.metadata,
+                            "keywords": self._write_keywords()})
+
+
+class Project(Entry):
+    __slots__ = ("project", "name", "acronym", "deliverables")
+    default_keys = ("project", "description", "keywords", "deliverables")
+
+    def __init__(self, project=None, keywords=(), deliverables=(), schema=None):
+        super().__init__(schema)
+        self.project = project
+        self.name = None
+        self.acronym = None
+        self.deliverables = list(deliverables)
+        self._read_keywords(list(keywords))
+
+    @property
+    def title(self):
+        return self.project or self.acronym or self.name
+
+    def _known_keys(self):
+        return ("project", "name", "acronym", "description", "metadata", "keywords", "deliverables")
+
+    @classmethod
+    def from_dict(cls, d, schema=None):
+        """from a parsed survey project or an all_results entry"""
+        project = cls(schema=schema)
+        project.project = d.get("project")
+        project.name = d.get("name")
+        project.acronym = d.get("acronym")
+        project._read(d)
+        project.deliverables = [Deliverable.from_dict(x, project.schema) for x in d.get("deliverables", [])]
+        return project
+
+    def to_dict(self):
+        """the dict this project was created from"""
+        return self._write({"project": self.project, "name": self.name, "acronym": self.acronym,
+                            "description": self.description, "metadata": self.metadata,
+                            "keywords": self._write_keywords(),
+                            "deliverables": [d.to_dict() for d in self.deliverables]})
+
+
+def load_projects(filename, schema=None):
+    """Projects from an all_results json file"""
+    with open(filename, "r", encoding="utf-8") as f:
+        return [Project.from_dict(d, schema) for d in json.load(f)]
+
+
+def dump_projects(projects, filename):
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump([p.to_dict() for p in projects], f, indent=4)
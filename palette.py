@@ -0,0 +1,35 @@
+"""Category colours and text sizes of the landscape, shared by Landscape, the kiosk view and the SVG export."""
+
+BACKGROUND = (230, 221, 204)
+
+# Schriftgrößen der Labels bei zoom 1
+LABEL_SIZE = 28
+HEADER_SIZE = 36
+HEADING_SIZE = 128
+# Projekttitel weiß mit schwarzer Umrandung
+HEADING_COLOR = (255, 255, 255)
+HEADING_OUTLINE = (0, 0, 0)
+
+# Kachelhintergrund und Labeltext
+BACKGROUND_COLORS = {
+    "Economic": (224, 233, 198),
+    "Environmental": (161, 219, 246),
+    "Legal": (243, 200, 192),
+    "Political": (246, 219, 184),
+    "Social": (199, 212, 235),
+    "Technological": (221, 213, 170),
+    "Spatial": (235, 199, 218),
+    "Process+Methods": (184, 222, 212),
+}
+
+# Umrandung der Labels und Überschriften
+COLORS = {
+    "Economic": (58, 73, 42),
+    "Environmental": (34, 75, 94),
+    "Legal": (83, 43, 38),
+    "Political": (81, 58, 28),
+    "Social": (43, 54, 74),
+    "Technological": (63, 56, 15),
+    "Spatial": (74, 42, 60),
+    "Process+Methods": (31, 62, 54),
+}
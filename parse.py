@@ -1,3 +1,5 @@
+import json
+import sys
 import pandas as pd
 import re
 # Definition der korrekten Bereiche (basierend auf Benutzerinfo)
@@ -6,6 +8,9 @@ project_kw_rows = range(13, 75)      # Projekt-Keywords: Zeile 15–76 (Index 13
 deliverable_meta_rows = 3           # Immer 3 Metazeilen pro Deliverable
 deliverable_kw_rows = 61            # Danach 61 Zeilen mit Keywords
 first_deliverable_start = 75        # Erste Deliverable beginnt in Zeile 77 (Index 76)
+# bei jeder Änderung an den Bereichen oder an der Extraktion erhöhen, macht parse_cache ungültig
+PARSER_VERSION = 2
+other_marker = "OTHER "             # Freitext-Keywords ("OTHER  If none of the keywords above apply ... [Keyword 1]")
 
 def create_kw_dict(labels, values):
     keywords = dict()
@@ -21,6 +26,13 @@ def create_kw_dict(labels, values):
     return keywords
 
 
+def other_answers(questions, answers):
+    """free text answers to the OTHER keyword questions, in question order"""
+    return [str(answer).strip() for question, answer in zip(questions, answers)
+            if isinstance(question, str) and question.startswith(other_marker)
+            and isinstance(answer, str) and answer.strip()]
+
+
 # Extraktions-Funktion
 def extract_projects_for_visualization(df):
     projects_data = []
@@ -39,6 +51,7 @@ def extract_projects_for_visualization(df):
         kw_labels = df.iloc[project_kw_rows, 0].values
         kw_values = df.iloc[project_kw_rows, col].fillna("").astype(str).values
         project["keywords"] = create_kw_dict(kw_labels, kw_values)
+        project["other"] = other_answers(kw_labels, df.iloc[project_kw_rows, col].values)
 
         # Deliverables
         deliverables = []
@@ -57,7 +70,8 @@ def extract_projects_for_visualization(df):
 
             deliverables.append({
                 "metadata": d_metadata,
-                "keywords": create_kw_dict(d_kw_labels, d_kw_values)
+                "keywords": create_kw_dict(d_kw_labels, d_kw_values),
+                "other": other_answers(d_kw_labels, df.iloc[row+deliverable_meta_rows:row+deliverable_meta_rows+deliverable_kw_rows, col].values),
             })
 
             row += deliverable_meta_rows + deliverable_kw_rows  # Nächster Block
@@ -68,7 +82,198 @@ def extract_projects_for_visualization(df):
     return projects_data
 
 
+# Vektorisierte Variante: Fragespalte einmal parsen, Antworten als bool-Array
+deliverable_block_rows = deliverable_meta_rows + deliverable_kw_rows
+
+
+def parse_question_column(questions):
+    """returns (categories, labels) for every row of the question column, None where no keyword"""
+    questions = pd.Series(questions, dtype=object)
+    categories = questions.str.extract(r"^(.*?)\s+Keywords", expand=False).str.strip().str.capitalize()
+    labels = questions.str.extract(r"\[(.*?)\]", expand=False).str.strip()
+    valid = categories.notna() & labels.notna()
+    categories = categories.where(valid, None).tolist()
+    labels = labels.where(valid, None).tolist()
+    return categories, labels
+
+
+def count_deliverable_blocks(n_rows):
+    return max(0, (n_rows - first_deliverable_start) // deliverable_block_rows)
+
+
+def deliverable_keyword_array(present):
+    """reshapes a (rows × projects) answer mask into a (projects × deliverables × keywords) bool array"""
+    n_blocks = count_deliverable_blocks(present.shape[0])
+    stop = first_deliverable_start + n_blocks * deliverable_block_rows
+    blocks = present[first_deliverable_start:stop].reshape(n_blocks, deliverable_block_rows, present.shape[1])
+    return blocks[:, deliverable_meta_rows:, :].transpose(2, 0, 1)
+
+
+def keyword_template(categories, labels, rows):
+    """positions (relative to rows), labels and categories of the keyword rows in rows"""
+    positions, kw_labels, kw_categories = [], [], []
+    for i, row in enumerate(rows):
+        if labels[row] is not None:
+            positions.append(i)
+            kw_labels.append(labels[row])
+            kw_categories.append(categories[row])
+    return positions, kw_labels, kw_categories
+
+
+def build_kw_dict(template, flags):
+    positions, labels, categories = template
+    return {label: {"category": category, "present": flags[i]}
+            for i, label, category in zip(positions, labels, categories)}
+
+
+def extract_projects_vectorized(df):
+    """Same output as extract_projects_for_visualization, built from one bool array instead of per-block df.iloc calls"""
+    values = df.to_numpy(dtype=object)
+    questions = values[:, 0]
+    categories, labels = parse_question_column(questions)
+    present = values[:, 1:] == "Yes"
+
+    project_template = keyword_template(categories, labels, project_kw_rows)
+    project_flags = present[project_kw_rows].T.tolist()
+
+    deliverable_flags = deliverable_keyword_array(present)
+    block_starts = [first_deliverable_start + b * deliverable_block_rows for b in range(deliverable_flags.shape[1])]
+    block_templates = [keyword_template(categories, labels, range(s + deliverable_meta_rows, s + deliverable_block_rows))
+                       for s in block_starts]
+    deliverable_flags = deliverable_flags.tolist()
+
+    meta_keys = questions[meta_rows]
+    projects_data = []
+    for p in range(values.shape[1] - 1):
+        col = p + 1
+        deliverables = []
+        for b, start in enumerate(block_starts):
+            deliverables.append({
+                "metadata": dict(zip(questions[start:start + deliverable_meta_rows],
+                                     values[start:start + deliverable_meta_rows, col])),
+                "keywords": build_kw_dict(block_templates[b], deliverable_flags[p][b]),
+                "other": other_answers(questions[start + deliverable_meta_rows:start + deliverable_block_rows],
+                                       values[start + deliverable_meta_rows:start + deliverable_block_rows, col]),
+            })
+        projects_data.append({
+            "name": values[7, col],
+            "acronym": values[8, col],
+            "metadata": dict(zip(meta_keys, values[meta_rows, col])),
+            "keywords": build_kw_dict(project_template, project_flags[p]),
+            "other": other_answers(questions[project_kw_rows], values[project_kw_rows, col]),
+            "deliverables": deliverables,
+        })
+    return projects_data
+
+
+
+
+# Streaming-Import des LimeSurvey-Exports responses.json ({"responses": [...]})
+system_fields = {"Response ID", "Date submitted", "Last page", "Start language", "Seed",
+                 "Date started", "Date last action"}
+deliverable_title_marker = "[Title of Deliverable"
+
+
+def _interned_pairs(pairs):
+    # Fragetexte wiederholen sich in jeder Antwort, nur eine Kopie behalten;
+    # Liste statt dict, damit doppelte Schlüssel (mehrere Deliverables) erhalten bleiben
+    return [(sys.intern(k), v) for k, v in pairs]
+
+
+def iter_responses(filename, chunk_size=1 << 16):
+    """yields the responses of a LimeSurvey json export one at a time as a list of (question, answer) pairs"""
+    decoder = json.JSONDecoder(object_pairs_hook=_interned_pairs)
+    with open(filename, "r", encoding="utf-8") as f:
+        buf = ""
+        while '"responses"' not in buf or "[" not in buf[buf.index('"responses"'):]:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            buf += chunk
+        pos = buf.index("[", buf.index('"responses"')) + 1
+        need_more = False
+        while True:
+            if need_more or pos >= len(buf):
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    # Dateiende vor der schließenden Klammer: abgeschnittene Datei
+                    raise ValueError(f"unexpected end of {filename}")
+                buf = buf[pos:] + chunk
+                pos = 0
+                need_more = False
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                response, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                need_more = True  # Antwort ragt über das Ende des Puffers hinaus
+                continue
+            yield response
+
+
+_question_cache = {}
+
+
+def parse_question(question):
+    """(category, label) of a keyword question, None otherwise; cached per (interned) question text"""
+    try:
+        return _question_cache[question]
+    except KeyError:
+        pass
+    category_match = re.search(r"^(.*?)\s+Keywords", question)
+    label_match = re.search(r"\[(.*?)\]", question)
+    parsed = None
+    if category_match and label_match:
+        parsed = (sys.intern(category_match.group(1).strip().capitalize()),
+                  sys.intern(label_match.group(1).strip()))
+    _question_cache[question] = parsed
+    return parsed
+
+
+def response_to_project(pairs):
+    """converts one response into the structure of extract_projects_for_visualization"""
+    project = {"name": None, "acronym": None, "metadata": {}, "keywords": {}, "other": [], "deliverables": []}
+    metadata, keywords, other = project["metadata"], project["keywords"], project["other"]
+    for question, answer in pairs:
+        if deliverable_title_marker in question:
+            metadata, keywords, other = {}, {}, []
+            project["deliverables"].append({"metadata": metadata, "keywords": keywords, "other": other})
+        parsed = parse_question(question)
+        if parsed is not None:
+            category, label = parsed
+            keywords[label] = {"category": category, "present": answer == "Yes"}
+        elif question.startswith(other_marker):
+            other += other_answers([question], [answer])
+        elif question in system_fields:
+            continue
+        elif project["deliverables"] and len(metadata) >= deliverable_meta_rows:
+            continue
+        else:
+            metadata[question] = answer
+            if question.endswith("[Project Name]"):
+                project["name"] = answer
+            elif question.endswith("[Project Acronym]"):
+                project["acronym"] = answer
+    return project
+
+
+def extract_projects(df):
+    """projects of a survey frame in either layout: one column per project with the questions in
+    column 0 (extract_projects_vectorized), or one row per response with the questions as header"""
+    if any(parse_question(c) for c in df.columns if isinstance(c, str)):
+        columns = df.columns.tolist()
+        return [response_to_project(list(zip(columns, row))) for row in df.itertuples(index=False, name=None)]
+    return extract_projects_vectorized(df)
+
 
+def iter_projects_from_responses(filename):
+    """streams responses.json and yields one parsed project (metadata, keywords, deliverables) at a time"""
+    for pairs in iter_responses(filename):
+        yield response_to_project(pairs)
 
 
 if __name__ == "__main__":
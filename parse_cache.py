@@ -0,0 +1,226 @@
+"""Disk cache for parsed survey workbooks.
+
+    from parse_cache import load_projects
+    projects = load_projects("all_results_may.xlsx")
+
+read_excel (openpyxl) is by far the slowest step of the pipeline. Each
+workbook is keyed by the sha1 of its content, the parser version
+(parse.PARSER_VERSION), the cache format and the pandas version; the parsed
+frame (dictionary-encoded columns) and the extracted project structure are
+stored together in one .npz under cache/workbooks, named after the workbook,
+a hash of its resolved path and the key. Unchanged workbooks are never opened
+with openpyxl again. Warm or clear the cache with
+
+    python parse_cache.py results1.xlsx all_results_may.xlsx [--clear]
+"""
+import argparse
+import hashlib
+import json
+import os
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from catalog import content_hash
+from parse import PARSER_VERSION, extract_projects
+
+CACHE_DIR = Path("cache") / "workbooks"
+CACHE_FORMAT = 1
+# Zelltypen im Frame
+MISSING, STRING, INTEGER, FLOAT, BOOLEAN = range(5)
+
+
+class UncachableFrame(ValueError):
+    pass
+
+
+def cache_key(filename, sheet_name=0):
+    """content hash of the workbook combined with everything that changes the parsed result"""
+    parts = [content_hash(filename), f"parser={PARSER_VERSION}", f"format={CACHE_FORMAT}",
+             f"pandas={pd.__version__}", f"sheet={sheet_name!r}"]
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+
+def source_id(filename):
+    """hash of the resolved path: workbooks with the same name in different folders get their own entries"""
+    return hashlib.sha1(Path(filename).resolve().as_posix().encode()).hexdigest()[:12]
+
+
+def cache_path(filename, key, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"{Path(filename).stem}-{source_id(filename)}-{key[:16]}.npz"
+
+
+def encode_frame(df):
+    """dict of arrays: cell kinds, float values, codes into the unique strings (utf-8 with offsets)"""
+    values = df.to_numpy(dtype=object)
+    kinds = np.full(values.shape, MISSING, dtype=np.uint8)
+    numbers = np.full(values.shape, np.nan)
+    codes = np.full(values.shape, -1, dtype=np.int32)
+    strings = {}
+    for (r, c), value in np.ndenumerate(values):
+        if isinstance(value, str):
+            kinds[r, c] = STRING
+            codes[r, c] = strings.setdefault(value, len(strings))
+        elif isinstance(value, (bool, np.bool_)):
+            kinds[r, c] = BOOLEAN
+            numbers[r, c] = value
+        elif isinstance(value, (int, np.integer)):
+            kinds[r, c] = INTEGER
+            numbers[r, c] = value
+        elif isinstance(value, (float, np.floating)):
+            if not np.isnan(value):
+                kinds[r, c] = FLOAT
+                numbers[r, c] = value
+        elif value is not None and value is not pd.NA:
+            raise UncachableFrame(f"cannot cache cell of type {type(value).__name__}")
+    # ein Puffer plus Offsets statt eines <U-Arrays, das jeden String auf die längste Frage auffüllt
+    encoded = [s.encode() for s in strings]
+    return {
+        "kinds": kinds,
+        "numbers": numbers,
+        "codes": codes,
+        "string_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "string_offsets": np.cumsum([0] + [len(b) for b in encoded], dtype=np.int64),
+    }
+
+
+def decode_strings(data, offsets):
+    raw = data.tobytes()
+    return [raw[a:b].decode() for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def decode_frame(arrays, columns, dtypes):
+    kinds, numbers, codes = arrays["kinds"], arrays["numbers"], arrays["codes"]
+    values = np.full(kinds.shape, np.nan, dtype=object)
+    strings = np.array(decode_strings(arrays["string_data"], arrays["string_offsets"]) + [None], dtype=object)
+    mask = kinds == STRING
+    values[mask] = strings[codes[mask]]
+    mask = kinds == INTEGER
+    values[mask] = numbers[mask].astype(np.int64).astype(object)
+    mask = kinds == FLOAT
+    values[mask] = numbers[mask].astype(object)
+    mask = kinds == BOOLEAN
+    values[mask] = numbers[mask].astype(bool).astype(object)
+    # ein astype pro dtype statt pro Spalte (Exporte mit einer Spalte pro Frage haben hunderte)
+    groups = {}
+    for i, dtype in enumerate(dtypes):
+        groups.setdefault(dtype, []).append(i)
+    parts = [pd.DataFrame(values[:, positions], columns=positions) for positions in groups.values()]
+    parts = [part if dtype == "object" else part.astype(dtype) for dtype, part in zip(groups, parts)]
+    df = pd.concat(parts, axis=1)[list(range(len(columns)))]
+    df.columns = columns
+    return df
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_projects(projects):
+    # Metadaten als Paare: Fragen können NaN sein, json würde daraus den Schlüssel "NaN" machen
+    def metadata(d):
+        return dict(d, metadata=list(d["metadata"].items()))
+
+    encoded = [dict(metadata(p), deliverables=[metadata(d) for d in p["deliverables"]]) for p in projects]
+    return np.frombuffer(json.dumps(encoded, default=_json_default).encode(), dtype=np.uint8)
+
+
+def decode_projects(data):
+    projects = json.loads(data.tobytes().decode())
+    for project in projects:
+        for item in [project] + project["deliverables"]:
+            item["metadata"] = dict(map(tuple, item["metadata"]))
+    return projects
+
+
+def write_entry(path, df, projects, key):
+    meta = {"key": key, "parser": PARSER_VERSION, "format": CACHE_FORMAT,
+            "columns": df.columns.tolist(), "dtypes": [str(t) for t in df.dtypes]}
+    arrays = encode_frame(df)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta, default=_json_default)),
+                     projects=encode_projects(projects), **arrays)
+        # erst vollständig schreiben, dann umbenennen: ein Leser sieht nie einen halben Eintrag
+        tmp.replace(path)
+    except OSError as e:
+        print(f"Could not write workbook cache {path}: {e}")
+        tmp.unlink(missing_ok=True)
+        return
+    # ältere Einträge derselben Datei (andere Version oder anderer Inhalt) entfernen;
+    # das Präfix enthält den Pfad-Hash, Arbeitsmappen aus anderen Ordnern bleiben unberührt
+    source = path.stem.rsplit("-", 1)[0]
+    for old in path.parent.iterdir():
+        if old != path and old.suffix == ".npz" and old.stem.rsplit("-", 1)[0] == source:
+            old.unlink(missing_ok=True)
+
+
+def read_entry(path, key):
+    """(frame, projects) from a cache entry, None if it is missing, stale or broken"""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("key") != key or meta.get("format") != CACHE_FORMAT or meta.get("parser") != PARSER_VERSION:
+                return None
+            df = decode_frame(data, meta["columns"], meta["dtypes"])
+            projects = decode_projects(data["projects"])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, EOFError, zipfile.BadZipFile) as e:
+        print(f"Ignoring broken workbook cache {path}: {e}")
+        # kaputten Eintrag löschen, load_workbook schreibt ihn neu
+        Path(path).unlink(missing_ok=True)
+        return None
+    return df, projects
+
+
+def load_workbook(filename, sheet_name=0, cache_dir=CACHE_DIR, refresh=False):
+    """(frame, projects) of a survey workbook, from the cache if the workbook is unchanged"""
+    key = cache_key(filename, sheet_name)
+    path = cache_path(filename, key, cache_dir)
+    if not refresh:
+        entry = read_entry(path, key)
+        if entry is not None:
+            return entry
+    df = pd.read_excel(filename, sheet_name=sheet_name)
+    projects = extract_projects(df)
+    try:
+        write_entry(path, df, projects, key)
+    except UncachableFrame as e:
+        print(f"Not caching {filename}: {e}")
+    return df, projects
+
+
+def read_workbook(filename, sheet_name=0, cache_dir=CACHE_DIR):
+    """drop-in for pd.read_excel(filename) on survey workbooks"""
+    return load_workbook(filename, sheet_name, cache_dir)[0]
+
+
+def load_projects(filename, sheet_name=0, cache_dir=CACHE_DIR):
+    """parse.extract_projects(pd.read_excel(filename)), cached"""
+    return load_workbook(filename, sheet_name, cache_dir)[1]
+
+
+def clear_cache(cache_dir=CACHE_DIR):
+    for path in Path(cache_dir).glob("*.npz"):
+        path.unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse survey workbooks into the cache")
+    parser.add_argument("workbooks", nargs="*")
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    parser.add_argument("--clear", action="store_true", help="delete all cache entries first")
+    args = parser.parse_args()
+
+    if args.clear:
+        clear_cache(args.cache_dir)
+    for workbook in args.workbooks:
+        df, projects = load_workbook(workbook, cache_dir=args.cache_dir)
+        print(f"{workbook}: {df.shape[0]} rows, {len(projects)} projects")
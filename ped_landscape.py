@@ -3,30 +3,37 @@ import random
 import deengi
 import numpy as np
 import os
+import queue
+import sys
 import json
 from datetime import datetime
+from functools import partial
+
+from atlas import load_atlas, set_tile_image
+from tile_lod import NOT_LOADED, TileImages, choose_levels
+from catalog import get_catalog
+from instrumentation import FrameProfiler, timed
+from text_cache import cached_font
+from heatmap import Heatmap
+from highlight import highlight_change
+from model import Entry, title_of
+from cooccurrence import cooccurrence_layout
+from layouts import (HEADER_OFFSET, HEADING_POS, LABEL_OFFSET, LAYOUT_ANCHORS, LAYOUTS, compute_layout, line_positions,
+                     positions_around, register_layout)
+from camera import CAMERA_CONF
+from palette import BACKGROUND, BACKGROUND_COLORS, COLORS, HEADER_SIZE, HEADING_COLOR, HEADING_OUTLINE, HEADING_SIZE, LABEL_SIZE
+from transitions import Animator
+from screenshots import ScreenshotWriter, safe_filename
 
 IMAGE_FOLDER_PATH = 'assets/img'
+TRANSITION_DURATION = 0.6  # Sekunden für Layout- und Kamerawechsel
+LEVEL_REFRESH_FRAMES = 8   # während einer Transition Kachelstufen nur alle n Frames neu wählen
 
 def get_positions_around(start, n):
-    sx,sy = start
-    positions = []
-    for x in np.arange(sx-1,sx+2):
-        for y in np.arange(sy-1, sy+2):
-            positions.append((x,y))   
-    positions.append((sx,sy+2))
-    positions.append((sx+1,sy+2))
-    positions.append((sx+2,sy+2))
-    positions.append((sx+2,sy+1))
-    positions.append((sx+2,sy))
-    if n > len(positions):
-        raise ValueError(f"only {len(positions)} positions available, {n} requested")
-    return positions[:n]
+    return [tuple(p) for p in positions_around(start, n).tolist()]
 
 def get_line_positions(start, n, offset=(1,1)):
-    sx,sy = start
-    ox, oy = offset
-    return [(sx+ox*i%5+i//5, sy+oy*i%5) for i in range(n)]
+    return [tuple(p) for p in line_positions(start, n, offset).tolist()]
 
 def create_layout(categorized_items, anchors, pos_func):
     layout = {}
@@ -37,22 +44,7 @@ def create_layout(categorized_items, anchors, pos_func):
     return layout
 
 def get_categorized_assets(image_folder_path=None) -> dict:
-    path = Path(image_folder_path or IMAGE_FOLDER_PATH)
-    landscape = {}
-    for category in path.iterdir():
-        if not category.is_dir():
-            print(f"Non categorized file {category} in {path=}")
-            continue
-        
-        landscape[category.name] = {}
-        
-        for tile in category.iterdir():
-            if not tile.is_file() or not tile.suffix.lower() in (".png", ".jpg"):
-                print(f"Non-image file {tile} in {category=}")
-                continue
-            
-            landscape[category.name][tile.name[:-4]] = tile.as_posix()
-    return landscape
+    return get_catalog(image_folder_path or IMAGE_FOLDER_PATH).categorized()
 
 def get_all_assets(categorized_assets):
     flat = {}
@@ -62,69 +54,52 @@ def get_all_assets(categorized_assets):
     return flat
 
 class Landscape:
-    def __init__(self, image_folder_path=IMAGE_FOLDER_PATH, layout="pestel", debug=True):
-        
-        self.background_colors = {
-            'Economic': (224,233,198),
-            'Environmental': (161,219,246),
-            "Legal": (243,200,192),
-            "Political": (246,219,184), 
-            "Social": (199,212,235), 
-            "Technological": (221,213,170),
-            "Spatial": (235,199,218),
-            "Process+Methods": (184,222,212),
-        }
-
-        self.colors = {
-            'Economic': (58,73,42),
-            'Environmental': (34,75,94),
-            "Legal": (83,43,38),
-            "Political": (81,58,28), 
-            "Social": (43,54,74), 
-            "Technological": (63,56,15),
-            "Spatial": (74,42,60),
-            "Process+Methods": (31,62,54)
-        }
+    def __init__(self, image_folder_path=IMAGE_FOLDER_PATH, layout="pestel", debug=True, use_atlas=True, lazy_tiles=True):
         
-        self.pestel_anchors = {
-            "Political":(-4, 2.5), 
-            "Spatial": (-1,1),
-            'Economic':(-1,4),
-            "Social": (2, 2.5), 
-            "Legal":(-4, -0.5),
-            'Environmental': (2,-0.5),
-            "Technological": (-1,-2),
-            "Process+Methods": (2.5,-4)}
-
-        self.line_anchors = {
-            'Economic':(0, 0),
-            "Legal":(2,-2),
-            "Social": (4,-4), 
-            "Spatial": (6, -6),
-            "Process+Methods": (8,-8),
-            'Environmental': (10,-10),    
-            "Political":(12,-12), 
-            "Technological": (14,-14),
-            }
-
-        self.camera_conf={
-            "pestel": {"pos": (0.5,0.5), "zoom": 1},
-            "line": {"pos": (10,-5), "zoom": 0.8}
-        }
+        self.background_colors = dict(BACKGROUND_COLORS)
+        self.colors = dict(COLORS)
+        self.layout_anchors = {name: dict(anchors) for name, anchors in LAYOUT_ANCHORS.items()}
+        self.pestel_anchors = self.layout_anchors["pestel"]
+        self.line_anchors = self.layout_anchors["line"]
+
+        self.camera_conf = {name: dict(conf) for name, conf in CAMERA_CONF.items()}
         
         self.layout_name = layout
+        self.background_color = BACKGROUND
+        self.key_actions = {}
         
         self.engine = self.setup_engine(debug=debug)
+        self.profiler = FrameProfiler().attach(self.engine)
         
-        self.assets = get_categorized_assets(image_folder_path)
+        self.catalog = get_catalog(image_folder_path)
+        self.assets = self.catalog.categorized()
         self.keywords = get_all_assets(self.assets)
         self.keyword_names= list(self.keywords.keys())
+        self.atlas = load_atlas(self.assets) if use_atlas else None
+        self.tile_images = TileImages(self.atlas)
+        self.lazy_tiles = lazy_tiles
+        self._tiles_dirty = True
+        self._layout_tables = {}
+        self.animator = Animator(self._apply_camera)
+        self.animate_transitions = True
+        self.transition_duration = TRANSITION_DURATION
+        self._transition_frames = 0
+        self.screenshots = None  # ScreenshotWriter, beim ersten Screenshot angelegt
+        self.screenshot_options = {"fmt": "png", "compress_level": 1}
         self.add_tiles_to_keywords(debug=debug)
         
         
         self.project_name = "Keines"
         self.project_kw_default_amount = 10
+        # Einträge ohne Keywords mit Zufallskeywords füllen (Demo); batch_render und export_video schalten das ab
+        self.random_keywords = True
         self.project_keywords = self.random_project_keywords()
+        self._highlighted = None  # None: Zustand der Kacheln unbekannt, nächstes Highlight setzt alle
+        self.highlight_listeners = []
+        self.projects = []
+        self.heatmap = None
+        self.heat = None  # {keyword: 0..1} im Heatmap-Modus
+        self.set_cooccurrence_data(self.projects, apply=False)
         
 
         self.labels_visible = True
@@ -132,6 +107,7 @@ class Landscape:
         self.labels = self.add_labels_to_keywords()
         self.headers = self.create_header_labels()
         self.heading = self.create_heading()
+        self.profiler.overlay = self.create_profiler_overlay()
 
         self.register_renderables()
         self.set_layout(self.layout_name)
@@ -142,31 +118,48 @@ class Landscape:
         
         self.layout_tiles()
         self.layout_headers()  
+        self.engine.add_callback(self.animate)
+        if self.lazy_tiles:
+            self.engine.add_callback(self.update_tile_levels)
     
     def random_project_keywords(self, n = 10):
         return random.sample(self.keyword_names, n)
     
     def set_tileset(self, title, keywords:list):
         """Set the tileset for the landscape."""
+        if self.heat is not None:
+            self.hide_heatmap()
         self.project_name = title or ""
-        self.heading.text = self.project_name
-        self.project_keywords = keywords or self.random_project_keywords()
+        if self.heading.text != self.project_name:  # Titel nur neu rastern, wenn er sich ändert
+            self.heading.text = self.project_name
+        if not keywords and self.random_keywords:
+            keywords = self.random_project_keywords(self.project_kw_default_amount)
+        self.project_keywords = list(keywords or [])
         if self.engine.debugmode:
             print("Project Name set to:", self.project_name)
             print("Project Keywords set to:", self.project_keywords)
         self.highlight_project()
 
 
+    @timed()
     def set_project(self, project_dict):
-        self.set_tileset(title=project_dict.get("project", "Unbekanntes Projekt"),
-                            keywords=project_dict.get("keywords", self.random_project_keywords(self.project_kw_default_amount)))
+        """project_dict is an all_results entry or a model.Project"""
+        if isinstance(project_dict, Entry):
+            self.set_tileset(title=title_of(project_dict.title, "Unbekanntes Projekt"), keywords=project_dict.keywords)
+            return
+        self.set_tileset(title=title_of(project_dict.get("project"), "Unbekanntes Projekt"),
+                            keywords=project_dict.get("keywords"))
         
+    @timed()
     def set_deliverables(self, deliverable_dict):
-        """Set the deliverables for the project."""
-        self.set_tileset(title=deliverable_dict.get("name", "Unbekanntes Deliverable"),
-                            keywords=deliverable_dict.get("keywords", self.random_project_keywords(self.project_kw_default_amount)))
+        """Set the deliverables for the project (all_results dict or model.Deliverable)."""
+        if isinstance(deliverable_dict, Entry):
+            self.set_tileset(title=title_of(deliverable_dict.title, "Unbekanntes Deliverable"), keywords=deliverable_dict.keywords)
+            return
+        self.set_tileset(title=title_of(deliverable_dict.get("name"), "Unbekanntes Deliverable"),
+                            keywords=deliverable_dict.get("keywords"))
 
-    def set_project_keywords(self, keywords:list):
+    def set_project_keywords(self, keywords:list=None):
         self.project_keywords = keywords or self.random_project_keywords()
         if self.engine.debugmode:
             print("Project Keywords set to:", self.project_keywords)
@@ -177,60 +170,194 @@ class Landscape:
         engine.setup_camera(rotation=45, isometry=0.57, 
                             zoom=self.camera_conf[self.layout_name]["zoom"], 
                             pos=self.camera_conf[self.layout_name]["pos"])
-        engine.show_background((230,221,204))
+        self.camera = dict(self.camera_conf[self.layout_name])
+        engine.show_background(self.background_color)
         return engine
 
     def pestel_layout(self):
         """returns a dict of locations for each keyword"""
-        self.anchors = self.pestel_anchors
-        return create_layout(self.assets, self.anchors, get_positions_around)
+        return self.layout_positions("pestel")
     
     def line_layout(self):        
-        self.anchors = self.line_anchors
-        return create_layout(self.assets, self.line_anchors, get_line_positions)
+        return self.layout_positions("line")
+
+    def layout_positions(self, layoutname):
+        """returns a dict of locations for each keyword"""
+        names, positions, self.anchors = compute_layout(self.assets, layoutname, self.layout_anchors.get(layoutname, {}))
+        return dict(zip(names, map(tuple, positions.tolist())))
+
+    def layout_table(self, layoutname):
+        """renderables of a layout (tiles, labels, headers) and their positions as one (n, 2) array, computed once per layout"""
+        if layoutname not in self._layout_tables:
+            names, positions, anchors = compute_layout(self.assets, layoutname, self.layout_anchors.get(layoutname, {}))
+            renderables = []
+            for name in names:
+                renderables.append(self.keywords[name]["tile"])
+                renderables.append(self.keywords[name]["label"])
+            # Kachel und Label abwechselnd, wie in renderables
+            table = np.empty((2 * len(names), 2))
+            table[0::2] = positions
+            table[1::2] = positions + LABEL_OFFSET
+            headers = [(name, label) for name, label in self.headers.items() if name in anchors]
+            renderables += [label for _, label in headers]
+            header_positions = np.array([anchors[name] for name, _ in headers], dtype=float).reshape(-1, 2) + HEADER_OFFSET
+            self._layout_tables[layoutname] = (renderables, np.concatenate([table, header_positions]), anchors)
+        return self._layout_tables[layoutname]
         
     def add_tiles_to_keywords(self, debug=True):
         """returns a list of deengi.renderables.Tile instances"""
+        if debug:
+            print("loading tiles from", "atlas" if self.atlas else "single images")
         for name in self.keywords:
             if debug:
                 print(self.keywords[name]['path'])
+            self.keywords[name]['tile'] = self.create_tile(name)
+
+    def create_tile(self, name):
+        category = self.keywords[name]['category']
+        self.keywords[name]['level'] = NOT_LOADED
+        if self.lazy_tiles or self.atlas is not None:
+            # Platzhalter ohne PNG dekodieren, das Bild setzt update_tile_levels bzw. der Atlas
+            tile = deengi.renderables.Tile((0,0), (1,1), color=self.background_colors[category], use_mask=False, name=name)
+            if not self.lazy_tiles:
+                set_tile_image(tile, self.atlas.surface(category, name))
+                self.keywords[name]['level'] = 0
+        else:
             tile = deengi.renderables.Tile((0,0), (1,1), self.keywords[name]['path'], use_mask=False, name=name)
-            self.keywords[name]['tile'] = tile
+        return tile
+
+    @timed()
+    def update_tile_levels(self, *args):
+        """per frame callback: decodes or swaps tile images after zoom, layout or highlight changes"""
+        if not self._tiles_dirty:
+            return
+        self._tiles_dirty = False
+        names = self.keyword_names
+        tiles = [self.keywords[name]['tile'] for name in names]
+        desired = choose_levels([tile.pos for tile in tiles], [tile.highlighted for tile in tiles],
+                                self.camera["zoom"], self.camera["pos"], self.tile_images.levels)
+        for name, tile, level in zip(names, tiles, desired.tolist()):
+            kw = self.keywords[name]
+            if level == NOT_LOADED or level == kw['level']:
+                continue
+            set_tile_image(tile, self.tile_surface(name, level))
+            kw['level'] = level
+
+    def tile_surface(self, name, level):
+        """image of a tile at a pyramid level, tinted in heatmap mode"""
+        kw = self.keywords[name]
+        surface = self.tile_images.surface(kw['category'], name, kw['path'], level)
+        if self.heat is None or not self.heat.get(name):
+            return surface
+        return self.heatmap.tinted(surface, (name, level), self.heat[name])
+
+    def refresh_tile_images(self):
+        """assigns all tile images again, e.g. after the heatmap changed"""
+        for name, kw in self.keywords.items():
+            if self.lazy_tiles:
+                kw['level'] = NOT_LOADED  # update_tile_levels setzt sie im nächsten Frame
+            else:
+                set_tile_image(kw['tile'], self.tile_surface(name, 0))
+                kw['level'] = 0
+        self._tiles_dirty = True
+
+    def watch_assets(self, interval=2.0):
+        """picks up added, changed and removed tiles in the asset folder while the engine runs"""
+        # der Watcher-Thread sammelt nur, angewendet wird im Frame-Callback;
+        # SimpleQueue statt Liste: put/get sind atomar, zwischen Kopieren und Leeren geht nichts verloren
+        self._asset_changes = queue.SimpleQueue()
+        self.catalog.watch(lambda catalog, changed, removed: self._asset_changes.put((changed, removed)), interval)
+        self.engine.add_callback(self.apply_asset_changes)
+
+    @timed()
+    def apply_asset_changes(self, *args):
+        """per frame callback for watch_assets"""
+        changes = []
+        while True:
+            try:
+                changes.append(self._asset_changes.get_nowait())
+            except queue.Empty:
+                break
+        if not changes:
+            return
+        changed_paths = {entry["path"] for changed, _ in changes for entry in changed}
+        self.assets = {cat: tiles for cat, tiles in self.catalog.categorized().items() if cat in self.headers}
+        keywords = get_all_assets(self.assets)
+        for name in set(self.keywords) - set(keywords):
+            self.keywords[name]['tile'].visible = False
+            self.keywords[name]['label'].visible = False
+            del self.keywords[name]
+            self.labels.pop(name, None)
+        if self.atlas is not None:
+            # der Atlas kennt die neuen Bilder nicht mehr, ab jetzt Einzelbilder
+            self.atlas = None
+            self.tile_images = TileImages()
+            for kw in self.keywords.values():
+                kw['level'] = NOT_LOADED
+        for name, asset in keywords.items():
+            kw = self.keywords.get(name)
+            if kw is None:
+                kw = self.keywords[name] = dict(asset)
+                kw['tile'] = self.create_tile(name)
+                kw['label'] = self.labels[name] = self.create_label(name)
+                self.engine.add_to_layer("main", kw['tile'], kw['label'])
+            elif kw['path'] != asset['path'] or kw['path'] in changed_paths or kw['level'] == NOT_LOADED:
+                kw['path'] = asset['path']
+                kw['level'] = NOT_LOADED
+            else:
+                continue
+            self.tile_images.pyramids.pop((kw['category'], name), None)
+            if not self.lazy_tiles:
+                set_tile_image(kw['tile'], self.tile_surface(name, 0))
+                kw['level'] = 0
+        self.keyword_names = list(self.keywords)
+        self._layout_tables = {}
+        self.layout_tiles()
+        self.layout_headers()
+        highlighted, self._highlighted = self._highlighted, None
+        if highlighted is not None:
+            self.apply_highlight(highlighted)
             
     def add_labels_to_keywords(self):
         """returns a list of deengi.renderables.Labels instances"""
         labels =   {}
         for name in self.keywords:
-            bgcolor = self.colors[self.keywords[name]['category']]
-            color = self.background_colors[self.keywords[name]['category']]
-            label = deengi.renderables.ui.Label((0,0), 
-                                        text=name.replace(" ", "\n"),
-                                        color=color,
-                                        size=28,
-                                        outline_color=bgcolor)
-            label.visible = self.labels_visible
-            self.keywords[name]['label'] = label
-            labels[name] = label
+            labels[name] = self.keywords[name]['label'] = self.create_label(name)
         return labels
+
+    def create_label(self, name):
+        bgcolor = self.colors[self.keywords[name]['category']]
+        color = self.background_colors[self.keywords[name]['category']]
+        label = deengi.renderables.ui.Label((0,0), 
+                                    text=name.replace(" ", "\n"),
+                                    color=color,
+                                    size=LABEL_SIZE,
+                                    outline_color=bgcolor)
+        label.font = cached_font(label.font)
+        label.visible = self.labels_visible
+        return label
             
     def create_header_labels(self):
         headers = {}
         for catname in self.assets.keys():
             color = self.colors[catname]
             bgcolor = self.background_colors[catname]
-            catlabel = deengi.renderables.ui.Label((0,0), text=catname, color=bgcolor, outline_color=color, size=36)
-            catlabel.font = self.engine.renderer.titlefont
+            catlabel = deengi.renderables.ui.Label((0,0), text=catname, color=bgcolor, outline_color=color, size=HEADER_SIZE)
+            catlabel.font = cached_font(self.engine.renderer.titlefont)
             catlabel.visible = self.headers_visible
             headers[catname] = catlabel
         return headers
         
-    def layout_tiles(self):
-        """set tile and label positions according to layout"""
-        for kw, pos in self.layout().items():
-            tile = self.keywords[kw]["tile"]
-            tile.pos = pos
-            label = self.keywords[kw]["label"]
-            label.pos = (pos[0]+0.75, pos[1])
+    def layout_tiles(self, animate=False):
+        """set tile, label and header positions according to layout; animate moves them there over transition_duration"""
+        renderables, positions, self.anchors = self.layout_table(self.layout_name)
+        if animate and self.transition_duration > 0:
+            self.animator.move(renderables, positions, duration=self.transition_duration)
+            return
+        self.animator.moves = None
+        for renderable, pos in zip(renderables, map(tuple, positions.tolist())):
+            renderable.pos = pos
+        self._tiles_dirty = True
             
     def layout_headers(self):
         for name, label in self.headers.items():
@@ -238,24 +365,33 @@ class Landscape:
             label.pos = (p[0]-1, p[1]-1)
                 
     def set_layout(self, layoutname="pestel"):
-        if layoutname == "pestel":
-            self.layout = self.pestel_layout
-        elif layoutname == "line":
-            self.layout = self.line_layout
-        else:
+        if layoutname not in LAYOUTS:
             raise ValueError(f"Invalid layout: {layoutname}")
+        self.layout_name = layoutname
+        self.layout = partial(self.layout_positions, layoutname)
         
     def create_heading(self):
         heading = deengi.renderables.ui.Label(
             (0, 0),  # Position at the top of the screen
             text = self.project_name,
-            color = (255, 255, 255),  # White text
-            size = 128,  # Large font size
-            outline_color = (0, 0, 0),  # Black outline
-            font = self.engine.renderer.titlefont
+            color = HEADING_COLOR,  # White text
+            size = HEADING_SIZE,  # Large font size
+            outline_color = HEADING_OUTLINE,  # Black outline
+            font = cached_font(self.engine.renderer.titlefont)
         )
-        heading.pos = (-9, 3)  # Adjust position to center it
+        heading.pos = HEADING_POS  # Adjust position to center it
         return heading      
+
+    def create_profiler_overlay(self):
+        overlay = deengi.renderables.ui.Label(
+            (-9, 2),  # unter der Überschrift
+            text = "",
+            color = (255, 255, 255),
+            size = 20,
+            outline_color = (0, 0, 0),
+        )
+        overlay.visible = False
+        return overlay
         
     def register_renderables(self):
         for kw in self.keywords:
@@ -266,25 +402,71 @@ class Landscape:
             self.engine.add_to_layer("main", l)
 
         self.engine.add_to_layer("ui", self.heading)
+        self.engine.add_to_layer("ui", self.profiler.overlay)
             
         
     def highlight_project(self):
-        for name, kw in self.keywords.items():
-            tile = kw["tile"]
-            label = kw["label"]
-            if name in self.project_keywords:
-                tile.highlighted = True
-                label.visible = True and self.labels_visible
-            else:
-                tile.highlighted = False
-                label.visible = False 
+        self.apply_highlight(set(self.project_keywords))
                 
     def show_all(self):
-        for kw in self.keywords.values():
-            tile = kw["tile"]
-            label = kw["label"]
-            tile.highlighted = True
-            label.visible = True and self.labels_visible
+        self.apply_highlight(set(self.keywords))
+
+    @timed()
+    def apply_highlight(self, names):
+        """highlights exactly names; only tiles and labels whose state changes are touched
+
+        returns the change set {"added": ..., "removed": ...}, which is also passed to every highlight listener
+        """
+        names = names & self.keywords.keys()
+        changed, change = highlight_change(names, self._highlighted, self.keywords)
+        for name in changed:
+            kw = self.keywords[name]
+            on = name in names
+            kw["tile"].highlighted = on
+            kw["label"].visible = on and self.labels_visible
+        self._highlighted = names
+        if changed:
+            self._tiles_dirty = True
+            for listener in self.highlight_listeners:
+                listener(change)
+        return change
+
+    @timed()
+    def show_heatmap(self, projects=None, where=None, deliverables=True):
+        """tints every tile by how many projects (and their deliverables) use it
+
+        projects defaults to the ones loaded by set_project_keywords_from_file; where filters them,
+        e.g. {"round": 2} or a callable(project) -> bool. Headers show the summed counts per category.
+        """
+        projects = self.projects if projects is None else projects
+        keyword_categories = {name: kw['category'] for name, kw in self.keywords.items()}
+        if self.heatmap is None or self.heatmap.keyword_categories != keyword_categories:
+            self.heatmap = Heatmap(keyword_categories)
+        counts, self.heat, totals = self.heatmap.compute(projects, where, deliverables)
+        for catname, header in self.headers.items():
+            header.text = f"{catname} ({totals.get(catname, 0)})"
+        self.heading.text = f"Heatmap ({self.heatmap.selected} Projekte)"
+        self.refresh_tile_images()
+        self.apply_highlight({name for name, n in counts.items() if n})
+        return counts
+
+    def hide_heatmap(self):
+        self.heat = None
+        for catname, header in self.headers.items():
+            header.text = catname
+        self.heading.text = self.project_name
+        self.refresh_tile_images()
+        self.highlight_project()
+
+    def toggle_heatmap(self):
+        if self.heat is None:
+            self.show_heatmap()
+        else:
+            self.hide_heatmap()
+
+    def add_highlight_listener(self, callback):
+        """callback(change) is called after every highlight update that changed something"""
+        self.highlight_listeners.append(callback)
                 
     def p(self):
         if not self._p:
@@ -299,57 +481,123 @@ class Landscape:
         for kws in self.keywords.values():
             label = kws.get('label')
             label.visible = flag
+        self._highlighted = None  # Label-Sichtbarkeit weicht jetzt vom Highlight ab
         
     def toggle_label_visibility(self):
         self.labels_visible = not self.labels_visible
         self.show_labels(self.labels_visible)
         self.layout_tiles()
         
+    @timed()
     def toggle_layout(self):
-        self.layout_name = "line" if self.layout_name == "pestel" else "pestel"
+        """switches to the next layout in layout_anchors, animated to its camera preset"""
+        names = list(self.layout_anchors)
+        current = names.index(self.layout_name) if self.layout_name in names else -1
+        self.apply_layout(names[(current + 1) % len(names)], move_camera=True, animate=self.animate_transitions)
+
+    def set_cooccurrence_data(self, projects, apply=True):
+        """the "cooccurrence" layout places keywords by how often they appear together in projects"""
+        register_layout("cooccurrence", cooccurrence_layout(projects), per_category=False)
+        self._layout_tables.pop("cooccurrence", None)
+        if apply and self.layout_name == "cooccurrence":
+            self.apply_layout("cooccurrence")
+
+    @timed()
+    def apply_layout(self, layoutname, move_camera=False, animate=False):
+        """switch to layoutname; move_camera also goes to the camera preset of that layout, animate does both over transition_duration"""
+        self.layout_name = layoutname
         self.set_layout(self.layout_name)
-        self.layout_tiles()
-        self.layout_headers()
+        self.layout_tiles(animate=animate)
+        if not animate:
+            self.layout_headers()
+        if move_camera:
+            self.set_camera(self.camera_conf[layoutname], animate=animate)
 
-    def take_screenshot(self, filename=None):
-        """Speichert einen Screenshot des aktuellen Engine-Bildschirms."""
-        screenshot_dir = Path("Screenshots")
-        screenshot_dir.mkdir(parents=True, exist_ok=True)  # Ordner anlegen falls nicht vorhanden
+    @timed()
+    def set_camera(self, conf, animate=False):
+        if animate and self.transition_duration > 0:
+            self.animator.move_camera(self.camera, conf, duration=self.transition_duration)
+            return
+        self.animator.camera = None
+        self._apply_camera(conf)
+        self._tiles_dirty = True
 
-        if filename is None:
-            #filename = self.project_name + f"_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            filename = "NoText_" + self.project_name + ".png"
-        
-        filepath = screenshot_dir / filename
+    def _apply_camera(self, conf):
+        self.engine.setup_camera(rotation=45, isometry=0.57, zoom=conf["zoom"], pos=conf["pos"])
+        self.camera = dict(conf)
+
+    @timed()
+    def animate(self, *args):
+        """per frame callback: advances layout and camera transitions"""
+        if not self.animator.tick():
+            return
+        self._transition_frames += 1
+        # Kachelstufen nicht in jedem Frame neu wählen, aber spätestens am Ende
+        if not self.animator.active or self._transition_frames % LEVEL_REFRESH_FRAMES == 0:
+            self._tiles_dirty = True
+        if not self.animator.active:
+            self._transition_frames = 0
 
+    @timed()
+    def take_screenshot(self, filename=None):
+        """Kopiert den aktuellen Engine-Bildschirm, kodiert und gespeichert wird im Hintergrund (screenshots.ScreenshotWriter)."""
+        if self.screenshots is None:
+            self.screenshots = ScreenshotWriter(Path("Screenshots"), **self.screenshot_options)
+        stem = Path(filename).stem if filename else "NoText_" + safe_filename(self.project_name)
         surface = deengi.engine.pygame.display.get_surface()
-        deengi.engine.pygame.image.save(surface, str(filepath))
-        print(f"Screenshot saved at {filename}")              
-    
+        return self.screenshots.capture(surface, stem)
+
+    def bind_key(self, key, callback, binding_name=None):
+        """engine.bind_key, remembered in key_actions for the kiosk loop"""
+        self.key_actions[key] = callback
+        if binding_name is None:
+            self.engine.bind_key(key, callback)
+        else:
+            self.engine.bind_key(key, callback, binding_name=binding_name)
+
     def bind_keys(self):
         engine = self.engine
-        engine.bind_key("q", engine.quit)
-        engine.bind_key("d", engine.toggle_debug)
+        self.bind_key("q", engine.quit)
+        self.bind_key("d", engine.toggle_debug)
         # engine.bind_key("g", engine.toggle_visibility_cb(grid))
-        engine.bind_key("p", self.p)
-        engine.bind_key("n", self.set_project_keywords, binding_name="Set project keywords")
-        engine.bind_key("l", self.toggle_label_visibility)
-        engine.bind_key("h", engine.toggle_visibility_cb(*self.headers.values()))
-        engine.bind_key("a", self.toggle_layout)
-        engine.bind_key("s", self.take_screenshot, binding_name="Screenshot speichern")
+        self.bind_key("p", self.p)
+        self.bind_key("n", self.set_project_keywords, binding_name="Set project keywords")
+        self.bind_key("l", self.toggle_label_visibility)
+        self.bind_key("h", engine.toggle_visibility_cb(*self.headers.values()))
+        self.bind_key("a", self.toggle_layout)
+        self.bind_key("s", self.take_screenshot, binding_name="Screenshot speichern")
+        self.bind_key("f", engine.toggle_visibility_cb(self.profiler.overlay), binding_name="Frame-Zeiten anzeigen")
+        self.bind_key("t", self.profiler.export_trace, binding_name="Trace speichern")
+        self.bind_key("m", self.toggle_heatmap, binding_name="Heatmap aller Projekte")
         
-    def show(self):
-        for key, bind_type, label in self.engine.get_keybinds():
-            self.engine.show_debug(" ".join([bind_type, key, label]))
-        
-        #self.engine.add_callback()
-        self.engine.run()
+    def show(self, kiosk=False):
+        """kiosk: event driven loop that only redraws what changed (static_render.KioskView)"""
+        try:
+            if kiosk:
+                from static_render import KioskView
+                self.animate_transitions = False  # KioskView zeichnet nur bei Änderungen, ohne Frame-Callbacks
+                callbacks = [self.apply_asset_changes] if hasattr(self, "_asset_changes") else []
+                KioskView(self, callbacks=callbacks).run()
+                return
+
+            for key, bind_type, label in self.engine.get_keybinds():
+                self.engine.show_debug(" ".join([bind_type, key, label]))
+            
+            #self.engine.add_callback()
+            self.engine.run()
+        finally:
+            # noch wartende Screenshots schreiben, bevor das Programm endet
+            if self.screenshots is not None:
+                self.screenshots.close()
 
     def set_project_keywords_from_file(self, filename, type="project", project_number = 0, print_projects=True):
         import json
         with open(filename, "r", encoding="utf-8") as f:
             projects = json.load(f)
 
+        if type == "project":
+            self.projects = projects
+            self.set_cooccurrence_data(projects)
         if type == "deliverable":
             projects = projects[project_number]["deliverables"]
             for dicts in projects:
@@ -360,7 +608,7 @@ class Landscape:
             print(project)
             cb = partial(landscape.set_project, project)
             print("binding key", i+1, "to project", project["project"])
-            landscape.engine.bind_key(str(i+1), cb, binding_name=f"Project {i+1} {project["project"]}")
+            self.bind_key(str(i+1), cb, binding_name=f"Project {i+1} {project["project"]}")
         
     
 if __name__ == '__main__':
@@ -374,5 +622,5 @@ if __name__ == '__main__':
 
     landscape.set_project_keywords_from_file(filename, type="project", print_projects=True)
     
-    landscape.show()
+    landscape.show(kiosk="--kiosk" in sys.argv)
     
\ No newline at end of file
@@ -6,6 +6,10 @@ import deengi
 import deengi.renderables
 import numpy as np
 
+from catalog import get_catalog
+from text_cache import cached_font
+from layouts import line_positions, positions_around
+
 keyword_names = ['Affordability',
  'Business Models',
  'Circular Economy',
@@ -112,21 +116,7 @@ colors = {
            
 tile_assets_path = Path("assets") / "img"
 def get_landscape_assets(path=tile_assets_path) -> dict:
-    landscape = {}
-    for category in path.iterdir():
-        if not category.is_dir():
-            print(f"Non categorized file {category} in {path=}")
-            continue
-        
-        landscape[category.name] = {}
-        
-        for tile in category.iterdir():
-            if not tile.is_file() or not tile.suffix.lower() in (".png", ".jpg"):
-                print(f"Non-image file {tile} in {category=}")
-                continue
-            
-            landscape[category.name][tile.name[:-4]] = tile.as_posix()
-    return landscape   
+    return get_catalog(path).categorized()
         
 
 def flatten(landscape):
@@ -151,19 +141,7 @@ def create_random_positions(start, number):
     return positions
 
 def create_positions_around(start, n):
-    sx,sy = start
-    positions = []
-    for x in np.arange(sx-1,sx+2):
-        for y in np.arange(sy-1, sy+2):
-            positions.append((x,y))   
-    positions.append((sx,sy+2))
-    positions.append((sx+1,sy+2))
-    positions.append((sx+2,sy+2))
-    positions.append((sx+2,sy+1))
-    positions.append((sx+2,sy))
-    if n > len(positions):
-        raise ValueError(f"only {len(positions)} positions available, {n} requested")
-    return positions[:n]
+    return [tuple(p) for p in positions_around(start, n).tolist()]
 
 def get_orbit_points(distance, n, center=(0,0)):
     import numpy as np
@@ -173,17 +151,17 @@ def get_orbit_points(distance, n, center=(0,0)):
     return pos
 
 def create_line_positions(start, offset, n):
-    sx,sy = start
-    ox, oy = offset
-    return [(sx+ox*i%5+i//5, sy+oy*i%5) for i in range(n)]
+    return [tuple(p) for p in line_positions(start, n, offset).tolist()]
 
     
 def create_label(pos, kw_name, color, bgcolor, size=16):
-    return deengi.renderables.ui.Label((pos[0]+0.75, pos[1]), 
+    label = deengi.renderables.ui.Label((pos[0]+0.75, pos[1]), 
                                         text=kw_name.replace(" ", "\n"),
                                         color=color,
                                         size=size,
                                         outline_color=bgcolor)
+    label.font = cached_font(label.font)
+    return label
 
 
 def show_all(eng, layout="row", tooltips=True, catlabels=True, tilelabels=True):
@@ -211,7 +189,7 @@ def show_all(eng, layout="row", tooltips=True, catlabels=True, tilelabels=True):
         if catlabels:
             x,y=line_anchors[catname]
             catlabel = create_label((x-1,y-1), catname, background_colors.get(catname), colors[catname], size=36)
-            catlabel.font = eng.renderer.titlefont
+            catlabel.font = cached_font(eng.renderer.titlefont)
             eng.add_to_layer("main", catlabel)
             
     eng.add_to_layer("main", *tilemap)
@@ -220,7 +198,7 @@ def show_all(eng, layout="row", tooltips=True, catlabels=True, tilelabels=True):
         
     
 def show_keywords(eng, keyword_list):
-    landscape = flatten(get_landscape_assets())
+    landscape = get_catalog(tile_assets_path).flat()
     positions = create_positions_around((0,0), len(keyword_list))
     print(keyword_list)
     for pos, kw in zip(positions, keyword_list):
@@ -232,7 +210,7 @@ def show_pestel_topics(eng):
         tile = deengi.renderables.Tile((pos[0]-0.71, pos[1]-1.15), (2.85,2.85), color=background_colors[catname])
         eng.add_to_layer("main", tile)
         catlabel = create_label((pos[0], pos[1]+1), catname, background_colors.get(catname), colors[catname], size=36)
-        catlabel.font = eng.renderer.titlefont
+        catlabel.font = cached_font(eng.renderer.titlefont)
         #eng.add_to_layer("main", catlabel)
     
 def get_renderables_not_in_kws(keywords, tilemap, labels):
@@ -0,0 +1,120 @@
+"""Screenshots without stalling the render loop.
+
+    writer = ScreenshotWriter("Screenshots", fmt="png", compress_level=1)
+    writer.capture(pygame.display.get_surface(), "NoText_" + project_name)
+    ...
+    writer.close()   # also registered with atexit
+
+capture copies the frame buffer (pygame.image.tobytes, about a millisecond
+for 1300x1000) and puts it on a bounded queue; a background thread encodes and
+writes the files. The queue only blocks when more than maxsize screenshots are
+still waiting. Filenames get a timestamp and a counter, so screenshots taken
+back to back never overwrite each other.
+"""
+import atexit
+import os
+import queue
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pygame
+
+try:
+    from PIL import Image
+except ImportError:  # ohne Pillow speichert pygame, ohne Kompressionseinstellungen
+    Image = None
+
+FORMATS = {"png": "PNG", "jpg": "JPEG", "webp": "WEBP", "bmp": "BMP"}
+COMPRESS_LEVEL = 6   # PNG 0..9
+QUALITY = 90         # JPEG und WebP
+MAX_PENDING = 8
+
+
+def safe_filename(text):
+    """text (e.g. a project name) as a file name stem"""
+    return re.sub(r"[^\w\-+.]+", "_", str(text)).strip("_") or "unnamed"
+
+
+def encode(data, size, path, fmt="png", compress_level=COMPRESS_LEVEL, quality=QUALITY):
+    """writes RGB bytes to path, through a temporary file so nobody sees half written images"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    if Image is not None:
+        image = Image.frombytes("RGB", size, data)
+        options = {"compress_level": compress_level} if fmt == "png" else {"quality": quality} if fmt in ("jpg", "webp") else {}
+        image.save(tmp, FORMATS[fmt], **options)
+    else:
+        # pygame bestimmt das Format aus der Endung
+        tmp = tmp.with_suffix(path.suffix)
+        pygame.image.save(pygame.image.frombytes(data, size, "RGB"), str(tmp))
+    os.replace(tmp, path)
+
+
+class ScreenshotWriter:
+    def __init__(self, directory="Screenshots", fmt="png", compress_level=COMPRESS_LEVEL, quality=QUALITY,
+                 maxsize=MAX_PENDING):
+        if fmt not in FORMATS:
+            raise ValueError(f"Invalid format: {fmt}, expected one of {', '.join(FORMATS)}")
+        self.directory = Path(directory)
+        self.fmt = fmt
+        self.compress_level = compress_level
+        self.quality = quality
+        self.queue = queue.Queue(maxsize)
+        self.reserved = set()   # vergebene, evtl. noch nicht geschriebene Dateinamen
+        self.written = []
+        self.errors = []
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def unique_path(self, stem):
+        """directory/<stem>_<timestamp>.<fmt>, with a counter if that is taken"""
+        base = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path = self.directory / f"{base}.{self.fmt}"
+        n = 2
+        while path in self.reserved or path.exists():
+            path = self.directory / f"{base}_{n}.{self.fmt}"
+            n += 1
+        self.reserved.add(path)
+        return path
+
+    def capture(self, surface, stem="screenshot"):
+        """copies surface and queues it for writing, returns the path it will be written to"""
+        if self.closed:
+            raise RuntimeError("ScreenshotWriter is closed")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.unique_path(stem)
+        self.queue.put((pygame.image.tobytes(surface, "RGB"), surface.get_size(), path))
+        return path
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    return
+                data, size, path = item
+                encode(data, size, path, self.fmt, self.compress_level, self.quality)
+                self.written.append(path)
+                print(f"Screenshot saved at {path}")
+            except Exception as e:  # der Thread muss weiterlaufen, sonst blockiert capture irgendwann
+                self.errors.append((item[2], e))
+                print(f"Screenshot {item[2]} failed: {e}")
+            finally:
+                if item is not None:
+                    self.reserved.discard(item[2])
+                self.queue.task_done()
+
+    def flush(self):
+        """waits until every queued screenshot is written"""
+        self.queue.join()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join()
+        atexit.unregister(self.close)
@@ -1,22 +1,98 @@
 document.addEventListener('DOMContentLoaded', function() {
-    const checkboxes = document.querySelectorAll('.keyword-checkbox');
-    checkboxes.forEach(checkbox => {
-        checkbox.addEventListener('change', updateTiles);
-    });
+    const tileContainer = document.getElementById('tile-container');
+    const categoryFilter = document.getElementById('category-filter');
+    const projectSelect = document.getElementById('project-select');
+    const deliverableSelect = document.getElementById('deliverable-select');
+    let colors = {};
+
+    function getJSON(url) {
+        // der Browser revalidiert mit If-None-Match, der Server antwortet dann mit 304
+        return fetch(url).then(response => response.json());
+    }
+
+    function rgb(color) {
+        return `rgb(${color.join(',')})`;
+    }
+
+    function renderTiles(tiles) {
+        tileContainer.replaceChildren(...tiles.map(tile => {
+            const div = document.createElement('div');
+            div.className = 'tile';
+            div.dataset.category = tile.category;
+            div.dataset.keyword = tile.name;
+            div.style.backgroundColor = rgb(colors[tile.category]);
+            const img = document.createElement('img');
+            img.src = tile.thumbnail + '&w=128&format=webp';
+            img.alt = tile.name;
+            img.loading = 'lazy';
+            div.append(img, tile.name);
+            return div;
+        }));
+    }
+
+    function renderCategories() {
+        categoryFilter.replaceChildren(...Object.keys(colors).map(category => {
+            const label = document.createElement('label');
+            const checkbox = document.createElement('input');
+            checkbox.type = 'checkbox';
+            checkbox.className = 'category-checkbox';
+            checkbox.value = category;
+            checkbox.addEventListener('change', updateTiles);
+            label.append(checkbox, ' ' + category);
+            const line = document.createElement('div');
+            line.append(label);
+            return line;
+        }));
+    }
 
     function updateTiles() {
-        const selectedKeywords = Array.from(checkboxes)
-            .filter(checkbox => checkbox.checked)
-            .map(checkbox => checkbox.getAttribute('data-keyword'));
-
-        const tiles = document.querySelectorAll('.tile');
-        tiles.forEach(tile => {
-            const category = tile.getAttribute('data-category');
-            if (selectedKeywords.includes(category)) {
-                tile.classList.remove('greyed-out');
-            } else {
-                tile.classList.add('greyed-out');
-            }
+        const params = new URLSearchParams();
+        categoryFilter.querySelectorAll('.category-checkbox:checked')
+            .forEach(checkbox => params.append('category', checkbox.value));
+        getJSON('/api/assets?' + params).then(data => {
+            renderTiles(data.tiles);
+            updateHighlight();
         });
     }
+
+    function updateHighlight() {
+        const project = projectSelect.value;
+        const tiles = tileContainer.querySelectorAll('.tile');
+        if (project === '') {
+            tiles.forEach(tile => tile.classList.remove('greyed-out'));
+            return;
+        }
+        const params = new URLSearchParams();
+        if (deliverableSelect.value !== '') {
+            params.append('deliverable', deliverableSelect.value);
+        }
+        getJSON(`/api/projects/${project}?` + params).then(data => {
+            const highlighted = new Set(data.keywords);
+            tiles.forEach(tile => tile.classList.toggle('greyed-out', !highlighted.has(tile.dataset.keyword)));
+        });
+    }
+
+    function loadDeliverables() {
+        const project = projectSelect.value;
+        deliverableSelect.replaceChildren(new Option('Whole project', ''));
+        deliverableSelect.disabled = project === '';
+        if (project === '') {
+            updateHighlight();
+            return;
+        }
+        getJSON(`/api/projects/${project}`).then(data => {
+            data.deliverables.forEach((name, i) => deliverableSelect.append(new Option(name || `Deliverable ${i + 1}`, i)));
+            updateHighlight();
+        });
+    }
+
+    projectSelect.addEventListener('change', loadDeliverables);
+    deliverableSelect.addEventListener('change', updateHighlight);
+
+    Promise.all([getJSON('/api/assets'), getJSON('/api/projects')]).then(([assets, projects]) => {
+        colors = assets.colors;
+        renderCategories();
+        renderTiles(assets.tiles);
+        projects.projects.forEach(p => projectSelect.append(new Option(p.project, p.id)));
+    });
 });
@@ -0,0 +1,210 @@
+"""Kiosk render mode: the landscape as a cached surface, redrawn only where something changed.
+
+    python ped_landscape.py --kiosk
+
+StaticScene rasterizes the whole landscape once per layout and camera state
+into an off-screen surface (frame). A highlight change only redraws the rects
+of the tiles and labels that changed; everything overlapping them is drawn
+again clipped to the rect, back to front. KioskView replaces engine.run
+with a loop that blocks on pygame.event.wait, so an idle kiosk does not draw
+at all.
+
+Text is rendered with the fonts of the Landscape's deengi Labels (the label
+font, engine.renderer.titlefont for headers and heading) and placed at their
+world positions, colours come from palette. Greyed-out tiles are drawn with
+pygame.transform.grayscale, which only approximates deengi's own rendering of
+tiles that are not highlighted; the kiosk frame has not been compared with an
+engine.run frame pixel by pixel.
+"""
+import numpy as np
+
+import pygame
+
+from camera import SCREEN_SIZE, world_to_screen
+from layouts import TILE_CENTER
+from palette import BACKGROUND, HEADER_SIZE, HEADING_COLOR, HEADING_OUTLINE, HEADING_SIZE, LABEL_SIZE
+from text_cache import font_key, outlined_text, text_cache
+from tile_lod import DRAWN_TILE_PX, level_for_zoom
+
+
+def label_surface(label, text, size, color, outline_color, zoom=1.0, cache=text_cache):
+    """outlined text in the font of a deengi Label, scaled so one line is size * zoom high"""
+    font = label.font
+    px = max(1, round(size * zoom))
+    key = ("label", font_key(font), text, px, tuple(color), tuple(outline_color))
+
+    def render():
+        image = outlined_text(font, text, color, outline_color)
+        scale = px / font.get_height()
+        return pygame.transform.smoothscale(image, (max(1, round(image.get_width() * scale)),
+                                                    max(1, round(image.get_height() * scale))))
+    return cache.get(key, render)
+
+
+class StaticScene:
+    def __init__(self, landscape, screen_size=SCREEN_SIZE, background=BACKGROUND):
+        self.landscape = landscape
+        self.screen_size = screen_size
+        self.background = background
+        self.base = None        # nur Hintergrund
+        self.frame = None       # base + Kacheln, Labels, Überschriften und Titel im aktuellen Zustand
+        self.state = None
+        self.order = []         # Namen von hinten nach vorne
+        self.tile_rects = {}
+        self.label_rects = {}
+        self.header_rects = {}
+        self.heading_rect = None
+        self.heading_corner = None
+        self.heading_text = None
+        self.pending = set()
+        self._images = {}
+        landscape.add_highlight_listener(self.on_highlight)
+
+    def on_highlight(self, change):
+        self.pending |= change["added"] | change["removed"]
+
+    def state_key(self):
+        ls = self.landscape
+        return (ls.layout_name, tuple(ls.camera["pos"]), ls.camera["zoom"], ls.labels_visible,
+                tuple((h.visible, h.text) for h in ls.headers.values()), tuple(ls.keywords),
+                None if ls.heat is None else tuple(ls.heat.items()))
+
+    def tile_image(self, name, grey):
+        ls = self.landscape
+        zoom = ls.camera["zoom"]
+        level = level_for_zoom(zoom, ls.tile_images.levels)
+        key = (name, level, grey)
+        if key not in self._images:
+            source = ls.tile_surface(name, level)
+            width = max(1, round(DRAWN_TILE_PX * zoom))
+            image = pygame.transform.smoothscale(source, (width, max(1, round(source.get_height() * width / source.get_width()))))
+            self._images[key] = pygame.transform.grayscale(image) if grey else image
+        return self._images[key]
+
+    def label_image(self, name):
+        ls = self.landscape
+        category = ls.keywords[name]["category"]
+        label = ls.keywords[name]["label"]
+        return label_surface(label, label.text, LABEL_SIZE, ls.background_colors[category],
+                             ls.colors[category], zoom=ls.camera["zoom"])
+
+    def rebuild(self):
+        """new base and frame for the current layout and camera"""
+        ls = self.landscape
+        pos, zoom = ls.camera["pos"], ls.camera["zoom"]
+        self._images.clear()
+        self.base = pygame.Surface(self.screen_size)
+        self.base.fill(self.background)
+        self.header_rects = {}
+        for catname, header in ls.headers.items():
+            if header.visible:
+                corner = world_to_screen(header.pos, pos, zoom, self.screen_size)[0].round().tolist()
+                self.header_rects[catname] = self.header_image(catname).get_rect(topleft=corner)
+
+        names = list(ls.keywords)
+        tile_pos = np.array([ls.keywords[n]["tile"].pos for n in names], dtype=float).reshape(-1, 2)
+        label_pos = np.array([ls.keywords[n]["label"].pos for n in names], dtype=float).reshape(-1, 2)
+        centers = world_to_screen(tile_pos + TILE_CENTER, pos, zoom, self.screen_size)
+        corners = world_to_screen(label_pos, pos, zoom, self.screen_size)
+        self.order = [names[i] for i in np.argsort(centers[:, 1], kind="stable")]
+        self.tile_rects, self.label_rects = {}, {}
+        for name, center, corner in zip(names, centers.tolist(), corners.tolist()):
+            rect = self.tile_image(name, False).get_rect()
+            rect.center = (round(center[0]), round(center[1]))
+            self.tile_rects[name] = rect
+            self.label_rects[name] = self.label_image(name).get_rect(topleft=(round(corner[0]), round(corner[1])))
+        self.frame = self.base.copy()
+        self.heading_text = ls.heading.text
+        self.heading_corner = world_to_screen(ls.heading.pos, pos, zoom, self.screen_size)[0].round().tolist()
+        self.heading_rect = self.heading_image().get_rect(topleft=self.heading_corner)
+        self.redraw(self.frame.get_rect())
+        self.state = self.state_key()
+        self.pending.clear()
+
+    def header_image(self, catname):
+        ls = self.landscape
+        header = ls.headers[catname]
+        return label_surface(header, header.text, HEADER_SIZE, ls.background_colors[catname], ls.colors[catname],
+                             zoom=ls.camera["zoom"])
+
+    def heading_image(self):
+        ls = self.landscape
+        return label_surface(ls.heading, ls.heading.text or " ", HEADING_SIZE, HEADING_COLOR, HEADING_OUTLINE,
+                             zoom=ls.camera["zoom"])
+
+    def redraw(self, rect):
+        """draws everything that overlaps rect again, clipped to rect"""
+        ls = self.landscape
+        self.frame.blit(self.base, rect, rect)
+        self.frame.set_clip(rect)
+        for name in self.order:
+            if self.tile_rects[name].colliderect(rect):
+                self.frame.blit(self.tile_image(name, not ls.keywords[name]["tile"].highlighted), self.tile_rects[name])
+        for name in self.order:
+            if ls.keywords[name]["label"].visible and self.label_rects[name].colliderect(rect):
+                self.frame.blit(self.label_image(name), self.label_rects[name])
+        for catname, header_rect in self.header_rects.items():
+            if header_rect.colliderect(rect):
+                self.frame.blit(self.header_image(catname), header_rect)
+        if ls.heading.visible and self.heading_rect.colliderect(rect):
+            self.frame.blit(self.heading_image(), self.heading_rect)
+        self.frame.set_clip(None)
+
+    def dirty_rects(self):
+        rects = []
+        for name in self.pending & self.tile_rects.keys():
+            rects += [self.tile_rects[name], self.label_rects[name]]
+        if self.landscape.heading.text != self.heading_text:
+            rects.append(self.heading_rect)
+            self.heading_text = self.landscape.heading.text
+            self.heading_rect = self.heading_image().get_rect(topleft=self.heading_corner)
+            rects.append(self.heading_rect)
+        self.pending.clear()
+        screen = self.frame.get_rect()
+        return [r.clip(screen) for r in rects if r.colliderect(screen)]
+
+    def draw(self, display):
+        """brings display up to date, returns the rects that changed (empty if nothing did)"""
+        if self.state != self.state_key():
+            self.rebuild()
+            display.blit(self.frame, (0, 0))
+            return [display.get_rect()]
+        rects = self.dirty_rects()
+        for rect in rects:
+            self.redraw(rect)
+            display.blit(self.frame, rect, rect)
+        return rects
+
+
+class KioskView:
+    """event driven main loop for Landscape.show(kiosk=True)"""
+
+    def __init__(self, landscape, idle_timeout=1000, callbacks=()):
+        self.landscape = landscape
+        self.scene = StaticScene(landscape, background=landscape.background_color)
+        self.idle_timeout = idle_timeout   # ms; danach laufen nur die callbacks
+        self.callbacks = list(callbacks)
+        self.running = False
+
+    def handle(self, event):
+        if event.type == pygame.QUIT:
+            self.running = False
+        elif event.type == pygame.KEYDOWN:
+            key = pygame.key.name(event.key)
+            if key == "q":
+                self.running = False
+            elif key in self.landscape.key_actions:
+                self.landscape.key_actions[key]()
+
+    def run(self):
+        display = pygame.display.get_surface() or pygame.display.set_mode(self.scene.screen_size)
+        self.running = True
+        while self.running:
+            rects = self.scene.draw(display)
+            if rects:
+                pygame.display.update(rects)
+            # blockiert, bis eine Taste gedrückt wird: im Leerlauf kein Neuzeichnen
+            for event in [pygame.event.wait(self.idle_timeout)] + pygame.event.get():
+                self.handle(event)
+            for callback in self.callbacks:
+                callback()
@@ -0,0 +1,205 @@
+"""Self-contained SVG/HTML pages of the isometric landscape, without pygame.
+
+    python svg_export.py all_results_may_fixedkeywords.json --out static/landscape --layout pestel
+    flask --app app export-landscape --layout pestel     # then open /static/landscape/index.html
+
+Tile centres, label corners, header corners and the heading of a layout go through the
+camera transform (camera.world_to_screen with the camera_conf of the layout)
+in one call. The resulting tile and label elements are formatted once per
+layout, and every project page only joins them with its own highlight classes.
+Tile images are embedded as data URIs (128/256 px WebP from thumbnails.py if
+Pillow is installed, otherwise the original PNG), so a page needs neither the
+assets nor a server. A checkbox on the page (CSS only) toggles between the
+project highlight and all tiles.
+"""
+import argparse
+import base64
+import html
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+from camera import CAMERA_CONF, DRAWN_TILE_PX, SCREEN_SIZE, world_to_screen
+from catalog import get_catalog
+from cooccurrence import cooccurrence_positions
+from layouts import HEADER_OFFSET, HEADING_POS, LABEL_OFFSET, LAYOUT_ANCHORS, TILE_CENTER, compute_layout, resolve_collisions
+from model import title_of
+from palette import (BACKGROUND, BACKGROUND_COLORS, COLORS, HEADER_SIZE, HEADING_COLOR, HEADING_OUTLINE, HEADING_SIZE,
+                     LABEL_SIZE)
+
+OUTLINE_PX = 2
+LINE_HEIGHT = 1.1
+
+PAGE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ margin: 0; background: {background}; font-family: sans-serif; }}
+svg {{ display: block; width: 100%; height: auto; max-height: 100vh; }}
+text {{ paint-order: stroke; stroke-linejoin: round; }}
+.tile.off {{ filter: grayscale(1); }}
+.label.off {{ display: none; }}
+.toggle {{ position: fixed; right: 1em; top: 1em; background: #fffc; padding: .3em .6em; border-radius: .3em; }}
+#all:checked ~ svg .tile.off {{ filter: none; }}
+#all:checked ~ svg .label.off {{ display: inline; }}
+</style>
+</head>
+<body>
+<input type="checkbox" id="all" hidden><label class="toggle" for="all">alle Kacheln / nur Projekt</label>
+<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}">
+<rect width="100%" height="100%" fill="{background}"/>
+{body}
+</svg>
+</body>
+</html>
+"""
+
+
+def rgb(color):
+    return "#%02x%02x%02x" % tuple(color)
+
+
+def image_href(path, width):
+    """data URI of a tile image, a resized WebP if Pillow is available"""
+    path = Path(path)
+    try:
+        import thumbnails
+        if thumbnails.Image is None:
+            raise ImportError("Pillow")
+        path = thumbnails.make_thumbnail(path, thumbnails.snap_width(width), "webp")
+    except ImportError:
+        pass
+    mime = {".webp": "image/webp", ".png": "image/png", ".jpg": "image/jpeg"}[path.suffix.lower()]
+    return f"data:{mime};base64,{base64.b64encode(path.read_bytes()).decode('ascii')}"
+
+
+def svg_text(lines, x, y, size, fill, stroke, cls="", weight="normal"):
+    """outlined text with its top left corner at x, y, one tspan per line"""
+    spans = "".join(f'<tspan x="{x:.1f}" dy="{0 if i == 0 else LINE_HEIGHT:g}em">{html.escape(line)}</tspan>'
+                    for i, line in enumerate(lines))
+    class_attr = f' class="{cls}"' if cls else ""
+    return (f'<text{class_attr} x="{x:.1f}" y="{y:.1f}" font-size="{size}" font-weight="{weight}" fill="{rgb(fill)}" '
+            f'stroke="{rgb(stroke)}" stroke-width="{2 * OUTLINE_PX}" dominant-baseline="hanging">{spans}</text>')
+
+
+class SvgLandscape:
+    """the landscape of one layout as pre-formatted SVG elements"""
+
+    def __init__(self, catalog, layout="pestel", conf=None, screen_size=SCREEN_SIZE, projects=None):
+        self.layout = layout
+        self.conf = dict(conf or CAMERA_CONF[layout])
+        self.screen_size = screen_size
+        entries = {entry["name"]: entry for entry in catalog.entries}
+        assets = catalog.categorized()
+        if layout == "cooccurrence":
+            # nicht über register_layout: das registrierte Layout gehört der laufenden Landscape
+            names = [name for items in assets.values() for name in items]
+            positions, anchors = cooccurrence_positions(projects or [], assets)
+            positions = resolve_collisions(positions)
+        else:
+            names, positions, anchors = compute_layout(assets, layout, LAYOUT_ANCHORS.get(layout, {}))
+        headers = [category for category in assets if category in anchors]
+
+        # alle Punkte in einem Schritt durch die Kameratransformation
+        n = len(names)
+        world = np.concatenate([positions + TILE_CENTER, positions + LABEL_OFFSET,
+                                np.array([anchors[c] for c in headers], dtype=float).reshape(-1, 2) + HEADER_OFFSET,
+                                [HEADING_POS]])
+        screen = world_to_screen(world, self.conf["pos"], self.conf["zoom"], screen_size)
+        centers, corners, header_corners = screen[:n], screen[n:2 * n], screen[2 * n:-1]
+        self.heading_corner = tuple(screen[-1].tolist())
+
+        zoom = self.conf["zoom"]
+        width = DRAWN_TILE_PX * zoom
+        heights = np.array([width * (entries[name]["height"] or 1) / (entries[name]["width"] or 1) for name in names])
+        topleft = centers - np.column_stack([np.full(n, width / 2), heights / 2])
+        # von hinten nach vorne wie in static_render
+        order = np.argsort(centers[:, 1], kind="stable")
+        self.names = [names[i] for i in order]
+        embed = 2 * width  # doppelte Auflösung für hochauflösende Bildschirme
+        self.tiles = [(f'<image class="tile ', f'" x="{topleft[i, 0]:.1f}" y="{topleft[i, 1]:.1f}" width="{width:.1f}" '
+                       f'height="{heights[i]:.1f}" href="{image_href(entries[names[i]]["path"], embed)}"/>') for i in order]
+        self.labels = []
+        for i in order:
+            category = entries[names[i]]["category"]
+            text = svg_text(names[i].split(" "), corners[i, 0], corners[i, 1], round(LABEL_SIZE * zoom),
+                            BACKGROUND_COLORS[category], COLORS[category], cls="label \0")
+            self.labels.append(tuple(text.split("\0")))
+        self.headers = "\n".join(svg_text([c], x, y, round(HEADER_SIZE * zoom), BACKGROUND_COLORS[c], COLORS[c], weight="bold")
+                                 for c, (x, y) in zip(headers, header_corners.tolist()))
+
+    def body(self, title, keywords):
+        highlighted = set(keywords)
+        classes = ["on" if name in highlighted else "off" for name in self.names]
+        parts = [prefix + cls + suffix for (prefix, suffix), cls in zip(self.tiles, classes)]
+        parts += [prefix + cls + suffix for (prefix, suffix), cls in zip(self.labels, classes)]
+        parts.append(self.headers)
+        if title:
+            parts.append(svg_text([title], *self.heading_corner, round(HEADING_SIZE * self.conf["zoom"]),
+                                  HEADING_COLOR, HEADING_OUTLINE))
+        return "\n".join(parts)
+
+    def page(self, title, keywords):
+        return PAGE.format(title=html.escape(title or "PED Landscape"), background=rgb(BACKGROUND),
+                           width=self.screen_size[0], height=self.screen_size[1], body=self.body(title, keywords))
+
+
+def page_name(n, title):
+    name = re.sub(r"[^\w\-+.]+", "_", str(title)).strip("_") or "unnamed"
+    return f"{n:02d}_{name}.html"
+
+
+def export_pages(projects, out_dir, layout="pestel", image_root="assets/img", deliverables=False):
+    """one page per project (and deliverable) plus index.html in out_dir, returns the written paths"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    scene = SvgLandscape(get_catalog(image_root), layout, projects=projects)
+    written, links = [], []
+    for p, project in enumerate(projects):
+        title = title_of(project.get("project"), "Unbekanntes Projekt")
+        entries = [(title, project.get("keywords", []), page_name(p + 1, title))]
+        if deliverables:
+            entries += [(title_of(d.get("name"), "Unbekanntes Deliverable"), d.get("keywords", []), page_name(p + 1, f"{title}_D{i + 1:02d}"))
+                        for i, d in enumerate(project.get("deliverables", []))]
+        for title, keywords, filename in entries:
+            (out_dir / filename).write_text(scene.page(title, keywords), encoding="utf-8")
+            written.append(out_dir / filename)
+            links.append(f'<li><a href="{html.escape(filename)}">{html.escape(title)}</a></li>')
+    index = out_dir / "index.html"
+    index.write_text(f'<!DOCTYPE html>\n<html lang="de">\n<head><meta charset="utf-8"><title>PED Landscape</title></head>\n'
+                     f'<body>\n<ul>\n{chr(10).join(links)}\n</ul>\n</body>\n</html>\n', encoding="utf-8")
+    return written + [index]
+
+
+def init_app(app, projects_file, out_dir=Path("static") / "landscape"):
+    """registers `flask export-landscape`; the pages are served from /static/landscape/"""
+    import click
+
+    @app.cli.command("export-landscape")
+    @click.option("--layout", default="pestel", type=click.Choice(list(CAMERA_CONF)))
+    @click.option("--deliverables", is_flag=True, help="also one page per deliverable")
+    def export_command(layout, deliverables):
+        """write static SVG/HTML pages of every project"""
+        with open(projects_file, "r", encoding="utf-8") as f:
+            projects = json.load(f)
+        written = export_pages(projects, out_dir, layout, app.config.get("IMAGE_ROOT", "assets/img"), deliverables)
+        click.echo(f"{len(written)} pages in {out_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Static SVG/HTML pages of the landscape, one per project")
+    parser.add_argument("projects", help="projects json as read by Landscape.set_project_keywords_from_file")
+    parser.add_argument("--out", default=str(Path("static") / "landscape"))
+    parser.add_argument("--layout", default="pestel", choices=list(CAMERA_CONF))
+    parser.add_argument("--deliverables", action="store_true", help="also one page per deliverable")
+    parser.add_argument("--images", default="assets/img")
+    args = parser.parse_args()
+
+    with open(args.projects, "r", encoding="utf-8") as f:
+        projects = json.load(f)
+    written = export_pages(projects, args.out, args.layout, args.images, args.deliverables)
+    print(f"wrote {len(written)} pages into {args.out}")
@@ -0,0 +1,41 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+
+import api
+from catalog import get_catalog
+from conftest import ROOT
+from palette import BACKGROUND_COLORS
+
+
+def test_cached_payload_from_many_threads(monkeypatch):
+    monkeypatch.setattr(api, "MAX_PAYLOADS", 8)
+    monkeypatch.setattr(api, "_payloads", api.OrderedDict())
+
+    def request(i):
+        key = ("test", i % 20)
+        return key, api.cached_payload(key, i % 3, lambda: {"key": i % 20})
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(request, range(2000)))
+    assert len(api._payloads) <= 8
+    assert all(entry["body"] == f'{{"key":{key[1]}}}'.encode() for key, entry in results)
+
+
+def client(monkeypatch):
+    monkeypatch.setattr(api, "_payloads", api.OrderedDict())
+    app = Flask(__name__)
+    tiles = get_catalog(ROOT / "assets" / "img").flat()
+    api.init_app(app, tiles, BACKGROUND_COLORS, ROOT / "all_results_may_fixedkeywords.json")
+    return app.test_client()
+
+
+def test_projects_keyword_filter(monkeypatch):
+    c = client(monkeypatch)
+    everything = c.get("/api/projects").get_json()["projects"]
+    assert everything
+    assert c.get("/api/projects?keyword=DoesNotExist").get_json()["projects"] == []
+    keyword = "Storage"
+    with_keyword = c.get(f"/api/projects?keyword={keyword}").get_json()["projects"]
+    assert 0 < len(with_keyword) <= len(everything)
+    assert c.get(f"/api/projects?keyword={keyword}&keyword=DoesNotExist").get_json()["projects"] == []
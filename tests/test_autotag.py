@@ -0,0 +1,26 @@
+from autotag import KeywordTagger, apply_suggestions, tag_projects
+
+PROJECTS = [
+    {"project": "Twin", "description": "a district heating network", "keywords": [],
+     "deliverables": [{"name": None, "description": "battery storage for the block", "keywords": []},
+                      {"name": "Report", "description": "nothing relevant", "keywords": []}]},
+    {"project": "Twin", "description": "battery storage in every building", "keywords": [],
+     "deliverables": [{"name": "Report", "description": "district heating again", "keywords": []}]},
+    {"description": "district heating", "keywords": [], "deliverables": []},
+]
+
+
+def test_suggestions_are_applied_by_index():
+    tagger = KeywordTagger(["District Heating", "Battery Storage"], synonyms={})
+    tagged = tag_projects(PROJECTS, tagger, threshold=0.1)
+    applied = apply_suggestions(PROJECTS, tagged)
+    assert applied[0]["keywords"] == ["District Heating"]
+    # Deliverable ohne Namen bleibt ein Deliverable
+    assert applied[0]["deliverables"][0]["keywords"] == ["Battery Storage"]
+    assert applied[0]["deliverables"][1]["keywords"] == []
+    # gleichnamiges Projekt und Deliverable bekommen ihre eigenen Vorschläge
+    assert applied[1]["keywords"] == ["Battery Storage"]
+    assert applied[1]["deliverables"][0]["keywords"] == ["District Heating"]
+    # Projekt ohne Namen
+    assert applied[2]["keywords"] == ["District Heating"]
+    assert PROJECTS[0]["keywords"] == []
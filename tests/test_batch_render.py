@@ -0,0 +1,16 @@
+import json
+import math
+
+from batch_render import create_jobs
+from conftest import ROOT
+
+
+def test_jobs_for_projects_without_title():
+    with open(ROOT / "all_results_may.json", encoding="utf-8") as f:
+        projects = json.load(f)
+    assert any(isinstance(p.get("project"), float) and math.isnan(p["project"]) for p in projects)
+    jobs = create_jobs(projects, layouts=("pestel",))
+    filenames = [job["filename"] for job in jobs]
+    assert not any("_nan" in name for name in filenames)
+    assert any(name.startswith("pestel_Unbekanntes_Projekt_") for name in filenames)
+    assert len(set(filenames)) == len(filenames)
@@ -0,0 +1,50 @@
+import shutil
+
+from catalog import AssetCatalog, default_manifest_path
+from conftest import ROOT
+
+
+def make_assets(tmp_path):
+    root = tmp_path / "img"
+    for category in ("Economic", "Legal"):
+        (root / category).mkdir(parents=True)
+        source = next((ROOT / "assets" / "img" / category).glob("*.png"))
+        shutil.copy(source, root / category / source.name)
+    return root
+
+
+def test_manifest_valid_after_save(tmp_path, monkeypatch):
+    root = make_assets(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    catalog = AssetCatalog(root)
+    assert catalog.manifest_path.exists()
+    assert catalog.is_valid()
+    assert AssetCatalog(root).is_valid()
+
+
+def test_reload_does_not_rescan(tmp_path, monkeypatch):
+    root = make_assets(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    AssetCatalog(root)
+    monkeypatch.setattr(AssetCatalog, "rescan", lambda self: (_ for _ in ()).throw(AssertionError("rescanned")))
+    assert len(AssetCatalog(root).entries) == 2
+
+
+def test_new_category_invalidates(tmp_path, monkeypatch):
+    root = make_assets(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    catalog = AssetCatalog(root)
+    (root / "Social").mkdir()
+    assert not catalog.is_valid()
+
+
+def test_default_manifest_outside_asset_tree(tmp_path, monkeypatch):
+    root = make_assets(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    catalog = AssetCatalog(root)
+    assert catalog.manifest_path == default_manifest_path(root)
+    assert catalog.manifest_path.exists()
+    assert root not in catalog.manifest_path.parents
+    # im Asset-Ordner liegen nur die Kategorien
+    assert sorted(path.name for path in root.iterdir()) == ["Economic", "Legal"]
+    assert AssetCatalog(root).is_valid()
@@ -0,0 +1,109 @@
+import json
+import stat
+import sys
+
+import pygame
+import pytest
+
+from batch_render import FrameSequence
+from export_video import CODECS, FFmpegSink, create_steps, select_items
+
+# liest die Frames wie ffmpeg von stdin und schreibt Argumente und Byteanzahl in die Ausgabedatei
+FAKE_FFMPEG = """#!{python}
+import json, sys
+data = sys.stdin.buffer.read()
+with open(sys.argv[-1], "w") as f:
+    json.dump({{"args": sys.argv[1:], "bytes": len(data), "head": list(data[:3])}}, f)
+sys.exit({exit_code})
+"""
+
+
+def fake_ffmpeg(tmp_path, exit_code=0):
+    path = tmp_path / f"ffmpeg_{exit_code}"
+    path.write_text(FAKE_FFMPEG.format(python=sys.executable, exit_code=exit_code))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def frame(size, color=(10, 20, 30)):
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+def test_sink_pipes_frames(tmp_path):
+    out = tmp_path / "video" / "out.mp4"
+    sink = FFmpegSink(out, fps=10, ffmpeg=fake_ffmpeg(tmp_path))
+    sink.write(frame((31, 20)))
+    sink.write(frame((31, 20)), repeat=3)
+    assert sink.time() == pytest.approx(0.4)
+    sink.close()
+    result = json.loads(out.read_text())
+    args = result["args"]
+    assert args[args.index("-s") + 1] == "31x20"
+    assert args[args.index("-r") + 1] == "10"
+    assert args[args.index("-pix_fmt") + 1] == "rgb24"
+    # ungerade Breite: für yuv420p aufgefüllt
+    assert args[args.index("-vf") + 1] == "pad=ceil(iw/2)*2:ceil(ih/2)*2"
+    assert args[-len(CODECS[".mp4"]) - 1:-1] == CODECS[".mp4"]
+    assert result["bytes"] == 4 * 31 * 20 * 3
+    assert result["head"] == [10, 20, 30]
+
+
+def test_sink_errors(tmp_path):
+    with pytest.raises(ValueError):
+        FFmpegSink(tmp_path / "out.avi", ffmpeg=fake_ffmpeg(tmp_path))
+    with pytest.raises(RuntimeError):
+        FFmpegSink(tmp_path / "out.mp4", ffmpeg=str(tmp_path / "missing"))
+    sink = FFmpegSink(tmp_path / "out.gif", ffmpeg=fake_ffmpeg(tmp_path, exit_code=1))
+    sink.write(frame((8, 8)))
+    with pytest.raises(RuntimeError):
+        sink.close()
+
+
+class StubLandscape:
+    """the parts of Landscape that create_steps and FrameSequence use"""
+
+    lazy_tiles = False
+
+    def __init__(self):
+        self.layout_name = "pestel"
+        self.calls = []
+        self.engine = self
+
+    def set_project(self, project):
+        self.calls.append(("project", project["project"]))
+
+    def set_deliverables(self, deliverable):
+        self.calls.append(("deliverable", deliverable["name"]))
+
+    def apply_layout(self, layout, move_camera=False, animate=False):
+        self.layout_name = layout
+        self.calls.append(("layout", layout, move_camera, animate))
+
+    def animate(self):
+        pass
+
+    def quit(self):
+        self.calls.append(("quit",))
+
+
+def test_create_steps_through_frame_sequence(tmp_path):
+    pygame.display.set_mode((16, 10))
+    projects = [{"project": "A", "deliverables": [{"name": "A1"}]}, {"project": "B", "deliverables": []}]
+    items = select_items(projects, deliverables=True)
+    assert items == [(0, None), (0, 0), (1, None)]
+    landscape = StubLandscape()
+    out = tmp_path / "out.webm"
+    sink = FFmpegSink(out, fps=10, ffmpeg=fake_ffmpeg(tmp_path))
+    steps = create_steps(landscape, projects, items, sink, ["pestel", "line"], hold=0.2, transition=0.3)
+    sequence = FrameSequence(landscape, steps)
+    while not sequence.finished:
+        sequence()
+    sink.close()
+    assert landscape.calls == [("project", "A"), ("deliverable", "A1"), ("layout", "line", True, True),
+                               ("project", "B"), ("layout", "pestel", True, True), ("quit",)]
+    # je Item ein Frame beim Umschalten und 2 gehaltene, dazu 3 Transitionsframes pro Layoutwechsel
+    frames = 3 * (1 + 2) + 2 * 3
+    assert sink.frames == frames
+    assert json.loads(out.read_text())["bytes"] == frames * 16 * 10 * 3
@@ -0,0 +1,16 @@
+from highlight import highlight_change
+
+ALL = {"Storage", "Heat Pump", "Zoning", "Mobility"}
+
+
+def test_known_state_reports_differences():
+    changed, change = highlight_change({"Storage", "Zoning"}, {"Storage", "Mobility"}, ALL)
+    assert changed == {"Zoning", "Mobility"}
+    assert change == {"added": {"Zoning"}, "removed": {"Mobility"}}
+
+
+def test_unknown_state_reports_every_tile():
+    # z.B. nach toggle_label_visibility: Zustand der Kacheln unbekannt
+    changed, change = highlight_change({"Storage"}, None, ALL)
+    assert changed == ALL
+    assert change == {"added": {"Storage"}, "removed": ALL - {"Storage"}}
@@ -0,0 +1,18 @@
+import json
+
+from conftest import ROOT
+from ingest import read_source
+
+
+def test_matches_all_results_may():
+    with open(ROOT / "all_results_may.json", encoding="utf-8") as f:
+        reference = {p["project"]: p for p in json.load(f) if isinstance(p["project"], str)}
+    entries = {entry["project"]: entry for entry in read_source(ROOT / "all_results_may.xlsx")}
+    assert entries.keys() == reference.keys()
+    ped_act = entries["PED-ACT"]
+    assert ped_act["keywords"] == reference["PED-ACT"]["keywords"]
+    assert len(ped_act["keywords"]) == 30
+    for name, entry in entries.items():
+        assert entry["description"] == reference[name]["description"]
+        assert [d["name"] for d in entry["deliverables"]] == [d["name"] for d in reference[name]["deliverables"]]
+        assert all(d["description"] is not None for d in entry["deliverables"])
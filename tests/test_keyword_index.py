@@ -0,0 +1,31 @@
+from keyword_index import KeywordIndex
+
+PROJECTS = [
+    {"project": "A", "keywords": ["Storage", "Heat Pump"], "deliverables": [{"name": "A1", "keywords": ["Storage"]}]},
+    {"project": "B", "keywords": ["Heat Pump"], "deliverables": []},
+]
+
+
+def index():
+    return KeywordIndex.from_projects(PROJECTS, {"Storage": "Technological", "Heat Pump": "Technological", "Zoning": "Legal"})
+
+
+def test_covering_known_keywords():
+    idx = index()
+    assert idx.covering("Heat Pump") == ["A", "B"]
+    assert idx.covering_all(["Storage", "Heat Pump"]) == ["A"]
+    assert idx.covering("Storage", kind="deliverable") == ["A1"]
+    # im Index, aber in keinem Projekt
+    assert idx.covering("Zoning") == []
+
+
+def test_unknown_and_empty_queries_match_nothing():
+    idx = index()
+    assert idx.covering("Zzz") == []
+    assert idx.covering_all([]) == []
+    assert idx.covering_all(["Heat Pump", "Zzz"]) == []
+    assert idx.covering_any([]) == []
+    assert idx.covering_any(["Zzz"]) == []
+    # any: unbekannte Keywords passen auf nichts, die bekannten zählen weiter
+    assert idx.covering_any(["Storage", "Zzz"]) == ["A"]
+    assert len(idx.rows_covering_all(["Zzz"], kind=None)) == 0
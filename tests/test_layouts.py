@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+import layouts
+from catalog import get_catalog
+from conftest import ROOT
+from layouts import LINE_ANCHORS, PESTEL_ANCHORS, compute_layout
+
+
+# die Layoutfunktionen vor dem Layout-Registry (ped_landscape.get_positions_around / get_line_positions)
+def old_positions_around(start, n):
+    sx, sy = start
+    positions = [(x, y) for x in np.arange(sx - 1, sx + 2) for y in np.arange(sy - 1, sy + 2)]
+    positions += [(sx, sy + 2), (sx + 1, sy + 2), (sx + 2, sy + 2), (sx + 2, sy + 1), (sx + 2, sy)]
+    if n > len(positions):
+        raise ValueError(f"only {len(positions)} positions available, {n} requested")
+    return positions[:n]
+
+
+def old_line_positions(start, n, offset=(1, 1)):
+    sx, sy = start
+    ox, oy = offset
+    return [(sx + ox * i % 5 + i // 5, sy + oy * i % 5) for i in range(n)]
+
+
+def old_layout(categorized_items, anchors, pos_func):
+    # wie create_layout: der erste Name bekommt die letzte Position
+    result = []
+    for catname, names in categorized_items.items():
+        positions = pos_func(anchors.get(catname), len(names))
+        result += [(name, positions.pop()) for name in names]
+    return result
+
+
+@pytest.mark.parametrize("name, anchors, pos_func", [("pestel", PESTEL_ANCHORS, old_positions_around),
+                                                     ("line", LINE_ANCHORS, old_line_positions)])
+def test_registry_reproduces_old_positions(name, anchors, pos_func):
+    assets = get_catalog(ROOT / "assets" / "img").categorized()
+    names, positions, _ = compute_layout(assets, name, anchors)
+    expected = old_layout(assets, anchors, pos_func)
+    assert names == [n for n, _ in expected]
+    np.testing.assert_array_equal(positions, np.array([p for _, p in expected], dtype=float))
+
+
+def synthetic_items(per_category):
+    return {category: {f"{category} {i}": None for i in range(per_category)} for category in PESTEL_ANCHORS}
+
+
+@pytest.mark.parametrize("name, anchors", [("pestel", PESTEL_ANCHORS), ("line", LINE_ANCHORS)])
+@pytest.mark.parametrize("per_category", [14, 15, 40])
+def test_no_collisions_with_large_categories(name, anchors, per_category):
+    layouts._cache.clear()
+    items = synthetic_items(per_category)
+    names, positions, _ = compute_layout(items, name, anchors)
+    assert len(names) == len(positions) == per_category * len(items)
+    assert len({tuple(p) for p in positions.tolist()}) == len(positions)
+    # die ersten 14 Plätze eines Ankers bleiben die alten
+    if name == "pestel":
+        first = positions[:per_category][::-1][:14]
+        np.testing.assert_array_equal(first, np.array(old_positions_around(anchors["Political"], 14), dtype=float))
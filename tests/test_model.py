@@ -0,0 +1,23 @@
+import json
+
+from conftest import ROOT
+from model import KeywordSchema, Project, default_schema
+
+
+def test_empty_schema_is_used():
+    schema = KeywordSchema()
+    project = Project.from_dict({"project": "P", "keywords": ["Storage", "Co-Creation"], "deliverables": []}, schema)
+    assert project.schema is schema
+    assert schema.labels == ["Storage", "Co-Creation"]
+    assert project.keywords == ["Storage", "Co-Creation"]
+
+
+def test_default_schema_without_argument():
+    assert Project("P").schema is default_schema
+
+
+def test_all_results_round_trip():
+    with open(ROOT / "all_results_may.json", encoding="utf-8") as f:
+        projects = json.load(f)
+    schema = KeywordSchema()
+    assert json.dumps([Project.from_dict(p, schema).to_dict() for p in projects]) == json.dumps(projects)
@@ -0,0 +1,64 @@
+import json
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from parse import (extract_projects_for_visualization, extract_projects_vectorized, iter_projects_from_responses,
+                   iter_responses, response_to_project)
+
+
+def column_layout(df):
+    """row-per-response export (questions as header) -> one column per response, questions in column 0"""
+    if df.columns[0] != "Response ID" or not isinstance(df.columns[1], str):
+        return df
+    frame = pd.DataFrame(df.iloc[:, 1:].to_numpy(dtype=object).T, columns=df.iloc[:, 0].tolist())
+    frame.insert(0, "Response ID", df.columns[1:].tolist())
+    return frame
+
+
+@pytest.mark.parametrize("workbook", ["results1.xlsx", "results-survey_secondround.xlsx"])
+def test_vectorized_matches_legacy(workbook):
+    df = column_layout(pd.read_excel(ROOT / workbook))
+    legacy = extract_projects_for_visualization(df)
+    vectorized = extract_projects_vectorized(df)
+    assert legacy
+    assert any(kw["present"] for project in legacy for kw in project["keywords"].values())
+    # über json, NaN != NaN
+    assert json.dumps(vectorized, default=str) == json.dumps(legacy, default=str)
+
+
+RESPONSES = ROOT / "responses.json"
+
+
+def test_responses_across_chunk_boundaries():
+    expected = list(iter_responses(RESPONSES))
+    assert len(expected) > 1
+    # kleine Chunks: jede Antwort ragt über mehrere Puffergrenzen
+    assert list(iter_responses(RESPONSES, chunk_size=7)) == expected
+    assert [p["name"] for p in iter_projects_from_responses(RESPONSES)] == \
+        [response_to_project(pairs)["name"] for pairs in expected]
+
+
+@pytest.mark.parametrize("cut", [0.5, "after_first"])
+def test_truncated_responses_raise(tmp_path, cut):
+    text = RESPONSES.read_text(encoding="utf-8")
+    if cut == "after_first":
+        # direkt nach einer vollständigen Antwort, ohne "]}"
+        first = text.index("[") + 1
+        _, end = json.JSONDecoder().raw_decode(text, first)
+        text = text[:end]
+    else:
+        text = text[:int(len(text) * cut)]
+    path = tmp_path / "responses.json"
+    path.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_responses(path, chunk_size=64))
+
+
+@pytest.mark.parametrize("text", ['{"responses": []}', '{"responses": [\n  ]\n}'])
+def test_empty_responses(tmp_path, text):
+    path = tmp_path / "responses.json"
+    path.write_text(text, encoding="utf-8")
+    assert list(iter_responses(path, chunk_size=4)) == []
+    assert list(iter_projects_from_responses(path)) == []
@@ -0,0 +1,52 @@
+import json
+import shutil
+
+import pandas as pd
+
+from conftest import ROOT
+from parse_cache import cache_key, cache_path, load_workbook
+
+WORKBOOK = ROOT / "all_results_may.xlsx"
+
+
+def test_truncated_entry_is_rebuilt(tmp_path):
+    df, projects = load_workbook(WORKBOOK, cache_dir=tmp_path)
+    path = cache_path(WORKBOOK, cache_key(WORKBOOK), tmp_path)
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) // 2])
+
+    df2, projects2 = load_workbook(WORKBOOK, cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(df, df2)
+    assert json.dumps(projects2) == json.dumps(projects)  # NaN != NaN
+    assert path.stat().st_size == len(data)
+
+
+def test_garbage_entry_is_rebuilt(tmp_path):
+    load_workbook(WORKBOOK, cache_dir=tmp_path)
+    path = cache_path(WORKBOOK, cache_key(WORKBOOK), tmp_path)
+    path.write_bytes(b"not a zip file")
+    df, _ = load_workbook(WORKBOOK, cache_dir=tmp_path)
+    assert len(df)
+    assert path.stat().st_size > 100
+
+
+def test_same_name_in_different_folders(tmp_path):
+    cache_dir = tmp_path / "cache"
+    first, second = tmp_path / "a" / WORKBOOK.name, tmp_path / "b" / WORKBOOK.name
+    for path in (first, second):
+        path.parent.mkdir()
+        shutil.copy(WORKBOOK, path)
+    load_workbook(first, cache_dir=cache_dir)
+    load_workbook(second, cache_dir=cache_dir)
+    entries = [cache_path(path, cache_key(path), cache_dir) for path in (first, second)]
+    assert entries[0] != entries[1]
+    assert all(entry.exists() for entry in entries)
+
+
+def test_stale_entry_of_same_source_is_removed(tmp_path):
+    path = cache_path(WORKBOOK, cache_key(WORKBOOK), tmp_path)
+    stale = path.with_name(path.stem.rsplit("-", 1)[0] + "-0123456789abcdef.npz")
+    stale.write_bytes(b"old")
+    load_workbook(WORKBOOK, cache_dir=tmp_path)
+    assert path.exists()
+    assert not stale.exists()
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pygame
+
+from highlight import highlight_change
+from palette import BACKGROUND_COLORS, COLORS
+from static_render import StaticScene
+
+CATEGORIES = ["Legal", "Social", "Spatial"]
+
+
+class StubLandscape:
+    """the parts of Landscape that StaticScene reads, highlighting like Landscape.apply_highlight"""
+
+    def __init__(self, n=12):
+        font = pygame.font.Font(None, 28)
+        titlefont = pygame.font.Font(None, 40)
+        self.layout_name = "pestel"
+        self.camera = {"pos": (0.5, 0.5), "zoom": 1}
+        self.labels_visible = True
+        self.heat = None
+        self.background_colors, self.colors = BACKGROUND_COLORS, COLORS
+        self.tile_images = SimpleNamespace(levels=(128, 64, 32))
+        self.keywords = {}
+        for i in range(n):
+            # eng beieinander, damit sich Kacheln und Labels überlappen
+            pos = (i % 4 * 0.6, i // 4 * 0.6)
+            self.keywords[f"Keyword {i}"] = {
+                "category": CATEGORIES[i % 3],
+                "tile": SimpleNamespace(pos=pos, highlighted=True),
+                "label": SimpleNamespace(text=f"Keyword\n{i}", pos=(pos[0] + 0.75, pos[1]), visible=True, font=font),
+            }
+        self.headers = {c: SimpleNamespace(text=c, pos=(i * 2 - 1, 3), visible=True, font=titlefont)
+                        for i, c in enumerate(CATEGORIES)}
+        self.heading = SimpleNamespace(text="Projekt", pos=(-9, 3), visible=True, font=titlefont)
+        self.listeners = []
+        self._highlighted = None
+
+    def add_highlight_listener(self, callback):
+        self.listeners.append(callback)
+
+    def tile_surface(self, name, level):
+        surface = pygame.Surface((128, 96))
+        surface.fill(BACKGROUND_COLORS[self.keywords[name]["category"]])
+        pygame.draw.rect(surface, (20 * (int(name.split()[1]) % 12), 40, 90), (10, 10, 60, 40))
+        return surface
+
+    def apply_highlight(self, names):
+        changed, change = highlight_change(names, self._highlighted, self.keywords)
+        for name in changed:
+            self.keywords[name]["tile"].highlighted = name in names
+            self.keywords[name]["label"].visible = name in names and self.labels_visible
+        self._highlighted = names
+        if changed:
+            for listener in self.listeners:
+                listener(change)
+
+
+def full_redraw(landscape):
+    scene = StaticScene(landscape)
+    scene.draw(pygame.Surface(scene.screen_size))
+    return pygame.image.tobytes(scene.frame, "RGB")
+
+
+def test_incremental_frame_matches_full_redraw():
+    pygame.font.init()
+    landscape = StubLandscape()
+    scene = StaticScene(landscape)
+    display = pygame.Surface(scene.screen_size)
+    names = list(landscape.keywords)
+    landscape.apply_highlight(set(names))
+    assert scene.draw(display) == [display.get_rect()]
+    for step in [set(names[:3]), set(names[2:7]), set(names[5:6]), None, set(names[1:2]), set(names)]:
+        if step is None:
+            landscape._highlighted = None   # wie Landscape.show_labels
+            continue
+        landscape.apply_highlight(step)
+        rects = scene.draw(display)
+        assert rects and rects != [display.get_rect()]
+        assert pygame.image.tobytes(scene.frame, "RGB") == full_redraw(landscape)
@@ -0,0 +1,30 @@
+import json
+
+import layouts
+from catalog import get_catalog
+from conftest import ROOT
+from svg_export import SvgLandscape, export_pages
+
+
+def test_export_pages_all_results_may(tmp_path):
+    with open(ROOT / "all_results_may.json", encoding="utf-8") as f:
+        projects = json.load(f)
+    written = export_pages(projects, tmp_path, image_root=ROOT / "assets" / "img", deliverables=True)
+    pages = [path for path in written if path.name != "index.html"]
+    assert len(pages) == len(projects) + sum(len(p.get("deliverables", [])) for p in projects)
+    assert all(path.exists() for path in written)
+    # Projekt ohne Titel (NaN in der Excel-Tabelle)
+    assert "Unbekanntes Projekt" in (tmp_path / "index.html").read_text(encoding="utf-8")
+    page = pages[0].read_text(encoding="utf-8")
+    # freie Keywords ohne Kachel werden übersprungen
+    tiles = get_catalog(ROOT / "assets" / "img").flat()
+    assert page.count('class="tile on"') == len(set(projects[0]["keywords"]) & tiles.keys())
+
+
+def test_cooccurrence_leaves_layout_registry_alone():
+    with open(ROOT / "all_results_may.json", encoding="utf-8") as f:
+        projects = json.load(f)
+    before = layouts.LAYOUTS.get("cooccurrence")
+    scene = SvgLandscape(get_catalog(ROOT / "assets" / "img"), "cooccurrence", projects=projects)
+    assert layouts.LAYOUTS.get("cooccurrence") is before
+    assert len(scene.tiles) == len(scene.names) > 0
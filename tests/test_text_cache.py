@@ -0,0 +1,17 @@
+import pygame
+
+from text_cache import CachedFont, TextCache
+
+
+def test_cached_font_respects_style():
+    pygame.font.init()
+    font = CachedFont(pygame.font.Font(None, 24), TextCache())
+    plain = font.render("Storage", True, (0, 0, 0))
+    assert font.render("Storage", True, (0, 0, 0)) is plain
+    font.set_bold(True)
+    bold = font.render("Storage", True, (0, 0, 0))
+    assert bold is not plain
+    assert bold.get_width() > plain.get_width()
+    font.set_bold(False)
+    font.set_underline(True)
+    assert font.render("Storage", True, (0, 0, 0)) not in (plain, bold)
@@ -0,0 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import ROOT
+from thumbnails import make_thumbnail, thumbnail_path
+
+
+def test_concurrent_thumbnails(tmp_path):
+    source = next((ROOT / "assets" / "img").rglob("*.png"))
+    with ThreadPoolExecutor(8) as pool:
+        targets = list(pool.map(lambda _: make_thumbnail(source, 64, "webp", tmp_path), range(16)))
+    assert set(targets) == {thumbnail_path(source, 64, "webp", tmp_path)}
+    # keine liegengebliebenen temporären Dateien
+    assert [path.name for path in tmp_path.iterdir()] == [targets[0].name]
@@ -0,0 +1,103 @@
+"""LRU cache for rasterized text.
+
+outlined_text renders outlined (multi-line) text; static_render keeps the
+result in text_cache per font, text, size and colour. CachedFont wraps a pygame font so every
+font.render(...) of a Label goes through the same cache; assign it to
+label.font. The cache is bounded by the pixel memory of the cached surfaces.
+"""
+from collections import OrderedDict
+
+import pygame
+
+MAX_BYTES = 32 * 1024 * 1024
+OUTLINE_PX = 2
+
+
+def _color_key(color):
+    return color if color is None or isinstance(color, str) else tuple(color)
+
+
+def font_key(font):
+    """identity and style of a font; set_bold & Co. change the same font object"""
+    return id(font), font.get_bold(), font.get_italic(), font.get_underline()
+
+
+class TextCache:
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def get(self, key, render):
+        """cached surface for key, render() on a miss"""
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = render()
+        self._surfaces[key] = surface
+        self.bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self.bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes = 0
+
+
+text_cache = TextCache()
+
+
+def outlined_text(font, text, color, outline_color, outline=OUTLINE_PX):
+    """text surface with an outline, one line per \\n"""
+    lines = []
+    for line in text.split("\n"):
+        fill = font.render(line, True, color)
+        edge = font.render(line, True, outline_color)
+        surface = pygame.Surface((fill.get_width() + 2 * outline, fill.get_height() + 2 * outline), pygame.SRCALPHA)
+        for dx in range(-outline, outline + 1):
+            for dy in range(-outline, outline + 1):
+                if dx or dy:
+                    surface.blit(edge, (outline + dx, outline + dy))
+        surface.blit(fill, (outline, outline))
+        lines.append(surface)
+    result = pygame.Surface((max(s.get_width() for s in lines), sum(s.get_height() for s in lines)), pygame.SRCALPHA)
+    y = 0
+    for surface in lines:
+        result.blit(surface, (0, y))
+        y += surface.get_height()
+    return result
+
+
+class CachedFont:
+    """pygame font whose render() results come from the text cache"""
+
+    def __init__(self, font, cache=text_cache):
+        self._font = font
+        self._cache = cache
+
+    def render(self, text, antialias, color, background=None):
+        key = ("render", font_key(self._font), text, bool(antialias), _color_key(color), _color_key(background))
+        return self._cache.get(key, lambda: self._font.render(text, antialias, color, background))
+
+    def __getattr__(self, name):
+        return getattr(self._font, name)
+
+
+_cached_fonts = {}
+
+
+def cached_font(font, cache=text_cache):
+    """the CachedFont for font (one per font object); None and CachedFonts are returned unchanged"""
+    if font is None or isinstance(font, CachedFont):
+        return font
+    key = (id(font), id(cache))
+    if key not in _cached_fonts:
+        _cached_fonts[key] = CachedFont(font, cache)
+    return _cached_fonts[key]
@@ -0,0 +1,127 @@
+"""Resized (optionally WebP) tile images for the web viewer.
+
+    GET /tiles/<category>/<file>?w=128&format=webp&v=<mtime>
+
+Variants are created on first request and cached on disk, keyed by source
+path, mtime, size, width and format, and served with a one year cache
+lifetime; the v= parameter in the URLs from /api/assets changes whenever the
+source changes. Pre-warm the cache with
+
+    flask --app app prewarm-thumbnails --width 64 --width 128 --format webp
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import click
+from flask import Blueprint, abort, current_app, request, send_file
+from flask.cli import with_appcontext
+
+try:
+    from PIL import Image
+except ImportError:  # ohne Pillow werden die Originale ausgeliefert
+    Image = None
+
+tiles_bp = Blueprint("tiles", __name__)
+
+WIDTHS = (32, 64, 128, 256, 512)
+FORMATS = {"png": "image/png", "webp": "image/webp"}
+CACHE_DIR = Path("cache") / "thumbnails"
+MAX_AGE = 365 * 24 * 3600
+
+
+def snap_width(width):
+    """smallest allowed width >= width, so arbitrary ?w= values cannot fill the cache"""
+    for allowed in WIDTHS:
+        if width <= allowed:
+            return allowed
+    return WIDTHS[-1]
+
+
+def thumbnail_path(source, width, fmt, cache_dir=CACHE_DIR):
+    stat = source.stat()
+    key = f"{source.as_posix()}|{stat.st_mtime_ns}|{stat.st_size}|{width}|{fmt}"
+    return Path(cache_dir) / f"{source.stem}-{width}-{hashlib.sha1(key.encode()).hexdigest()[:16]}.{fmt}"
+
+
+def make_thumbnail(source, width, fmt, cache_dir=CACHE_DIR):
+    """returns the cached variant, creating it if needed"""
+    target = thumbnail_path(source, width, fmt, cache_dir)
+    if target.exists():
+        return target
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as image:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.LANCZOS) if width < image.width else image.copy()
+    # erst in eine temporäre Datei, damit parallele Requests nie halbe Bilder sehen;
+    # eindeutig pro Aufruf, Threads eines Prozesses teilen sich die pid
+    with tempfile.NamedTemporaryFile(dir=target.parent, prefix=f".{target.stem}.", suffix=".tmp", delete=False) as tmp:
+        try:
+            if fmt == "webp":
+                image.save(tmp, "WEBP", quality=80, method=4)
+            else:
+                image.save(tmp, "PNG", optimize=True)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, target)
+    return target
+
+
+def resolve_source(image_root, category, filename):
+    root = Path(image_root).resolve()
+    source = (root / category / filename).resolve()
+    if root not in source.parents or not source.is_file():
+        return None
+    return source
+
+
+@tiles_bp.route("/tiles/<category>/<filename>")
+def tile_image(category, filename):
+    source = resolve_source(current_app.config["IMAGE_ROOT"], category, filename)
+    if source is None:
+        abort(404)
+    fmt = request.args.get("format", "png")
+    if fmt not in FORMATS:
+        abort(400, f"format must be one of {', '.join(FORMATS)}")
+    if Image is None:
+        return send_file(source, max_age=MAX_AGE)
+    width = snap_width(request.args.get("w", 128, type=int))
+    path = make_thumbnail(source, width, fmt, current_app.config["THUMBNAIL_DIR"])
+    response = send_file(path, mimetype=FORMATS[fmt], max_age=MAX_AGE)
+    response.cache_control.immutable = True
+    return response
+
+
+def tile_url(tile):
+    """url of a tile image with a version token that changes with the source"""
+    path = Path(tile["path"])
+    return f"/tiles/{tile['category']}/{path.name}?v={int(path.stat().st_mtime)}"
+
+
+@click.command("prewarm-thumbnails")
+@click.option("--width", "widths", type=int, multiple=True, help="widths to create, default all")
+@click.option("--format", "formats", type=click.Choice(list(FORMATS)), multiple=True, help="default png and webp")
+@with_appcontext
+def prewarm_command(widths, formats):
+    """create all thumbnail variants ahead of the first request"""
+    if Image is None:
+        raise click.ClickException("Pillow is required to create thumbnails")
+    root = Path(current_app.config["IMAGE_ROOT"])
+    sources = [p for p in sorted(root.glob("*/*")) if p.suffix.lower() in (".png", ".jpg")]
+    widths = sorted({snap_width(w) for w in widths} or WIDTHS)
+    formats = formats or tuple(FORMATS)
+    for source in sources:
+        for width in widths:
+            for fmt in formats:
+                make_thumbnail(source, width, fmt, current_app.config["THUMBNAIL_DIR"])
+    click.echo(f"{len(sources) * len(widths) * len(formats)} thumbnails in {current_app.config['THUMBNAIL_DIR']}")
+
+
+def init_app(app, image_root, cache_dir=CACHE_DIR):
+    app.config["IMAGE_ROOT"] = str(image_root)
+    app.config["THUMBNAIL_DIR"] = str(cache_dir)
+    app.register_blueprint(tiles_bp)
+    app.cli.add_command(prewarm_command)
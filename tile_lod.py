@@ -0,0 +1,49 @@
+"""Lazy, zoom-dependent tile images for Landscape.
+
+Tiles start as plain colour placeholders. Once a tile is on screen it gets the
+smallest pyramid level that is still at least as wide as the tile is drawn at
+the current zoom; greyed-out tiles get one level less. Off-screen tiles are not
+decoded at all.
+"""
+import numpy as np
+
+import pygame
+
+from atlas import LEVELS, downscale_pyramid
+from camera import DRAWN_TILE_PX, on_screen
+
+NOT_LOADED = -1
+
+
+def level_for_zoom(zoom, levels=LEVELS):
+    """index of the smallest level that is at least as wide as a tile drawn at zoom"""
+    needed = zoom * DRAWN_TILE_PX
+    widths = np.asarray(levels)
+    fits = np.flatnonzero(widths >= needed)
+    return int(fits[-1]) if len(fits) else 0
+
+
+def choose_levels(positions, highlighted, zoom, camera_pos, levels=LEVELS):
+    """desired pyramid level per tile, NOT_LOADED for tiles off screen"""
+    base = level_for_zoom(zoom, levels)
+    desired = np.where(highlighted, base, min(base + 1, len(levels) - 1))
+    visible = on_screen(positions, camera_pos, zoom)
+    return np.where(visible, desired, NOT_LOADED)
+
+
+class TileImages:
+    """hands out tile surfaces per pyramid level, decoding each source only once and only when needed"""
+
+    def __init__(self, atlas=None, levels=LEVELS):
+        self.atlas = atlas
+        self.levels = list(atlas.levels) if atlas is not None else list(levels)
+        self.pyramids = {}  # (category, name) -> [Surface per level], nur ohne Atlas
+
+    def surface(self, category, name, path, level):
+        if self.atlas is not None:
+            return self.atlas.surface(category, name, level)
+        key = (category, name)
+        if key not in self.pyramids:
+            # Originalauflösung wird nach dem Verkleinern verworfen
+            self.pyramids[key] = downscale_pyramid(pygame.image.load(path), self.levels)
+        return self.pyramids[key][level]
@@ -0,0 +1,124 @@
+"""Time based transitions of many renderables and of the camera.
+
+A PositionTransition keeps the start and target positions of all renderables
+in one (n, 2) array. Every frame the eased positions are computed for all of
+them at once and written back only for the renderables that actually move,
+from a single tolist() instead of per-tile arithmetic. A CameraTransition
+interpolates pos linearly and zoom geometrically between two camera_conf
+entries. Animator runs at most one of each and is ticked once per frame.
+"""
+import time
+
+import numpy as np
+
+DURATION = 0.6
+
+
+def smoothstep(t):
+    return t * t * (3 - 2 * t)
+
+
+class Tween:
+    def __init__(self, duration=DURATION, easing=smoothstep, clock=time.perf_counter):
+        self.duration = duration
+        self.easing = easing
+        self.clock = clock
+        self.started = clock()
+
+    def progress(self, now=None):
+        """eased 0..1, 1 once the duration is over"""
+        now = self.clock() if now is None else now
+        t = 1.0 if self.duration <= 0 else min(1.0, (now - self.started) / self.duration)
+        return self.easing(t), t >= 1.0
+
+
+class PositionTransition(Tween):
+    def __init__(self, renderables, start, end, **kwargs):
+        super().__init__(**kwargs)
+        self.renderables = renderables
+        self.start = np.asarray(start, dtype=float).reshape(-1, 2)
+        self.end = np.asarray(end, dtype=float).reshape(-1, 2)
+        self.delta = self.end - self.start
+        # ruhende Renderables nie anfassen
+        self.moving = np.flatnonzero((self.delta != 0).any(axis=1))
+        self.end_rows = [tuple(p) for p in self.end[self.moving].tolist()]
+        self.eased = 0.0
+
+    def positions(self, eased):
+        return self.start + self.delta * eased
+
+    def apply(self, now=None):
+        """writes the positions for now; returns True once finished"""
+        eased, done = self.progress(now)
+        renderables = self.renderables
+        if done:
+            rows = self.end_rows
+        else:
+            rows = map(tuple, (self.start[self.moving] + self.delta[self.moving] * eased).tolist())
+        for i, pos in zip(self.moving.tolist(), rows):
+            renderables[i].pos = pos
+        self.eased = eased
+        return done
+
+    def current(self):
+        """positions at the last applied frame"""
+        return self.positions(self.eased)
+
+
+class CameraTransition(Tween):
+    def __init__(self, start, end, **kwargs):
+        super().__init__(**kwargs)
+        self.start, self.end = dict(start), dict(end)
+
+    def conf(self, eased):
+        a, b = np.asarray(self.start["pos"], dtype=float), np.asarray(self.end["pos"], dtype=float)
+        # Zoom geometrisch, damit Hinein- und Herauszoomen gleich schnell wirken
+        zoom = self.start["zoom"] * (self.end["zoom"] / self.start["zoom"]) ** eased
+        return dict(self.end, pos=tuple((a + (b - a) * eased).tolist()), zoom=float(zoom))
+
+
+class Animator:
+    """one running position transition and one camera transition, advanced by tick()"""
+
+    def __init__(self, set_camera, duration=DURATION, clock=time.perf_counter):
+        self.set_camera = set_camera
+        self.duration = duration
+        self.clock = clock
+        self.moves = None
+        self.camera = None
+
+    @property
+    def active(self):
+        return self.moves is not None or self.camera is not None
+
+    def move(self, renderables, targets, start=None, duration=None):
+        """animates renderables to targets; a running transition of the same renderables continues from where it is"""
+        if start is None:
+            if self.moves is not None and self.moves.renderables is renderables:
+                start = self.moves.current()
+            else:
+                start = [r.pos for r in renderables]
+        self.moves = PositionTransition(renderables, start, targets, clock=self.clock,
+                                        duration=self.duration if duration is None else duration)
+        return self.moves
+
+    def move_camera(self, start, end, duration=None):
+        if self.camera is not None:
+            start = self.camera.conf(self.camera.progress()[0])
+        self.camera = CameraTransition(start, end, clock=self.clock,
+                                       duration=self.duration if duration is None else duration)
+        return self.camera
+
+    def tick(self, *args):
+        """advances the transitions; returns True if anything moved this frame"""
+        if not self.active:
+            return False
+        now = self.clock()
+        if self.moves is not None and self.moves.apply(now):
+            self.moves = None
+        if self.camera is not None:
+            eased, done = self.camera.progress(now)
+            self.set_camera(self.camera.conf(eased))
+            if done:
+                self.camera = None
+        return True